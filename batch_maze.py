@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Generate, solve and save many mazes in parallel.
+
+Usage: python batch_maze.py <output_dir> --min-size 10 --max-size 40 --seed-count 100
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+from graphs import ImplicitRectGridGraph
+from maze import GENERATORS, generate_maze, maze_to_graph
+import maze_numpy  # noqa: F401  registers the NumPy generators when NumPy is installed
+
+
+def parse_arguments(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Generate a batch of grid mazes across worker processes')
+    parser.add_argument('output_dir', help='Directory to write maze files and the manifest to')
+    parser.add_argument('--min-size', type=int, default=10, help='Smallest maze width/height in cells')
+    parser.add_argument('--max-size', type=int, default=10, help='Largest maze width/height in cells')
+    parser.add_argument('--size-step', type=int, default=1, help='Step between maze sizes')
+    parser.add_argument('--seed-start', type=int, default=0, help='First seed')
+    parser.add_argument('--seed-count', type=int, default=1, help='Number of seeds per size')
+    parser.add_argument('--algorithm', default='dfs', choices=sorted(GENERATORS), help='Generation algorithm')
+    parser.add_argument('--format', default='binary', choices=['binary', 'json'], help='Maze file format')
+    parser.add_argument('--compress', action='store_true', help='zlib compress binary maze files')
+    parser.add_argument('--farthest', action='store_true', help='Put start and end at the ends of the longest path')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=16, help='Mazes handed to a worker at a time')
+
+    return parser.parse_args(argv)
+
+
+def make_jobs(min_size, max_size, size_step, seed_start, seed_count):
+    """Return (size, seed) pairs for every maze in the batch"""
+    sizes = range(min_size, max_size + 1, size_step)
+    seeds = range(seed_start, seed_start + seed_count)
+    return list(product(sizes, seeds))
+
+
+def maze_filename(size, seed, algorithm, file_format):
+    """Return the file name generate_one writes a maze to"""
+    extension = 'json' if file_format == 'json' else 'pmzg'
+    return f"maze_{algorithm}_{size}x{size}_{seed}.{extension}"
+
+
+def generate_one(job, output_dir, algorithm, file_format, compress, farthest=False):
+    """
+    Generate, solve and save one square maze (runs in a worker process).
+
+    Args:
+        job: (size, seed) pair
+        output_dir: Directory to write the maze file to
+        algorithm: Name of a registered generator
+        file_format: 'binary' or 'json'
+        compress: Whether to zlib compress binary files
+        farthest: Place start and end at the ends of the longest path
+
+    Returns:
+        dict: Manifest record for the maze
+    """
+    size, seed = job
+    grid = ImplicitRectGridGraph(size, size)
+    maze, path = generate_maze(grid, 0, algorithm=algorithm, grid_maze=True, seed=seed, farthest=farthest)
+    maze_graph = maze_to_graph(grid, maze, seed)
+
+    filename = maze_filename(size, seed, algorithm, file_format)
+    filepath = os.path.join(output_dir, filename)
+    if file_format == 'json':
+        maze_graph.to_json_file(filepath)
+    else:
+        maze_graph.to_binary_file(filepath, compress=compress)
+
+    return {
+        'file': filename,
+        'algorithm': algorithm,
+        'w': size,
+        'h': size,
+        'seed': seed,
+        'start': path[0],
+        'end': path[-1],
+        'solution_length': len(path)
+    }
+
+
+def _generate_chunk(chunk, output_dir, algorithm, file_format, compress, farthest):
+    return [generate_one(job, output_dir, algorithm, file_format, compress, farthest) for job in chunk]
+
+
+def run_batch(jobs, output_dir, algorithm='dfs', file_format='binary', compress=False,
+              workers=None, chunk_size=16, farthest=False):
+    """
+    Generate all jobs across a process pool, streaming results to disk.
+
+    Jobs are sent to workers in chunks to amortize inter-process overhead.
+    Workers write their own maze files; the parent appends one JSON line per
+    maze to manifest.jsonl as each chunk finishes. Records left in the
+    manifest by earlier runs are kept, except for files this batch rewrites.
+
+    Args:
+        jobs: List of (size, seed) pairs
+        output_dir: Directory for maze files and manifest.jsonl
+        algorithm: Name of a registered generator
+        file_format: 'binary' or 'json'
+        compress: Whether to zlib compress binary files
+        workers: Number of worker processes (default: CPU count)
+        chunk_size: Number of jobs per chunk
+        farthest: Place start and end at the ends of each maze's longest path
+
+    Returns:
+        int: Number of mazes written
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    written = 0
+
+    manifest_path = os.path.join(output_dir, 'manifest.jsonl')
+    kept = []
+    if os.path.exists(manifest_path):
+        rewritten = {maze_filename(size, seed, algorithm, file_format) for size, seed in jobs}
+        with open(manifest_path) as f:
+            kept = [line for line in f if line.strip() and json.loads(line)['file'] not in rewritten]
+
+    with open(manifest_path, 'w') as manifest, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        manifest.writelines(kept)
+        futures = [executor.submit(_generate_chunk, chunk, output_dir, algorithm, file_format, compress, farthest)
+                   for chunk in chunks]
+        for future in as_completed(futures):
+            for record in future.result():
+                manifest.write(json.dumps(record) + '\n')
+                written += 1
+            manifest.flush()
+
+    return written
+
+
+def main(argv=None):
+    """Main function"""
+    args = parse_arguments(argv)
+    if args.min_size < 1 or args.max_size < args.min_size or args.size_step < 1:
+        print("Error: sizes must satisfy 1 <= min-size <= max-size and size-step >= 1")
+        sys.exit(1)
+
+    jobs = make_jobs(args.min_size, args.max_size, args.size_step, args.seed_start, args.seed_count)
+    print(f"Generating {len(jobs)} mazes with {args.algorithm} into {args.output_dir}...")
+
+    start = time.perf_counter()
+    written = run_batch(jobs, args.output_dir, args.algorithm, args.format, args.compress,
+                        args.workers, args.chunk_size, args.farthest)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {written} mazes in {elapsed:.2f}s ({written / elapsed:.1f} mazes/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark.py result files and flag regressions.
+
+Usage: python bench_compare.py baseline.json current.json [--threshold 0.2]
+
+Exits with status 1 if any metric grew by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+# Metrics compared between runs; larger is worse for all of them
+METRICS = ['wall_s', 'peak_rss_kb', 'alloc_peak_bytes']
+
+
+def load_results(filepath):
+    """Load a results file into a {(case, size): record} dict"""
+    with open(filepath, 'r') as f:
+        report = json.load(f)
+    return {(record['case'], record['size']): record for record in report['results']}
+
+
+def compare(baseline, current, threshold=0.2, min_wall=0.005):
+    """
+    Compare result dicts from load_results.
+
+    Wall times below min_wall seconds in both runs are ignored as noise.
+
+    Args:
+        baseline: Results of the reference run
+        current: Results of the run being checked
+        threshold: Allowed relative growth, e.g. 0.2 for +20%
+        min_wall: Wall time in seconds under which timings are not compared
+
+    Returns:
+        list: (case, size, metric, old, new, ratio, regressed) rows for
+              every metric present in both runs
+    """
+    rows = []
+    for key in sorted(baseline.keys() & current.keys()):
+        old_record, new_record = baseline[key], current[key]
+        for metric in METRICS:
+            old = old_record.get(metric)
+            new = new_record.get(metric)
+            if old is None or new is None:
+                continue
+            if metric == 'wall_s' and max(old, new) < min_wall:
+                continue
+            ratio = new / old if old else float('inf') if new else 1.0
+            rows.append((key[0], key[1], metric, old, new, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def parse_arguments(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Diff two benchmark result files')
+    parser.add_argument('baseline', help='Reference benchmark JSON file')
+    parser.add_argument('current', help='Benchmark JSON file to check')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative growth (default 0.2)')
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function"""
+    args = parse_arguments(argv)
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+
+    rows = compare(baseline, current, args.threshold)
+    for case, size, metric, old, new, ratio, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{case:28} {size:5} {metric:17} {old:14.4f} -> {new:14.4f}  x{ratio:.2f}{flag}")
+
+    missing = sorted(baseline.keys() - current.keys())
+    for case, size in missing:
+        print(f"{case:28} {size:5} missing from {args.current}")
+
+    regressions = sum(1 for row in rows if row[-1])
+    print(f"{regressions} regression(s) over {args.threshold:.0%} in {len(rows)} comparisons")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark graph construction, maze generation, solving and serialization.
+
+Each (case, size) pair runs in a fresh process so peak RSS is not skewed by
+earlier cases. Results are written as JSON for bench_compare.py.
+
+Usage: python benchmark.py --sizes 10 100 500 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from graphs import Graph, RectGridGraph, ImplicitRectGridGraph
+from maze import generate_maze_dfs, find_path_dfs
+
+DEFAULT_SIZES = [10, 100, 500, 1000, 2000]
+SEED = 12345
+
+
+def _grid_construction(size, tmp_dir):
+    return lambda: RectGridGraph(size, size)
+
+
+def _implicit_grid_construction(size, tmp_dir):
+    return lambda: ImplicitRectGridGraph(size, size)
+
+
+def _generate_maze_dfs(size, tmp_dir):
+    grid = RectGridGraph(size, size)
+    return lambda: generate_maze_dfs(grid, 0, seed=SEED)
+
+
+def _generate_grid_maze_dfs(size, tmp_dir):
+    grid = ImplicitRectGridGraph(size, size)
+    return lambda: generate_maze_dfs(grid, 0, grid_maze=True, seed=SEED)
+
+
+def _find_path_dfs(size, tmp_dir):
+    grid = RectGridGraph(size, size)
+    maze_edges, _ = generate_maze_dfs(grid, 0, seed=SEED)
+    return lambda: find_path_dfs(0, size * size - 1, maze_edges, grid.nodes)
+
+
+def _to_json_file(size, tmp_dir):
+    grid = RectGridGraph(size, size)
+    filepath = os.path.join(tmp_dir, 'graph.json')
+    return lambda: grid.to_json_file(filepath)
+
+
+def _from_json_file(size, tmp_dir):
+    filepath = os.path.join(tmp_dir, 'graph.json')
+    RectGridGraph(size, size).to_json_file(filepath)
+    return lambda: Graph.from_json_file(filepath)
+
+
+def _to_binary_file(size, tmp_dir):
+    grid = RectGridGraph(size, size)
+    filepath = os.path.join(tmp_dir, 'graph.pmzg')
+    return lambda: grid.to_binary_file(filepath)
+
+
+def _from_binary_file(size, tmp_dir):
+    filepath = os.path.join(tmp_dir, 'graph.pmzg')
+    RectGridGraph(size, size).to_binary_file(filepath)
+    return lambda: Graph.from_binary_file(filepath)
+
+
+# Benchmark name -> setup(size, tmp_dir) returning the callable to measure
+CASES = {
+    'grid_construction': _grid_construction,
+    'implicit_grid_construction': _implicit_grid_construction,
+    'generate_maze_dfs': _generate_maze_dfs,
+    'generate_grid_maze_dfs': _generate_grid_maze_dfs,
+    'find_path_dfs': _find_path_dfs,
+    'to_json_file': _to_json_file,
+    'from_json_file': _from_json_file,
+    'to_binary_file': _to_binary_file,
+    'from_binary_file': _from_binary_file,
+}
+
+
+def _peak_rss_kb():
+    """Return this process's peak resident set size in KiB, or None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def measure(case, size, trace_allocations=True):
+    """
+    Run one benchmark case in the current process.
+
+    The case is timed on its own first; with trace_allocations it then runs
+    again under tracemalloc, which is too slow to share the timed run.
+
+    Args:
+        case: Name of a benchmark in CASES
+        size: Grid width and height
+        trace_allocations: Whether to record tracemalloc peak allocations
+
+    Returns:
+        dict: Result record with wall time, peak RSS and allocation peak
+    """
+    tmp_dir = tempfile.mkdtemp(prefix='maze-bench-')
+    try:
+        run = CASES[case](size, tmp_dir)
+        rss_before = _peak_rss_kb()
+        start = time.perf_counter()
+        run()
+        wall = time.perf_counter() - start
+        rss_after = _peak_rss_kb()
+
+        alloc_peak = None
+        if trace_allocations:
+            run = CASES[case](size, tmp_dir)
+            tracemalloc.start()
+            try:
+                run()
+                alloc_peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return {
+        'case': case,
+        'size': size,
+        'wall_s': wall,
+        'peak_rss_kb': rss_after,
+        'rss_growth_kb': None if rss_after is None else rss_after - rss_before,
+        'alloc_peak_bytes': alloc_peak,
+    }
+
+
+def run_benchmarks(cases, sizes, trace_allocations=True, isolate=True):
+    """
+    Run every case at every size and yield result records as they finish.
+
+    Args:
+        cases: Names of benchmarks in CASES
+        sizes: Grid widths/heights to run each case at
+        trace_allocations: Whether to record tracemalloc peak allocations
+        isolate: Run each measurement in a fresh process
+    """
+    for case in cases:
+        for size in sizes:
+            if isolate:
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                    yield executor.submit(measure, case, size, trace_allocations).result()
+            else:
+                yield measure(case, size, trace_allocations)
+
+
+def parse_arguments(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Benchmark maze construction, generation, solving and I/O')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Grid sizes to run')
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES), help='Benchmarks to run')
+    parser.add_argument('--output', default='bench.json', help='Where to write the JSON results')
+    parser.add_argument('--no-tracemalloc', action='store_true', help='Skip the allocation-tracing run')
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function"""
+    args = parse_arguments(argv)
+
+    results = []
+    for record in run_benchmarks(args.cases, args.sizes, not args.no_tracemalloc):
+        results.append(record)
+        alloc = record['alloc_peak_bytes']
+        alloc_text = '' if alloc is None else f" alloc peak {alloc / 2**20:.1f} MiB"
+        print(f"{record['case']:28} {record['size']:5}  {record['wall_s']:9.4f}s"
+              f"  RSS {record['peak_rss_kb'] or 0:8} KiB{alloc_text}")
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
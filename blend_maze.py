@@ -1,118 +1,154 @@
-import bpy
-import math
-import json
-
-
-def create_cylinder(location, rotation, radius=0.1, depth=2.0):
-    bpy.ops.mesh.primitive_cylinder_add(
-        radius=radius, depth=depth, location=location, rotation=rotation)
-    return bpy.context.object
-
-def create_sphere(location, radius=0.2):
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=radius, location=location)
-    return bpy.context.object
-
-# Define a function to apply a Boolean Union
-def boolean_union(target, to_union):
-    bpy.context.view_layer.objects.active = target
-    boolean_modifier = target.modifiers.new(name="Union", type='BOOLEAN')
-    boolean_modifier.operation = 'UNION'
-    boolean_modifier.object = to_union
-    bpy.ops.object.modifier_apply(modifier=boolean_modifier.name)
-    bpy.data.objects.remove(to_union, do_unlink=True)
-
-
-#collection_name = "MyMaze"
-#new_collection = bpy.data.collections.new(collection_name)
-#bpy.context.scene.collection.children.link(new_collection)
-
-
-bpy.ops.mesh.primitive_cube_add(scale=(5, 5, 0.2), location=(4.5, 4.5, 0.75))
-cube = bpy.context.object
-#new_collection.objects.link(cube)
-#bpy.context.scene.collection.objects.unlink(cube)
-
-
-with open("c:/users/jdboyd/Downloads/maze (1).json") as fh:
-    raw_data = fh.read()
-
-json_data = json.loads(raw_data)
-
-balls = []
-cyls = []
-
-def make_cell(cell):
-    ball = create_sphere((cell['i'], cell['j'], 0.5), 0.25)
-    balls.append(ball)
-    #top
-#    if not cell['walls'][0]:
-#        print("Connect top")
-#        c = create_cylinder((cell['i'], cell['j']-0.25, 0.5),
-#                 (math.radians(90), 0, 0), radius=0.25, depth=0.5)
-#        c["side"]="Top"
-#        c["pos"]=(cell['i'], cell['j'])
-#        cyls.append(c)
-    #right
-    if not cell['walls'][1]:
-        print("Connect right")
-        c = create_cylinder((cell['i']+0.5, cell['j'], 0.5),
-                 (0, math.radians(90), 0), radius=0.25, depth=1.0)
-        c["side"]="Right"
-        c["pos"]=(cell['i'], cell['j'])
-        cyls.append(c)
-    #bottom
-    if not cell['walls'][2]:
-        print("Connect bottom")
-        c = create_cylinder((cell['i'], cell['j']+0.5, 0.5),
-                 (-math.radians(90), 0, 0), radius=0.25, depth=1.0)
-        c["side"]="Bottom"
-        c["pos"]=(cell['i'], cell['j'])
-        cyls.append(c)
-    #left
-#    if not cell['walls'][3]:
-#        print("Connect left")
-#        c = create_cylinder((cell['i']-0.25, cell['j'], 0.5),
-#                 (0, math.radians(90), 0), radius=0.25, depth=0.5)
-#        c["side"]="Left"
-#        c["pos"]=(cell['i'], cell['j'])
-#        cyls.append(c)
-
-for cell in json_data:
-    make_cell(cell)
-
-new_collection = bpy.data.collections.new("TrackCollection")
-bpy.context.scene.collection.children.link(new_collection)
-#new_collection.hide_viewport = True
-
-for b in balls[0:]:
-    bpy.context.scene.collection.objects.unlink(b)
-    bpy.context.scene.collection.children["TrackCollection"].objects.link(b)
-    b.select_set(True)
-
-for c in cyls:
-    bpy.context.scene.collection.objects.unlink(c)
-    bpy.context.scene.collection.children["TrackCollection"].objects.link(c)
-    c.select_set(True)
-
-
-cube.modifiers.new(name="TrackCut", type='BOOLEAN')
-cube.modifiers["TrackCut"].operation = 'DIFFERENCE'
-cube.modifiers["TrackCut"].operand_type = 'COLLECTION'
-cube.modifiers["TrackCut"].collection = new_collection
-
-
-bpy.context.view_layer.objects.active = cube
-bpy.ops.object.modifier_apply(modifier="TrackCut")
-
-for b in balls:
-    bpy.data.objects.remove(b, do_unlink=True)
-
-for c in cyls:
-    bpy.data.objects.remove(c, do_unlink=True)
-
-#cube.modifiers["TrackCut"].solver = "FAST"
-#cube.modifiers["TrackCut"].use_self = True
-
-
-#bpy.ops.outliner.item_activate(deselect_all=True)
-#bpy.ops.outliner.delete(hierarchy=True)
+"""
+Blender track-cut maze model from a Graph JSON or binary maze file.
+
+Every node becomes a sphere and every passage a cylinder, all built into a
+single bmesh in one pass; one boolean then cuts that track out of a block.
+
+Usage: blender --background --python blend_maze.py -- <maze_file> --output maze.stl
+"""
+
+import argparse
+import math
+import os
+import sys
+
+# Let Blender's Python find graphs.py next to this script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from graphs import Graph
+
+try:
+    import bpy
+    import bmesh
+    from mathutils import Matrix, Vector
+except ImportError:  # Only available inside Blender; track_primitives works without it
+    bpy = None
+
+
+def track_primitives(graph, track_z=0.5):
+    """
+    Return the track pieces for a graph of maze passages.
+
+    Returns:
+        tuple: (spheres, cylinders) where spheres are (x, y, z) centres, one
+               per node, and cylinders are ((x, y, z) midpoint, (dx, dy, dz)
+               unit direction, length), one per passage
+    """
+    positions = {n_id: (x, y, track_z) for n_id, x, y in graph.node_records()}
+    spheres = list(positions.values())
+    cylinders = []
+    for a_id, b_id in graph.edge_pairs():
+        a, b = positions[a_id], positions[b_id]
+        delta = [bc - ac for ac, bc in zip(a, b)]
+        length = math.sqrt(sum(d * d for d in delta))
+        if length == 0:
+            continue
+        midpoint = tuple((ac + bc) / 2 for ac, bc in zip(a, b))
+        cylinders.append((midpoint, tuple(d / length for d in delta), length))
+    return spheres, cylinders
+
+
+def build_track_mesh(spheres, cylinders, radius=0.25, segments=16, rings=8):
+    """Build every sphere and cylinder into one bmesh, without any operator calls"""
+    bm = bmesh.new()
+    for centre in spheres:
+        bmesh.ops.create_uvsphere(bm, u_segments=segments, v_segments=rings, radius=radius,
+                                  matrix=Matrix.Translation(centre))
+    z_axis = Vector((0, 0, 1))
+    for midpoint, direction, length in cylinders:
+        rotation = z_axis.rotation_difference(Vector(direction)).to_matrix().to_4x4()
+        bmesh.ops.create_cone(bm, cap_ends=True, segments=segments, radius1=radius, radius2=radius,
+                              depth=length, matrix=Matrix.Translation(midpoint) @ rotation)
+    return bm
+
+
+def _object_from_bmesh(name, bm):
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def build_model(graph, radius=0.25, track_z=0.5, block_bottom=0.55, block_top=0.95, margin=0.5,
+                segments=16, rings=8):
+    """
+    Build the block with the track cut out of it in the current scene.
+
+    Returns:
+        bpy.types.Object: The cut block
+    """
+    spheres, cylinders = track_primitives(graph, track_z)
+    track = _object_from_bmesh('Track', build_track_mesh(spheres, cylinders, radius, segments, rings))
+
+    xs = [x for x, _, _ in spheres]
+    ys = [y for _, y, _ in spheres]
+    size = (max(xs) - min(xs) + 2 * margin, max(ys) - min(ys) + 2 * margin, block_top - block_bottom)
+    centre = ((max(xs) + min(xs)) / 2, (max(ys) + min(ys)) / 2, (block_top + block_bottom) / 2)
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=1.0, matrix=Matrix.Translation(centre) @ Matrix.Diagonal((*size, 1.0)))
+    block = _object_from_bmesh('Maze', bm)
+
+    # One boolean against the single track object; EXACT with self
+    # intersection handles the overlapping spheres and cylinders
+    cut = block.modifiers.new(name='TrackCut', type='BOOLEAN')
+    cut.operation = 'DIFFERENCE'
+    cut.object = track
+    cut.solver = 'EXACT'
+    cut.use_self = True
+    bpy.context.view_layer.objects.active = block
+    bpy.ops.object.modifier_apply(modifier=cut.name)
+    bpy.data.objects.remove(track, do_unlink=True)
+    return block
+
+
+def export(block, filepath):
+    """Write the block to .stl, or save the scene for any other extension"""
+    if filepath.lower().endswith('.stl'):
+        for obj in bpy.context.scene.objects:
+            obj.select_set(obj is block)
+        if hasattr(bpy.ops.wm, 'stl_export'):  # Blender 4.2+
+            bpy.ops.wm.stl_export(filepath=filepath, export_selected_objects=True)
+        else:
+            bpy.ops.export_mesh.stl(filepath=filepath, use_selection=True)
+    else:
+        bpy.ops.wm.save_as_mainfile(filepath=filepath)
+
+
+def parse_arguments(argv=None):
+    """Parse the arguments after '--' on the Blender command line"""
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(prog='blender --background --python blend_maze.py --',
+                                     description='Cut a maze track out of a block in Blender')
+    parser.add_argument('maze_file', help='Graph JSON or binary maze file, e.g. from batch_maze.py')
+    parser.add_argument('--output', default='maze.blend', help='Output .stl or .blend file')
+    parser.add_argument('--radius', type=float, default=0.25, help='Track radius in cells')
+    parser.add_argument('--track-z', type=float, default=0.5, help='Height of the track centre line')
+    parser.add_argument('--block-bottom', type=float, default=0.55, help='Height of the block bottom')
+    parser.add_argument('--block-top', type=float, default=0.95, help='Height of the block top')
+    parser.add_argument('--margin', type=float, default=0.5, help='Block margin around the outer nodes')
+    parser.add_argument('--segments', type=int, default=16, help='Segments around spheres and cylinders')
+    parser.add_argument('--rings', type=int, default=8, help='Rings of each sphere')
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function"""
+    args = parse_arguments(argv)
+    if bpy is None:
+        print("Error: run this script inside Blender, e.g. blender --background --python blend_maze.py -- maze.json")
+        sys.exit(1)
+
+    graph = Graph.from_file(args.maze_file)
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    block = build_model(graph, args.radius, args.track_z, args.block_bottom, args.block_top, args.margin,
+                        args.segments, args.rings)
+    export(block, os.path.abspath(args.output))
+    print(f"Wrote {args.output} from {graph.node_count()} nodes and {graph.edge_count()} passages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Headless SVG/DXF export of grid maze walls for laser cutting and CNC.
+
+Walls are merged into the longest straight runs, then ordered to keep the
+head's travel between cuts short: greedy nearest neighbor over a spatial
+index of run endpoints, followed by windowed 2-opt. Runs that meet end to
+end in cut order are joined into one polyline.
+
+Usage: python cutfile.py <maze_file> <output.svg|output.dxf> [--cell-size 10]
+"""
+
+import argparse
+import math
+import sys
+from graphs import Graph
+from maze import GridMaze, EAST, SOUTH
+
+
+def wall_runs(maze, openings=()):
+    """
+    Return the walls of a grid maze merged into maximal straight runs.
+
+    Args:
+        maze: A GridMaze
+        openings: Indices of border cells to leave an opening in the outer
+                  wall for (e.g. the start and end cells)
+
+    Returns:
+        list: ((x0, y0), (x1, y1)) runs in cell units, with (0, 0) the
+              top-left corner of the maze
+    """
+    w, h = maze.w, maze.h
+    removed = set()
+    for idx in openings:
+        x, y = idx % w, idx // w
+        if x == 0:
+            removed.add(('v', 0, y))
+        elif y == 0:
+            removed.add(('h', x, 0))
+        elif x == w - 1:
+            removed.add(('v', w, y))
+        elif y == h - 1:
+            removed.add(('h', x, h))
+
+    cells = [maze.cell(idx) for idx in range(w * h)]
+    runs = []
+
+    # Horizontal wall above row y, between (x, y-1) and (x, y)
+    for y in range(h + 1):
+        run_start = None
+        for x in range(w + 1):
+            wall = x < w and ('h', x, y) not in removed and (
+                y == 0 or y == h or not cells[(y - 1) * w + x] & SOUTH)
+            if wall and run_start is None:
+                run_start = x
+            elif not wall and run_start is not None:
+                runs.append(((run_start, y), (x, y)))
+                run_start = None
+
+    # Vertical wall left of column x, between (x-1, y) and (x, y)
+    for x in range(w + 1):
+        run_start = None
+        for y in range(h + 1):
+            wall = y < h and ('v', x, y) not in removed and (
+                x == 0 or x == w or not cells[y * w + x - 1] & EAST)
+            if wall and run_start is None:
+                run_start = y
+            elif not wall and run_start is not None:
+                runs.append(((x, run_start), (x, y)))
+                run_start = None
+
+    return runs
+
+
+def _nearest_endpoint(index, point):
+    """Return the indexed lattice point nearest to point, searching outward ring by ring"""
+    px, py = point
+    best = None
+    best_distance = math.inf
+    r = 0
+    # Points on ring r are at least r away, so stop once r passes the best
+    while r <= best_distance:
+        if r == 0:
+            ring = [(px, py)]
+        else:
+            ring = [(px + dx, py - r) for dx in range(-r, r + 1)]
+            ring += [(px + dx, py + r) for dx in range(-r, r + 1)]
+            ring += [(px - r, py + dy) for dy in range(-r + 1, r)]
+            ring += [(px + r, py + dy) for dy in range(-r + 1, r)]
+        for candidate in ring:
+            if candidate in index:
+                distance = math.hypot(candidate[0] - px, candidate[1] - py)
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+        r += 1
+    return best
+
+
+def _two_opt(cuts, start, window, passes):
+    """
+    Improve cut order in place by reversing blocks of at most window cuts.
+
+    Reversing cuts i..j also flips each of them, which only changes the two
+    travel moves at the ends of the block.
+    """
+    n = len(cuts)
+    for _ in range(passes):
+        improved = False
+        for i in range(n):
+            before = cuts[i - 1][1] if i else start
+            first_start = cuts[i][0]
+            for j in range(i + 1, min(n, i + window)):
+                last_end = cuts[j][1]
+                after = cuts[j + 1][0] if j + 1 < n else None
+                old = math.dist(before, first_start)
+                new = math.dist(before, last_end)
+                if after is not None:
+                    old += math.dist(cuts[j][1], after)
+                    new += math.dist(first_start, after)
+                if new < old - 1e-9:
+                    cuts[i:j + 1] = [(b, a) for a, b in reversed(cuts[i:j + 1])]
+                    first_start = cuts[i][0]
+                    improved = True
+        if not improved:
+            break
+
+
+def order_cuts(segments, start=(0, 0), two_opt_window=16, two_opt_passes=2):
+    """
+    Order and orient straight cuts to shorten travel, then join them into polylines.
+
+    Args:
+        segments: ((x0, y0), (x1, y1)) cuts with integer endpoints, e.g. from wall_runs
+        start: Where the head starts
+        two_opt_window: Longest block of cuts 2-opt may reverse (0 disables 2-opt)
+        two_opt_passes: Most 2-opt passes over the cut order
+
+    Returns:
+        list: Polylines in cut order, each a list of (x, y) points
+    """
+    # Endpoint -> ids of uncut segments touching it
+    index = {}
+    for seg_id, (a, b) in enumerate(segments):
+        index.setdefault(a, set()).add(seg_id)
+        index.setdefault(b, set()).add(seg_id)
+
+    cuts = []
+    point = start
+    for _ in range(len(segments)):
+        point = _nearest_endpoint(index, point)
+        seg_id = min(index[point])
+        a, b = segments[seg_id]
+        if a != point:
+            a, b = b, a
+        for end in (a, b):
+            ids = index[end]
+            ids.discard(seg_id)
+            if not ids:
+                del index[end]
+        cuts.append((a, b))
+        point = b
+
+    if two_opt_window > 1:
+        _two_opt(cuts, start, two_opt_window, two_opt_passes)
+
+    polylines = []
+    for a, b in cuts:
+        if polylines and polylines[-1][-1] == a:
+            polylines[-1].append(b)
+        else:
+            polylines.append([a, b])
+    return polylines
+
+
+def travel_distance(polylines, start=(0, 0)):
+    """Return the total distance the head moves between cuts"""
+    total = 0.0
+    point = start
+    for polyline in polylines:
+        total += math.dist(point, polyline[0])
+        point = polyline[-1]
+    return total
+
+
+def _scale(polylines, cell_size, margin):
+    return [[(margin + x * cell_size, margin + y * cell_size) for x, y in polyline] for polyline in polylines]
+
+
+def to_svg(polylines, filepath, w, h, cell_size=10.0, margin=5.0, stroke_width=0.1):
+    """
+    Write polylines in cell units to an SVG file in millimetres.
+
+    Args:
+        polylines: Polylines from order_cuts
+        filepath: Output path
+        w: Maze width in cells
+        h: Maze height in cells
+        cell_size: Cell pitch in mm
+        margin: Border around the maze in mm
+        stroke_width: Line width in mm (a hairline for most laser drivers)
+    """
+    width = w * cell_size + 2 * margin
+    height = h * cell_size + 2 * margin
+    with open(filepath, 'w') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:g}mm" height="{height:g}mm" '
+                f'viewBox="0 0 {width:g} {height:g}">\n')
+        f.write(f'<g fill="none" stroke="black" stroke-width="{stroke_width:g}">\n')
+        for polyline in _scale(polylines, cell_size, margin):
+            points = ' L '.join(f'{x:g} {y:g}' for x, y in polyline)
+            f.write(f'<path d="M {points}"/>\n')
+        f.write('</g>\n</svg>\n')
+
+
+def to_dxf(polylines, filepath, w, h, cell_size=10.0, margin=5.0):
+    """
+    Write polylines in cell units to an ASCII DXF (R12) file in millimetres.
+
+    DXF's y axis points up, so the maze is flipped to keep (0, 0) at the
+    top-left corner as in the SVG output.
+    """
+    height = h * cell_size + 2 * margin
+    lines = ['0', 'SECTION', '2', 'ENTITIES']
+    for polyline in _scale(polylines, cell_size, margin):
+        if len(polyline) == 2:
+            (x0, y0), (x1, y1) = polyline
+            lines += ['0', 'LINE', '8', 'WALLS',
+                      '10', f'{x0:g}', '20', f'{height - y0:g}', '11', f'{x1:g}', '21', f'{height - y1:g}']
+        else:
+            lines += ['0', 'POLYLINE', '8', 'WALLS', '66', '1', '70', '0']
+            for x, y in polyline:
+                lines += ['0', 'VERTEX', '8', 'WALLS', '10', f'{x:g}', '20', f'{height - y:g}']
+            lines += ['0', 'SEQEND', '8', 'WALLS']
+    lines += ['0', 'ENDSEC', '0', 'EOF']
+    with open(filepath, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def export_maze(maze, filepath, cell_size=10.0, margin=5.0, openings=(), two_opt_window=16):
+    """
+    Write the walls of a GridMaze to an .svg or .dxf cut file.
+
+    Returns:
+        list: The polylines written, in cell units and cut order
+    """
+    polylines = order_cuts(wall_runs(maze, openings), two_opt_window=two_opt_window)
+    if filepath.lower().endswith('.dxf'):
+        to_dxf(polylines, filepath, maze.w, maze.h, cell_size, margin)
+    else:
+        to_svg(polylines, filepath, maze.w, maze.h, cell_size, margin)
+    return polylines
+
+
+def grid_maze_from_graph(graph):
+    """Rebuild a GridMaze from a saved maze graph of a rectangular grid"""
+    w = h = 0
+    for _, x, y in graph.node_records():
+        w, h = max(w, x + 1), max(h, y + 1)
+    maze = GridMaze(w, h)
+    for a_idx, b_idx in graph.edge_pairs():
+        maze.carve(a_idx, b_idx)
+    return maze
+
+
+def parse_arguments(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Export the walls of a grid maze file as SVG or DXF cuts')
+    parser.add_argument('maze_file', help='JSON or binary maze file, e.g. from batch_maze.py')
+    parser.add_argument('output', help='Output .svg or .dxf file')
+    parser.add_argument('--cell-size', type=float, default=10.0, help='Cell pitch in mm')
+    parser.add_argument('--margin', type=float, default=5.0, help='Border around the maze in mm')
+    parser.add_argument('--openings', type=int, nargs='*', default=[], help='Border cell indices to open, e.g. start and end')
+    parser.add_argument('--two-opt-window', type=int, default=16, help='Largest block 2-opt may reverse (0 disables)')
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function"""
+    args = parse_arguments(argv)
+    try:
+        maze = grid_maze_from_graph(Graph.from_file(args.maze_file))
+    except (OSError, ValueError) as e:
+        print(f"Error loading maze: {e}")
+        sys.exit(1)
+
+    polylines = export_maze(maze, args.output, args.cell_size, args.margin, args.openings, args.two_opt_window)
+    segments = sum(len(polyline) - 1 for polyline in polylines)
+    print(f"Wrote {len(polylines)} polylines ({segments} straight cuts) to {args.output}, "
+          f"travel {travel_distance(polylines) * args.cell_size:.0f} mm")
+
+
+if __name__ == "__main__":
+    main()
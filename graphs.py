@@ -1,11 +1,26 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
 from dataclasses import dataclass
+from itertools import accumulate
 import json
+import math
+import mmap
+import struct
+import sys
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only MaskedGridGraph needs it
+    np = None
 
 @dataclass
 class Node:
     x: int
     y: int
     n_id: int
+    z: int = 0  # level, for multi-level graphs such as Grid3DGraph
 
 @dataclass
 class Edge:
@@ -14,32 +29,145 @@ class Edge:
     a_id: int
     b_id: int
 
+# Binary graph files: a little-endian header followed by int32 x coords,
+# int32 y coords, int32 z levels if BINARY_FLAG_LEVELS is set,
+# interleaved int32 (a_id, b_id) edge pairs and float64 edge weights if
+# BINARY_FLAG_WEIGHTS is set. With
+# BINARY_FLAG_ZLIB set, everything after the header is one zlib stream.
+BINARY_MAGIC = b'PMZG'
+BINARY_VERSION = 1
+BINARY_FLAG_ZLIB = 1
+BINARY_FLAG_SEED = 2  # an int64 generation seed follows the header
+BINARY_FLAG_LEVELS = 4  # node z levels follow the y coords
+BINARY_FLAG_WEIGHTS = 8  # edge weights follow the edge pairs
+BINARY_KNOWN_FLAGS = BINARY_FLAG_ZLIB | BINARY_FLAG_SEED | BINARY_FLAG_LEVELS | BINARY_FLAG_WEIGHTS
+BINARY_HEADER = struct.Struct('<4sHHII')  # magic, version, flags, nodes, edges
+BINARY_SEED = struct.Struct('<q')
+
 def xyToIdx(x, y, w):
     return x+w*y
 
+def _int_array(values):
+    """Return values as an int array, without copying one that already is"""
+    if isinstance(values, array) and values.typecode == 'i':
+        return values
+    return array('i', values)
+
+def _float_array(values):
+    """Return values as a double array, without copying one that already is"""
+    if isinstance(values, array) and values.typecode == 'd':
+        return values
+    return array('d', values)
+
+def _json_weights(graph_data):
+    """Return the edge weights of a loaded JSON graph, or None if it has none"""
+    edges = graph_data["edges"]
+    if not any("weight" in edge for edge in edges):
+        return None
+    return [edge.get("weight", 1.0) for edge in edges]
+
+class LazySequence(Sequence):
+    """Read-only sequence whose items are created on demand by index"""
+    __slots__ = ('_count', '_item')
+
+    def __init__(self, count, item):
+        self._count = count
+        self._item = item
+
+    def __len__(self):
+        return self._count()
+
+    def __getitem__(self, i):
+        n = self._count()
+        if isinstance(i, slice):
+            return [self._item(j) for j in range(*i.indices(n))]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("index out of range")
+        return self._item(i)
+
+    def __iter__(self):
+        return map(self._item, range(self._count()))
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"<{type(self).__name__} of {len(self)} items>"
+
 @dataclass
 class Graph:
     nodes: list[Node]
     edges: list[Edge]
+    seed: int | None = None  # seed the maze was generated from, if known
+    weights: list[float] | None = None  # per-edge weights parallel to edges, None for all 1.0
+
+    def node_count(self):
+        return len(self.nodes)
+
+    def edge_count(self):
+        return len(self.edges)
+
+    def node(self, n_id):
+        return self.nodes[n_id]
+
+    def edge(self, e_id):
+        return self.edges[e_id]
+
+    def node_records(self):
+        """Iterate (n_id, x, y) for every node"""
+        return ((node.n_id, node.x, node.y) for node in self.nodes)
+
+    def edge_pairs(self):
+        """Iterate (a_id, b_id) for every edge"""
+        return ((edge.a_id, edge.b_id) for edge in self.edges)
+
+    def edge_weight(self, e_id):
+        """Return the weight of edge e_id, 1.0 unless the graph has weights"""
+        return 1.0 if self.weights is None else self.weights[e_id]
+
+    def node_zs(self):
+        """Return the z level of every node, or None if all are on level 0"""
+        zs = [node.z for node in self.nodes]
+        return zs if any(zs) else None
+
+    def to_compact(self):
+        """Return a CompactGraph with the same nodes, edges and seed"""
+        compact = CompactGraph.from_records(self.node_records(), self.edge_pairs(), self.node_zs(),
+                                            self.weights)
+        compact.seed = self.seed
+        return compact
 
     def to_json_file(self, filepath):
         """Dump the graph to a JSON file"""
         # Serialize nodes
         nodes_data = [
-            {"x": node.x, "y": node.y, "n_id": node.n_id}
-            for node in self.nodes
+            {"x": x, "y": y, "n_id": n_id}
+            for n_id, x, y in self.node_records()
         ]
+        zs = self.node_zs()
+        if zs is not None:
+            for node_data, z in zip(nodes_data, zs):
+                node_data["z"] = z
 
         # Serialize edges (store only IDs, not full node objects)
         edges_data = [
-            {"a_id": edge.a_id, "b_id": edge.b_id}
-            for edge in self.edges
+            {"a_id": a_id, "b_id": b_id}
+            for a_id, b_id in self.edge_pairs()
         ]
+        if self.weights is not None:
+            for edge_data, weight in zip(edges_data, self.weights):
+                edge_data["weight"] = weight
 
         graph_data = {
             "nodes": nodes_data,
             "edges": edges_data
         }
+        if self.seed is not None:
+            graph_data["seed"] = self.seed
 
         with open(filepath, 'w') as f:
             json.dump(graph_data, f, indent=2)
@@ -52,7 +180,7 @@ class Graph:
 
         # Reconstruct nodes
         nodes = [
-            Node(x=node_data["x"], y=node_data["y"], n_id=node_data["n_id"])
+            Node(x=node_data["x"], y=node_data["y"], n_id=node_data["n_id"], z=node_data.get("z", 0))
             for node_data in graph_data["nodes"]
         ]
 
@@ -70,24 +198,1025 @@ class Graph:
             for edge_data in graph_data["edges"]
         ]
 
-        return cls(nodes=nodes, edges=edges)
+        return cls(nodes=nodes, edges=edges, seed=graph_data.get("seed"),
+                   weights=_json_weights(graph_data))
+
+    def to_binary_file(self, filepath, compress=False):
+        """Dump the graph to a packed binary file, optionally zlib compressed"""
+        compact = self.to_compact()
+        pairs = array('i', bytes(8 * len(compact.edge_a)))
+        pairs[0::2] = compact.edge_a
+        pairs[1::2] = compact.edge_b
+        sections = [compact.xs, compact.ys, pairs]
+        flags = BINARY_FLAG_ZLIB if compress else 0
+        if self.seed is not None:
+            if not -2 ** 63 <= self.seed < 2 ** 63:
+                raise ValueError(f"Seed {self.seed} does not fit the binary format's signed 64-bit field")
+            flags |= BINARY_FLAG_SEED
+        if compact.zs is not None:
+            sections.insert(2, compact.zs)
+            flags |= BINARY_FLAG_LEVELS
+        if compact.weights is not None:
+            sections.append(compact.weights)
+            flags |= BINARY_FLAG_WEIGHTS
+        if sys.byteorder == 'big':
+            sections = [array(section.typecode, section) for section in sections]
+            for section in sections:
+                section.byteswap()
+
+        with open(filepath, 'wb') as f:
+            f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags,
+                                       len(compact.xs), len(compact.edge_a)))
+            if self.seed is not None:
+                f.write(BINARY_SEED.pack(self.seed))
+            if compress:
+                compressor = zlib.compressobj()
+                for section in sections:
+                    f.write(compressor.compress(section))
+                f.write(compressor.flush())
+            else:
+                for section in sections:
+                    section.tofile(f)
+
+    @classmethod
+    def from_binary_file(cls, filepath):
+        """Load a binary graph file into a CompactGraph"""
+        with open(filepath, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < BINARY_HEADER.size:
+                raise ValueError(f"{filepath} is too short to be a binary graph file")
+            magic, version, flags, node_count, edge_count = BINARY_HEADER.unpack_from(mm)
+            if magic != BINARY_MAGIC:
+                raise ValueError(f"{filepath} is not a binary graph file")
+            if version != BINARY_VERSION:
+                raise ValueError(f"Unsupported binary graph version {version}")
+            if flags & ~BINARY_KNOWN_FLAGS:
+                raise ValueError(f"Unsupported binary graph flags {flags & ~BINARY_KNOWN_FLAGS:#x} in {filepath}")
+
+            offset = BINARY_HEADER.size
+            seed = None
+            if flags & BINARY_FLAG_SEED:
+                if len(mm) < offset + BINARY_SEED.size:
+                    raise ValueError(f"{filepath} is truncated or corrupt")
+                seed, = BINARY_SEED.unpack_from(mm, offset)
+                offset += BINARY_SEED.size
+
+            if flags & BINARY_FLAG_ZLIB:
+                body = memoryview(zlib.decompress(mm[offset:]))
+            else:
+                body = memoryview(mm)[offset:]
+            node_sections = 3 if flags & BINARY_FLAG_LEVELS else 2
+            weight_bytes = 8 * edge_count if flags & BINARY_FLAG_WEIGHTS else 0
+            with body:
+                if len(body) != 4 * (node_sections * node_count + 2 * edge_count) + weight_bytes:
+                    raise ValueError(f"{filepath} is truncated or corrupt")
+                sections = []
+                for i in range(node_sections):
+                    section = array('i')
+                    section.frombytes(body[4 * node_count * i:4 * node_count * (i + 1)])
+                    sections.append(section)
+                pairs = array('i')
+                weights = array('d') if weight_bytes else None
+                pairs_end = len(body) - weight_bytes
+                pairs.frombytes(body[4 * node_count * node_sections:pairs_end])
+                sections.append(pairs)
+                if weights is not None:
+                    weights.frombytes(body[pairs_end:])
+                    sections.append(weights)
+
+        if sys.byteorder == 'big':
+            for section in sections:
+                section.byteswap()
+        zs = sections[2] if node_sections == 3 else None
+        graph = CompactGraph(sections[0], sections[1], pairs[0::2], pairs[1::2], zs, weights)
+        graph.seed = seed
+        return graph
+
+    @classmethod
+    def from_file(cls, filepath):
+        """Load a graph from either a binary or a JSON graph file"""
+        with open(filepath, 'rb') as f:
+            magic = f.read(len(BINARY_MAGIC))
+        if magic == BINARY_MAGIC:
+            return cls.from_binary_file(filepath)
+        return cls.from_json_file(filepath)
+
+    def incidence(self):
+        """Return the per-node incident-edge index, building it on first use
+
+        Entry i maps each neighbor id of node i to the Edge joining them.
+        """
+        index = getattr(self, '_incidence', None)
+        if index is None:
+            index = [{} for _ in self.nodes]
+            for edge in self.edges:
+                index[edge.a_id][edge.b_id] = edge
+                index[edge.b_id][edge.a_id] = edge
+            self._incidence = index
+        return index
+
+    def neighbors(self, n_id):
+        """Return the ids of the nodes adjacent to n_id"""
+        return list(self.incidence()[n_id])
+
+    def edge_between(self, a_id, b_id):
+        """Return the Edge joining a_id and b_id, or None if they are not adjacent"""
+        return self.incidence()[a_id].get(b_id)
+
+class CompactGraph(Graph):
+    """Graph stored as flat int arrays with a CSR adjacency index
+
+    Node i is at (xs[i], ys[i]) and has n_id i; edge k joins edge_a[k] and
+    edge_b[k]. zs holds node levels, or is None when every node is on
+    level 0; weights is a double array of edge weights, or None when every
+    edge weighs 1.0. The nodes and edges attributes are lazy views that
+    only create Node/Edge objects for the items actually accessed.
+    """
+
+    zs = None  # implicit subclasses computing nodes arithmetically are flat
+    _offsets = _targets = _edge_ids = None  # implicit subclasses store no CSR index either
+
+    def __init__(self, xs, ys, edge_a, edge_b, zs=None, weights=None):
+        self.xs = _int_array(xs)
+        self.ys = _int_array(ys)
+        self.zs = None if zs is None else _int_array(zs)
+        self.edge_a = _int_array(edge_a)
+        self.edge_b = _int_array(edge_b)
+        self.weights = None if weights is None else _float_array(weights)
+        if self.weights is not None and len(self.weights) != len(self.edge_a):
+            raise ValueError(f"Got {len(self.weights)} weights for {len(self.edge_a)} edges")
+        # CSR index: neighbors of i are targets[offsets[i]:offsets[i+1]],
+        # joined by the edges listed at the same positions in edge_ids
+        self._offsets = None
+        self._targets = None
+        self._edge_ids = None
+
+    @property
+    def nodes(self):
+        return LazySequence(self.node_count, self.node)
+
+    @property
+    def edges(self):
+        return LazySequence(self.edge_count, self.edge)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(nodes={self.node_count()}, edges={self.edge_count()})"
+
+    @classmethod
+    def from_records(cls, node_records, edge_pairs, zs=None, weights=None):
+        """Build a CompactGraph from (n_id, x, y) and (a_id, b_id) iterables
+
+        Node ids are renumbered to their position in node_records; zs and
+        weights, if given, are the node levels and edge weights in the same
+        order as the records.
+        """
+        xs = array('i')
+        ys = array('i')
+        index = {}
+        for n_id, x, y in node_records:
+            index[n_id] = len(xs)
+            xs.append(x)
+            ys.append(y)
+
+        edge_a = array('i')
+        edge_b = array('i')
+        for a_id, b_id in edge_pairs:
+            edge_a.append(index[a_id])
+            edge_b.append(index[b_id])
+
+        return CompactGraph(xs, ys, edge_a, edge_b, zs, weights)
+
+    @classmethod
+    def from_json_file(cls, filepath):
+        """Load a JSON graph file straight into compact storage"""
+        with open(filepath, 'r') as f:
+            graph_data = json.load(f)
+
+        zs = [n.get("z", 0) for n in graph_data["nodes"]]
+        graph = CompactGraph.from_records(
+            ((n["n_id"], n["x"], n["y"]) for n in graph_data["nodes"]),
+            ((e["a_id"], e["b_id"]) for e in graph_data["edges"]),
+            zs if any(zs) else None, _json_weights(graph_data))
+        graph.seed = graph_data.get("seed")
+        return graph
+
+    def node_count(self):
+        return len(self.xs)
+
+    def edge_count(self):
+        return len(self.edge_a)
+
+    def node(self, n_id):
+        z = 0 if self.zs is None else self.zs[n_id]
+        return Node(self.xs[n_id], self.ys[n_id], n_id, z)
+
+    def edge(self, e_id):
+        a_id = self.edge_a[e_id]
+        b_id = self.edge_b[e_id]
+        return Edge(self.node(a_id), self.node(b_id), a_id, b_id)
+
+    def node_records(self):
+        return zip(range(len(self.xs)), self.xs, self.ys)
+
+    def edge_pairs(self):
+        return zip(self.edge_a, self.edge_b)
+
+    def node_zs(self):
+        return self.zs
 
-class RectGridGraph(Graph):
+    def to_compact(self):
+        return self
+
+    def _build_csr(self):
+        n = len(self.xs)
+        degree = array('i', bytes(4 * (n + 1)))
+        for a_id in self.edge_a:
+            degree[a_id + 1] += 1
+        for b_id in self.edge_b:
+            degree[b_id + 1] += 1
+        offsets = array('i', accumulate(degree))
+
+        # Fill in edge order so each node sees its edges as listed
+        fill = offsets[:-1]
+        targets = array('i', bytes(4 * offsets[-1]))
+        edge_ids = array('i', targets)
+        for e_id, (a_id, b_id) in enumerate(zip(self.edge_a, self.edge_b)):
+            pos = fill[a_id]
+            targets[pos] = b_id
+            edge_ids[pos] = e_id
+            fill[a_id] = pos + 1
+            pos = fill[b_id]
+            targets[pos] = a_id
+            edge_ids[pos] = e_id
+            fill[b_id] = pos + 1
+
+        self._offsets = offsets
+        self._targets = targets
+        self._edge_ids = edge_ids
+
+    def adjacency(self):
+        """Return the CSR index as (offsets, targets, edge_ids) int arrays
+
+        The neighbors of node i are targets[offsets[i]:offsets[i+1]], joined
+        by the edges at the same positions of edge_ids. Built on first use.
+        """
+        if self._offsets is None:
+            if 'edge_a' in self.__dict__:
+                self._build_csr()
+            else:
+                # Implicit subclasses keep no arrays; index their compact
+                # form, which numbers nodes and edges the same way
+                self._offsets, self._targets, self._edge_ids = self.to_compact().adjacency()
+        return self._offsets, self._targets, self._edge_ids
+
+    def neighbors(self, n_id):
+        if self._offsets is None:
+            self._build_csr()
+        return self._targets[self._offsets[n_id]:self._offsets[n_id + 1]]
+
+    def edge_index(self, a_id, b_id):
+        """Return the index of the edge joining a_id and b_id, or None"""
+        if self._offsets is None:
+            self._build_csr()
+        targets = self._targets
+        for pos in range(self._offsets[a_id], self._offsets[a_id + 1]):
+            if targets[pos] == b_id:
+                return self._edge_ids[pos]
+        return None
+
+    def edge_between(self, a_id, b_id):
+        e_id = self.edge_index(a_id, b_id)
+        return None if e_id is None else self.edge(e_id)
+
+
+class RectGridGraph(CompactGraph):
     def __init__(self, w, h):
         self.w = w
         self.h = h
-        self.nodes = [Node(x, y, x+w*y) for y in range(h) for x in range(w)]
-        self.edges = []
+        xs = array('i', range(w)) * h
+        ys = array('i')
+        for y in range(h):
+            ys.extend(array('i', [y]) * w)
+
+        edge_a = array('i')
+        edge_b = array('i')
         for y in range(h):
             for x in range(w):
                 a_id = x+w*y
-                a = self.nodes[a_id]
                 if x < w-1:
-                    b_id = x+1+w*y
-                    b = self.nodes[b_id]
-                    self.edges.append(Edge(a, b, a_id, b_id))
+                    edge_a.append(a_id)
+                    edge_b.append(a_id+1)
 
                 if y < h-1:
-                    b_id = x+w*(y+1)
-                    b = self.nodes[b_id]
-                    self.edges.append(Edge(a, b, a_id, b_id))
+                    edge_a.append(a_id)
+                    edge_b.append(a_id+w)
+
+        super().__init__(xs, ys, edge_a, edge_b)
+
+
+class ImplicitRectGridGraph(RectGridGraph):
+    """RectGridGraph that computes nodes, edges and neighbors arithmetically
+
+    Construction is O(1) and nothing per node or edge is stored. Edges are
+    numbered in the same order RectGridGraph lists them (per cell, right
+    then down), so both classes are interchangeable.
+    """
+
+    def __init__(self, w, h):
+        if w < 1 or h < 1:
+            raise ValueError(f"Grid size must be at least 1x1, got {w}x{h}")
+        self.w = w
+        self.h = h
+
+    def node_count(self):
+        return self.w * self.h
+
+    def edge_count(self):
+        return (self.w - 1) * self.h + self.w * (self.h - 1)
+
+    def node(self, n_id):
+        y, x = divmod(n_id, self.w)
+        return Node(x, y, n_id)
+
+    def edge(self, e_id):
+        if not 0 <= e_id < self.edge_count():
+            raise IndexError("edge index out of range")
+        w = self.w
+        stride = 2 * w - 1  # edges listed per row above the last one
+        y, r = divmod(e_id, stride)
+        if y >= self.h - 1:
+            y = self.h - 1
+            x, down = e_id - y * stride, False
+        elif r < 2 * (w - 1):
+            x, down = r // 2, r % 2 == 1
+        else:
+            x, down = w - 1, True
+        a_id = x + w * y
+        b_id = a_id + w if down else a_id + 1
+        return Edge(self.node(a_id), self.node(b_id), a_id, b_id)
+
+    def node_records(self):
+        w = self.w
+        return ((n_id, n_id % w, n_id // w) for n_id in range(self.node_count()))
+
+    def edge_pairs(self):
+        w, h = self.w, self.h
+        for y in range(h):
+            for x in range(w):
+                a_id = x+w*y
+                if x < w-1:
+                    yield a_id, a_id+1
+                if y < h-1:
+                    yield a_id, a_id+w
+
+    def to_compact(self):
+        compact = RectGridGraph(self.w, self.h)
+        if self.weights is not None:
+            compact.weights = _float_array(self.weights)
+        return compact
+
+    def neighbors(self, n_id):
+        w = self.w
+        y, x = divmod(n_id, w)
+        result = []
+        if y > 0:
+            result.append(n_id - w)
+        if x > 0:
+            result.append(n_id - 1)
+        if x < w - 1:
+            result.append(n_id + 1)
+        if y < self.h - 1:
+            result.append(n_id + w)
+        return result
+
+    def edge_index(self, a_id, b_id):
+        if b_id < a_id:
+            a_id, b_id = b_id, a_id
+        w = self.w
+        if a_id < 0 or b_id >= self.w * self.h:
+            return None
+        y, x = divmod(a_id, w)
+        if b_id == a_id + 1 and x < w - 1:
+            down = False
+        elif b_id == a_id + w:
+            down = True
+        else:
+            return None
+        base = y * (2 * w - 1)
+        if y == self.h - 1:
+            return base + x
+        if x == w - 1:
+            return base + 2 * (w - 1)
+        return base + 2 * x + down
+
+
+class PolarGridGraph(CompactGraph):
+    """Circular grid of rings around a centre cell, with arithmetic adjacency
+
+    Ring 0 is the single centre cell and ring 1 has first_ring cells. Each
+    further ring keeps the cell count of the ring inside it, or multiplies
+    it when the cells would otherwise get too wide, so cells stay roughly
+    square at every radius. Node ids run ring by ring, clockwise from angle
+    0, and x/y are the cell centres scaled by cell_size with the centre
+    cell at (rings * cell_size, rings * cell_size).
+
+    Nothing per node or edge is stored; ring lookups are a bisect over the
+    per-ring offsets. Every node after the centre lists two edges, inward
+    then clockwise, so edge 2*(n_id-1) joins n_id to the ring inside it.
+    """
+
+    def __init__(self, rings, first_ring=6, cell_size=10):
+        if rings < 0:
+            raise ValueError(f"Ring count must not be negative, got {rings}")
+        if first_ring < 3:
+            raise ValueError(f"The first ring needs at least 3 cells, got {first_ring}")
+        self.rings = rings
+        self.cell_size = cell_size
+        sizes = array('i', [1])
+        for ring in range(1, rings + 1):
+            if ring == 1:
+                sizes.append(first_ring)
+            else:
+                cell_width = 2 * math.pi * ring / sizes[-1]
+                sizes.append(sizes[-1] * max(1, round(cell_width)))
+        self.ring_sizes = sizes
+        self._ring_start = array('i', accumulate(sizes, initial=0))
+
+    def node_count(self):
+        return self._ring_start[-1]
+
+    def edge_count(self):
+        return 2 * (self.node_count() - 1)
+
+    def cell(self, n_id):
+        """Return the (ring, position) of a node"""
+        ring = bisect_right(self._ring_start, n_id) - 1
+        return ring, n_id - self._ring_start[ring]
+
+    def index(self, ring, position):
+        """Return the node id of a (ring, position) cell, wrapping position"""
+        return self._ring_start[ring] + position % self.ring_sizes[ring]
+
+    def node(self, n_id):
+        ring, position = self.cell(n_id)
+        centre = self.rings * self.cell_size
+        radius = ring * self.cell_size
+        angle = 2 * math.pi * (position + 0.5) / self.ring_sizes[ring]
+        return Node(centre + round(radius * math.cos(angle)),
+                    centre + round(radius * math.sin(angle)), n_id)
+
+    def _inward(self, ring, position):
+        ratio = self.ring_sizes[ring] // self.ring_sizes[ring - 1]
+        return self._ring_start[ring - 1] + position // ratio
+
+    def edge(self, e_id):
+        if not 0 <= e_id < self.edge_count():
+            raise IndexError("edge index out of range")
+        a_id = e_id // 2 + 1
+        ring, position = self.cell(a_id)
+        b_id = self.index(ring, position + 1) if e_id % 2 else self._inward(ring, position)
+        return Edge(self.node(a_id), self.node(b_id), a_id, b_id)
+
+    def node_records(self):
+        for n_id in range(self.node_count()):
+            node = self.node(n_id)
+            yield n_id, node.x, node.y
+
+    def edge_pairs(self):
+        sizes = self.ring_sizes
+        starts = self._ring_start
+        for ring in range(1, self.rings + 1):
+            start, size = starts[ring], sizes[ring]
+            ratio = size // sizes[ring - 1]
+            for position in range(size):
+                yield start + position, starts[ring - 1] + position // ratio
+                yield start + position, start + (position + 1) % size
+
+    def to_compact(self):
+        return CompactGraph.from_records(self.node_records(), self.edge_pairs(), weights=self.weights)
+
+    def neighbors(self, n_id):
+        ring, position = self.cell(n_id)
+        result = []
+        if ring > 0:
+            size = self.ring_sizes[ring]
+            start = self._ring_start[ring]
+            result.append(self._inward(ring, position))
+            result.append(start + (position - 1) % size)
+            result.append(start + (position + 1) % size)
+        if ring < self.rings:
+            ratio = self.ring_sizes[ring + 1] // self.ring_sizes[ring]
+            first = self._ring_start[ring + 1] + position * ratio
+            result.extend(range(first, first + ratio))
+        return result
+
+    def edge_index(self, a_id, b_id):
+        n = self.node_count()
+        if not (0 <= a_id < n and 0 <= b_id < n) or a_id == b_id:
+            return None
+        if b_id < a_id:
+            a_id, b_id = b_id, a_id
+        b_ring, b_position = self.cell(b_id)
+        if self._inward(b_ring, b_position) == a_id:
+            return 2 * (b_id - 1)
+        a_ring, a_position = self.cell(a_id)
+        if a_ring != b_ring:
+            return None
+        if self.index(b_ring, b_position + 1) == a_id:
+            return 2 * (b_id - 1) + 1
+        if b_position == a_position + 1:
+            return 2 * (a_id - 1) + 1
+        return None
+
+
+class _RowGridGraph(CompactGraph):
+    """Base for implicit w x h tilings with node ids numbered row by row
+
+    Subclasses supply node, edge, edge_pairs, neighbors and edge_index.
+    Every row but the last lists its edges cell by cell; the last row only
+    has the w-1 edges along it.
+    """
+
+    def __init__(self, w, h, cell_size=10):
+        if w < 1 or h < 1:
+            raise ValueError(f"Grid size must be at least 1x1, got {w}x{h}")
+        self.w = w
+        self.h = h
+        self.cell_size = cell_size
+
+    def node_count(self):
+        return self.w * self.h
+
+    def cell(self, n_id):
+        """Return the (col, row) offset coordinates of a node"""
+        row, col = divmod(n_id, self.w)
+        return col, row
+
+    def index(self, col, row):
+        """Return the node id at (col, row), or None if it is off the grid"""
+        if 0 <= col < self.w and 0 <= row < self.h:
+            return col + self.w * row
+        return None
+
+    def node_records(self):
+        for n_id in range(self.node_count()):
+            node = self.node(n_id)
+            yield n_id, node.x, node.y
+
+    def to_compact(self):
+        return CompactGraph.from_records(self.node_records(), self.edge_pairs(), weights=self.weights)
+
+    def _edge_from_ids(self, a_id, b_id):
+        return Edge(self.node(a_id), self.node(b_id), a_id, b_id)
+
+
+class HexGridGraph(_RowGridGraph):
+    """Grid of pointy-top hexagons with arithmetic adjacency
+
+    Cells are stored in "odd-r" offset layout: node col + w*row, with odd
+    rows shifted half a cell right. The axial coordinates of a cell are
+    (q, r) = (col - row // 2, row), and its six neighbors are at axial
+    offsets (+-1, 0), (0, +-1), (+1, -1) and (-1, +1). x/y are the cell
+    centres with cell_size between neighboring centres.
+
+    Each row but the last lists, per cell, the edges to its down-left and
+    down-right neighbors and then the one to its right: 3w-2 edges a row.
+    """
+
+    def edge_count(self):
+        return (3 * self.w - 2) * (self.h - 1) + self.w - 1
+
+    def axial(self, n_id):
+        """Return the axial (q, r) coordinates of a node"""
+        row, col = divmod(n_id, self.w)
+        return col - row // 2, row
+
+    def from_axial(self, q, r):
+        """Return the node id at axial (q, r), or None if it is off the grid"""
+        return self.index(q + r // 2, r)
+
+    def node(self, n_id):
+        row, col = divmod(n_id, self.w)
+        size = self.cell_size
+        return Node(round(size * (col + 0.5 * (row & 1))), round(size * math.sqrt(3) / 2 * row), n_id)
+
+    def _down(self, col, row):
+        """Return the columns of the down-left and down-right neighbors"""
+        return (col, col + 1) if row & 1 else (col - 1, col)
+
+    def edge(self, e_id):
+        if not 0 <= e_id < self.edge_count():
+            raise IndexError("edge index out of range")
+        w = self.w
+        row, rest = divmod(e_id, 3 * w - 2)
+        if row >= self.h - 1:
+            row = self.h - 1
+            a_id = w * row + e_id - row * (3 * w - 2)
+            return self._edge_from_ids(a_id, a_id + 1)
+        if not row & 1:
+            rest += 1  # col 0 of an even row has no down-left neighbor
+        col, slot = divmod(rest, 3)
+        a_id = col + w * row
+        if slot == 2:
+            return self._edge_from_ids(a_id, a_id + 1)
+        return self._edge_from_ids(a_id, self._down(col, row)[slot] + w * (row + 1))
+
+    def edge_pairs(self):
+        w, h = self.w, self.h
+        for row in range(h):
+            for col in range(w):
+                a_id = col + w * row
+                if row < h - 1:
+                    for down in self._down(col, row):
+                        if 0 <= down < w:
+                            yield a_id, down + w * (row + 1)
+                if col < w - 1:
+                    yield a_id, a_id + 1
+
+    def neighbors(self, n_id):
+        w = self.w
+        row, col = divmod(n_id, w)
+        result = []
+        # The rows above and below touch the same two columns
+        for other_row in (row - 1, row + 1):
+            if 0 <= other_row < self.h:
+                for other in self._down(col, row):
+                    if 0 <= other < w:
+                        result.append(other + w * other_row)
+        if col > 0:
+            result.append(n_id - 1)
+        if col < w - 1:
+            result.append(n_id + 1)
+        return result
+
+    def edge_index(self, a_id, b_id):
+        if b_id < a_id:
+            a_id, b_id = b_id, a_id
+        w = self.w
+        if a_id < 0 or b_id >= self.node_count():
+            return None
+        row, col = divmod(a_id, w)
+        b_row, b_col = divmod(b_id, w)
+        if b_row == row and b_col == col + 1:
+            if row == self.h - 1:
+                return row * (3 * w - 2) + col
+            slot = 2
+        elif b_row == row + 1 and b_col in self._down(col, row):
+            slot = self._down(col, row).index(b_col)
+        else:
+            return None
+        return row * (3 * w - 2) + 3 * col + slot - (0 if row & 1 else 1)
+
+
+class TriGridGraph(_RowGridGraph):
+    """Grid of alternating up- and down-pointing triangles with arithmetic adjacency
+
+    Node col + w*row points up when col + row is even. Every cell joins
+    the cells either side of it in its row; an up triangle shares its base
+    with the down triangle below it. x/y are the cell centroids with
+    cell_size between neighboring centroids.
+
+    Each row but the last lists, per cell, the edge down (up triangles
+    only) and then the one to its right: three edges for every two cells.
+    """
+
+    def points_up(self, n_id):
+        """Return True if the triangle at n_id points up"""
+        row, col = divmod(n_id, self.w)
+        return (col + row) % 2 == 0
+
+    def _row_offset(self, row):
+        w = self.w
+        return row // 2 * (3 * w - 2) + row % 2 * (w - 1 + (w + 1) // 2)
+
+    def edge_count(self):
+        return self._row_offset(self.h - 1) + self.w - 1
+
+    def node(self, n_id):
+        row, col = divmod(n_id, self.w)
+        size = self.cell_size
+        y = 1.5 * row + (1.0 if (col + row) % 2 == 0 else 0.5)
+        return Node(round(size * math.sqrt(3) / 2 * (col + 1)), round(size * y), n_id)
+
+    def edge(self, e_id):
+        if not 0 <= e_id < self.edge_count():
+            raise IndexError("edge index out of range")
+        w, h = self.w, self.h
+        pair, rest = divmod(e_id, 3 * w - 2)
+        row = 2 * pair
+        even_row_edges = w - 1 + (w + 1) // 2
+        if rest >= even_row_edges:
+            row += 1
+            rest -= even_row_edges
+        if row >= h - 1:
+            a_id = w * (h - 1) + e_id - self._row_offset(h - 1)
+            return self._edge_from_ids(a_id, a_id + 1)
+        # Cells pair up as (2k, 2k+1) with three edge slots per pair:
+        # down, right, right on even rows and right, down, right on odd ones
+        k, slot = divmod(rest, 3)
+        if row & 1:
+            col, down = 2 * k + (slot > 0), slot == 1
+        else:
+            col, down = 2 * k + (slot == 2), slot == 0
+        a_id = col + w * row
+        return self._edge_from_ids(a_id, a_id + w if down else a_id + 1)
+
+    def edge_pairs(self):
+        w, h = self.w, self.h
+        for row in range(h):
+            for col in range(w):
+                a_id = col + w * row
+                if row < h - 1 and (col + row) % 2 == 0:
+                    yield a_id, a_id + w
+                if col < w - 1:
+                    yield a_id, a_id + 1
+
+    def neighbors(self, n_id):
+        w = self.w
+        row, col = divmod(n_id, w)
+        result = []
+        if (col + row) % 2 == 0:
+            if row < self.h - 1:
+                result.append(n_id + w)
+        elif row > 0:
+            result.append(n_id - w)
+        if col > 0:
+            result.append(n_id - 1)
+        if col < w - 1:
+            result.append(n_id + 1)
+        return result
+
+    def edge_index(self, a_id, b_id):
+        if b_id < a_id:
+            a_id, b_id = b_id, a_id
+        w = self.w
+        if a_id < 0 or b_id >= self.node_count():
+            return None
+        row, col = divmod(a_id, w)
+        if b_id == a_id + 1 and col < w - 1:
+            if row == self.h - 1:
+                return self._row_offset(row) + col
+            slot = 2 if col % 2 else 1 - row % 2
+        elif b_id == a_id + w and (col + row) % 2 == 0:
+            slot = row % 2
+        else:
+            return None
+        return self._row_offset(row) + 3 * (col // 2) + slot
+
+
+def _int_array_from_numpy(values):
+    """Return a NumPy integer array as an int array, copying it in one go"""
+    result = array('i')
+    result.frombytes(np.ascontiguousarray(values, dtype=np.intc).tobytes())
+    return result
+
+
+def _mask_pieces(mask):
+    """Label the 4-connected pieces of a 2D boolean mask
+
+    Returns one label per set cell, in row-major order; cells share a label
+    exactly when they are in the same piece. Horizontal runs of cells are
+    merged first, then the runs are joined through their vertical contacts
+    by repeated hooking of roots and pointer jumping, all in NumPy.
+    """
+    starts = mask.copy()
+    starts[:, 1:] &= ~mask[:, :-1]
+    runs = (np.cumsum(starts.ravel(), dtype=np.intc) - 1).reshape(mask.shape)
+    contact = mask[:-1] & mask[1:]
+    upper = runs[:-1][contact]
+    lower = runs[1:][contact]
+
+    parent = np.arange(int(starts.sum()), dtype=np.intc)
+    while True:
+        upper_root = parent[upper]
+        lower_root = parent[lower]
+        split = upper_root != lower_root
+        if not split.any():
+            return parent[runs[mask]]
+        upper_root = upper_root[split]
+        lower_root = lower_root[split]
+        # Hooking the larger root onto a smaller one keeps parent a forest
+        parent[np.maximum(upper_root, lower_root)] = np.minimum(upper_root, lower_root)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+
+class MaskedGridGraph(CompactGraph):
+    """Grid graph of the cells set in a 2D boolean mask
+
+    mask[y][x] marks cell (x, y) as part of the maze. Nodes are the set
+    cells in row-major order with compact ids 0..n-1 and their grid x/y;
+    edges join set cells that are horizontally or vertically adjacent,
+    listed per cell right then down as in RectGridGraph. Node and edge
+    arrays are built with NumPy shifts, so large masks convert quickly.
+
+    A maze must be connected, so when the mask falls into separate pieces,
+    as letters and logos usually do, only one piece is kept: the one with
+    the cell keep = (x, y) in it, or else the largest. Cells of the other
+    pieces are left out as if they were not set.
+
+    There are deliberately no w/h attributes: the mask is not a full
+    rectangle, so the default maze end is the farthest cell found by the
+    generic search, not the bottom-right corner. Use shape and index()
+    for the mask size and (x, y) lookups.
+    """
+
+    def __init__(self, mask, keep=None):
+        if np is None:
+            raise ImportError("MaskedGridGraph requires NumPy: pip install numpy")
+        mask = np.asarray(mask, dtype=bool)
+        if mask.ndim != 2:
+            raise ValueError(f"Mask must be 2D, got shape {mask.shape}")
+        self.shape = mask.shape  # (rows, cols), as for the mask
+
+        if keep is not None:
+            x, y = keep
+            if not (0 <= y < mask.shape[0] and 0 <= x < mask.shape[1] and mask[y, x]):
+                raise ValueError(f"Cell {keep} to keep is not set in the mask")
+        if mask.any():
+            pieces = _mask_pieces(mask)
+            if keep is None:
+                piece = np.argmax(np.bincount(pieces))
+            else:
+                piece = pieces[np.count_nonzero(mask[:y]) + np.count_nonzero(mask[y, :x])]
+            if not (pieces == piece).all():
+                mask = mask.copy()
+                mask[mask] = pieces == piece
+
+        ids = np.full(mask.shape, -1, dtype=np.intc)
+        ys, xs = np.nonzero(mask)
+        ids[ys, xs] = np.arange(len(xs), dtype=np.intc)
+        self._ids = ids
+
+        # Slot 0 of each cell is the edge right, slot 1 the edge down
+        rows, cols = mask.shape
+        targets = np.full((rows, cols, 2), -1, dtype=np.intc)
+        targets[:, :-1, 0] = ids[:, 1:]
+        targets[:-1, :, 1] = ids[1:, :]
+        valid = (targets >= 0) & mask[:, :, None]
+        edge_a = np.broadcast_to(ids[:, :, None], targets.shape)[valid]
+
+        super().__init__(_int_array_from_numpy(xs), _int_array_from_numpy(ys),
+                         _int_array_from_numpy(edge_a), _int_array_from_numpy(targets[valid]))
+
+    @classmethod
+    def from_image(cls, filepath, threshold=128, invert=False, keep=None):
+        """
+        Build a graph from the dark, opaque pixels of an image, one cell per pixel.
+
+        Args:
+            filepath: Image file pygame can load, e.g. a PNG
+            threshold: Pixels with a luminance below this are cells
+            invert: Use the light pixels instead of the dark ones
+            keep: (x, y) of a pixel whose piece to keep, as for the constructor
+        """
+        import pygame  # only needed to read images
+
+        surface = pygame.image.load(filepath)
+        rgb = pygame.surfarray.array3d(surface).astype(np.float32)
+        luminance = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        mask = luminance >= threshold if invert else luminance < threshold
+        if surface.get_flags() & pygame.SRCALPHA:
+            mask &= pygame.surfarray.array_alpha(surface) >= 128
+        return cls(mask.T, keep)  # surfarray arrays are indexed [x][y]
+
+    def index(self, x, y):
+        """Return the node id of cell (x, y), or None if it is not in the mask"""
+        rows, cols = self.shape
+        if 0 <= x < cols and 0 <= y < rows:
+            n_id = int(self._ids[y, x])
+            if n_id >= 0:
+                return n_id
+        return None
+
+    def _build_csr(self):
+        # Same layout as CompactGraph._build_csr, with a stable sort of the
+        # interleaved endpoints keeping each node's edges in listed order
+        edge_a = np.frombuffer(self.edge_a, dtype=np.intc)
+        edge_b = np.frombuffer(self.edge_b, dtype=np.intc)
+        ends = np.stack([edge_a, edge_b], axis=1).ravel()
+        others = np.stack([edge_b, edge_a], axis=1).ravel()
+        order = np.argsort(ends, kind='stable')
+        counts = np.bincount(ends, minlength=self.node_count())
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        self._offsets = _int_array_from_numpy(offsets)
+        self._targets = _int_array_from_numpy(others[order])
+        self._edge_ids = _int_array_from_numpy(order // 2)
+
+
+class Grid3DGraph(CompactGraph):
+    """w x h x d grid of cells stacked in d levels, with arithmetic adjacency
+
+    Node x + w*(y + h*z) is cell (x, y) on level z. Each level is an
+    ImplicitRectGridGraph joined to the level above it cell by cell, and
+    nothing per node or edge is stored. Edges are numbered level by level:
+    the level's own edges in RectGridGraph order, then the w*h edges up to
+    the next level.
+    """
+
+    def __init__(self, w, h, d):
+        if w < 1 or h < 1 or d < 1:
+            raise ValueError(f"Grid size must be at least 1x1x1, got {w}x{h}x{d}")
+        self.w = w
+        self.h = h
+        self.d = d
+        self._level = ImplicitRectGridGraph(w, h)
+
+    @property
+    def zs(self):
+        """Node levels, computed as for node_zs()"""
+        return self.node_zs()
+
+    def _level_stride(self):
+        """Edges listed per level below the top one"""
+        return self._level.edge_count() + self.w * self.h
+
+    def node_count(self):
+        return self.w * self.h * self.d
+
+    def edge_count(self):
+        return self.d * self._level.edge_count() + (self.d - 1) * self.w * self.h
+
+    def node(self, n_id):
+        z, rest = divmod(n_id, self.w * self.h)
+        y, x = divmod(rest, self.w)
+        return Node(x, y, n_id, z)
+
+    def edge(self, e_id):
+        if not 0 <= e_id < self.edge_count():
+            raise IndexError("edge index out of range")
+        area = self.w * self.h
+        z, rest = divmod(e_id, self._level_stride())
+        level_edges = self._level.edge_count()
+        if rest < level_edges:
+            level_edge = self._level.edge(rest)
+            a_id = level_edge.a_id + z * area
+            b_id = level_edge.b_id + z * area
+        else:
+            a_id = z * area + rest - level_edges
+            b_id = a_id + area
+        return Edge(self.node(a_id), self.node(b_id), a_id, b_id)
+
+    def node_records(self):
+        w, area = self.w, self.w * self.h
+        return ((n_id, n_id % w, n_id % area // w) for n_id in range(self.node_count()))
+
+    def edge_pairs(self):
+        area = self.w * self.h
+        level_pairs = list(self._level.edge_pairs())
+        for z in range(self.d):
+            offset = z * area
+            for a_id, b_id in level_pairs:
+                yield a_id + offset, b_id + offset
+            if z < self.d - 1:
+                for a_id in range(offset, offset + area):
+                    yield a_id, a_id + area
+
+    def node_zs(self):
+        area = self.w * self.h
+        zs = array('i')
+        for z in range(self.d):
+            zs.extend(array('i', [z]) * area)
+        return zs
+
+    def to_compact(self):
+        return CompactGraph.from_records(self.node_records(), self.edge_pairs(), self.node_zs(),
+                                         self.weights)
+
+    def neighbors(self, n_id):
+        w = self.w
+        area = w * self.h
+        z, rest = divmod(n_id, area)
+        y, x = divmod(rest, w)
+        result = []
+        if z > 0:
+            result.append(n_id - area)
+        if y > 0:
+            result.append(n_id - w)
+        if x > 0:
+            result.append(n_id - 1)
+        if x < w - 1:
+            result.append(n_id + 1)
+        if y < self.h - 1:
+            result.append(n_id + w)
+        if z < self.d - 1:
+            result.append(n_id + area)
+        return result
+
+    def edge_index(self, a_id, b_id):
+        if b_id < a_id:
+            a_id, b_id = b_id, a_id
+        area = self.w * self.h
+        if a_id < 0 or b_id >= self.node_count():
+            return None
+        z, rest = divmod(a_id, area)
+        if b_id == a_id + area:
+            return z * self._level_stride() + self._level.edge_count() + rest
+        if b_id // area != z:
+            return None
+        e_id = self._level.edge_index(rest, b_id - z * area)
+        return None if e_id is None else z * self._level_stride() + e_id
@@ -1,96 +1,763 @@
 #!/usr/bin/env python3
 """Maze generation functions using graph algorithms"""
 
+import os
 import random
-from graphs import Graph, Node, Edge, RectGridGraph
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from graphs import Graph, Node, Edge, CompactGraph, RectGridGraph
+from metrics import node_degrees, tree_diameter, path_between
 
+# GridMaze cell bits
+EAST = 1   # passage to the cell at x+1 is open
+SOUTH = 2  # passage to the cell at y+1 is open
 
-def generate_maze_dfs(graph, start_idx, end_idx=None):
+
+class MazeTree:
+    """Carved passages of a maze on any graph, as Edge objects plus adjacency lists"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.edges = []
+        self.adjacency = [[] for _ in range(graph.node_count())]
+
+    def carve(self, a_idx, b_idx):
+        """Open the passage between two adjacent nodes"""
+        self.edges.append(self.graph.edge_between(a_idx, b_idx))
+        self.adjacency[a_idx].append(b_idx)
+        self.adjacency[b_idx].append(a_idx)
+
+    def is_open(self, a_idx, b_idx):
+        return b_idx in self.adjacency[a_idx]
+
+    def neighbors(self, idx):
+        """Return the nodes reachable from idx through one open passage"""
+        return self.adjacency[idx]
+
+
+class GridMaze:
     """
-    Generate a maze using Depth-First Search algorithm on a graph.
+    Carved passages of a w x h grid maze, packed at 2 bits per cell.
+    
+    Each cell stores an EAST bit and a SOUTH bit, four cells to a byte of a
+    bytearray, which makes the result cheap to keep, pickle and send to
+    other processes. len() gives the number of open passages, like the
+    edge list it replaces.
+    """
+    __slots__ = ('w', 'h', 'bits')
+
+    def __init__(self, w, h, bits=None):
+        self.w = w
+        self.h = h
+        if bits is None:
+            bits = bytearray((w * h + 3) // 4)
+        elif len(bits) != (w * h + 3) // 4:
+            raise ValueError(f"Expected {(w * h + 3) // 4} bytes for a {w}x{h} maze, got {len(bits)}")
+        self.bits = bytearray(bits)
+
+    def __len__(self):
+        return int.from_bytes(self.bits, 'little').bit_count()
+
+    def __eq__(self, other):
+        if not isinstance(other, GridMaze):
+            return NotImplemented
+        return (self.w, self.h, self.bits) == (other.w, other.h, other.bits)
+
+    def __repr__(self):
+        return f"GridMaze(w={self.w}, h={self.h}, passages={len(self)})"
+
+    def cell(self, idx):
+        """Return the EAST/SOUTH bits of a cell"""
+        return (self.bits[idx >> 2] >> ((idx & 3) << 1)) & 3
+
+    def _passage(self, a_idx, b_idx):
+        """Return (cell, bit) storing the passage between a and b, or None"""
+        if b_idx < a_idx:
+            a_idx, b_idx = b_idx, a_idx
+        if a_idx < 0 or b_idx >= self.w * self.h:
+            return None
+        if b_idx == a_idx + 1 and a_idx % self.w != self.w - 1:
+            return a_idx, EAST
+        if b_idx == a_idx + self.w:
+            return a_idx, SOUTH
+        return None
+
+    def carve(self, a_idx, b_idx):
+        """Open the passage between two adjacent cells"""
+        passage = self._passage(a_idx, b_idx)
+        if passage is None:
+            raise ValueError(f"Cells {a_idx} and {b_idx} are not adjacent in a {self.w}x{self.h} grid")
+        idx, bit = passage
+        self.bits[idx >> 2] |= bit << ((idx & 3) << 1)
+
+    def is_open(self, a_idx, b_idx):
+        passage = self._passage(a_idx, b_idx)
+        return passage is not None and bool(self.cell(passage[0]) & passage[1])
+
+    def neighbors(self, idx):
+        """Return the cells reachable from idx through one open passage"""
+        w = self.w
+        result = []
+        if idx >= w and self.cell(idx - w) & SOUTH:
+            result.append(idx - w)
+        if idx % w and self.cell(idx - 1) & EAST:
+            result.append(idx - 1)
+        bits = self.cell(idx)
+        if bits & EAST:
+            result.append(idx + 1)
+        if bits & SOUTH:
+            result.append(idx + w)
+        return result
+
+    def passages(self):
+        """Iterate (a_idx, b_idx) for every open passage, in RectGridGraph edge order"""
+        w = self.w
+        for idx in range(w * self.h):
+            bits = self.cell(idx)
+            if bits & EAST:
+                yield idx, idx + 1
+            if bits & SOUTH:
+                yield idx, idx + w
+
+    def to_edges(self):
+        """Return the open passages as a list of Edge objects"""
+        w = self.w
+        return [Edge(Node(a % w, a // w, a), Node(b % w, b // w, b), a, b)
+                for a, b in self.passages()]
+
+    @classmethod
+    def from_edges(cls, w, h, edges):
+        """Build a GridMaze from Edge objects of a w x h grid"""
+        maze = cls(w, h)
+        for edge in edges:
+            maze.carve(edge.a_id, edge.b_id)
+        return maze
+
+
+def make_rng(seed=None):
+    """
+    Return a private random.Random for a generator call.
     
     Args:
-        graph: A Graph object (should have nodes and edges)
+        seed: An int seed for a reproducible maze, a random.Random to use as
+              is, a NumPy Generator to draw a seed from, or None to draw a
+              seed from the global random module
+        
+    Returns:
+        random.Random: A random source not shared with other calls
+    """
+    if isinstance(seed, random.Random):
+        return seed
+    if seed is None:
+        return random.Random(random.getrandbits(64))
+    if hasattr(seed, 'bit_generator'):
+        return random.Random(int(seed.integers(2**63)))
+    return random.Random(seed)
+
+
+def new_seed():
+    """Draw a fresh seed that can be stored to regenerate a maze"""
+    return random.getrandbits(63)
+
+
+# Registered maze generators, by algorithm name
+GENERATORS = {}
+
+
+def register_generator(name):
+    """Decorator adding a generator function to GENERATORS under name"""
+    def decorator(func):
+        GENERATORS[name] = func
+        return func
+    return decorator
+
+
+def register_grid_carver(name):
+    """
+    Decorator registering a whole-grid carving function as a generator.
+    
+    The decorated function takes (w, h, seed) and returns a GridMaze. It is
+    wrapped into a RectGridGraph generator with the usual interface and
+    added to GENERATORS; the function itself is returned unchanged.
+    """
+    def decorator(carve):
+        def generator(graph, start_idx, end_idx=None, grid_maze=False, seed=None):
+            if not isinstance(graph, RectGridGraph):
+                raise ValueError(f"The {name!r} algorithm requires a RectGridGraph")
+            end_idx = _resolve_endpoints(graph, start_idx, end_idx)
+            maze, path = _finish_maze(graph, carve(graph.w, graph.h, seed), start_idx, end_idx, True)
+            return (maze if grid_maze else maze.to_edges()), path
+        
+        generator.__name__ = f"generate_maze_{name}"
+        generator.__doc__ = carve.__doc__
+        GENERATORS[name] = generator
+        return carve
+    return decorator
+
+
+def get_generator(name):
+    """Return the generator function registered under name"""
+    try:
+        return GENERATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown maze algorithm {name!r}, expected one of {sorted(GENERATORS)}") from None
+
+
+def generate_maze(graph, start_idx, end_idx=None, algorithm='dfs', grid_maze=False, seed=None,
+                  farthest=False):
+    """
+    Generate a maze with the named algorithm from GENERATORS.
+    
+    Args:
+        graph: A Graph object
         start_idx: Starting node index for the maze
-        end_idx: Optional ending node index (if None, will use a random far node)
+        end_idx: Optional ending node index
+        algorithm: Name of a registered generator, e.g. 'dfs' or 'kruskal'
+        grid_maze: Return the carved passages as a GridMaze (RectGridGraph only)
+        seed: Seed or random source, as accepted by make_rng
+        farthest: Ignore end_idx and return the longest path in the carved
+                  maze as the solution, so start and end are as far apart as
+                  the maze allows (see longest_path)
         
     Returns:
-        tuple: (maze_edges, path) where maze_edges are the edges in the maze
-               and path is the solution path from start to end
+        tuple: (maze_edges, path) as returned by the chosen generator
+    """
+    maze_edges, path = get_generator(algorithm)(graph, start_idx, end_idx, grid_maze=grid_maze, seed=seed)
+    if farthest:
+        path = longest_path(graph, maze_edges, start_idx)
+    return maze_edges, path
+
+
+def _open_passages(graph, maze_edges):
+    """Return a GridMaze as is, or load a list of maze edges into a MazeTree"""
+    if isinstance(maze_edges, GridMaze):
+        return maze_edges
+    maze = MazeTree(graph)
+    for edge in maze_edges:
+        maze.adjacency[edge.a_id].append(edge.b_id)
+        maze.adjacency[edge.b_id].append(edge.a_id)
+    return maze
+
+
+def longest_path(graph, maze_edges, source=0):
     """
-    # Validate inputs
-    if start_idx < 0 or start_idx >= len(graph.nodes):
-        raise ValueError(f"Start index {start_idx} is out of range for graph with {len(graph.nodes)} nodes")
+    Return the longest path through a carved maze.
+    
+    The ends come from metrics.tree_diameter, whose first pass starts at
+    source; the path starts at the end nearer to source.
+    
+    Args:
+        graph: The Graph the maze was carved on
+        maze_edges: List of maze edges, or a GridMaze
+        source: Node to measure from, e.g. the requested start node
+        
+    Returns:
+        list: Node indices along the longest path
+    """
+    maze = _open_passages(graph, maze_edges)
+    node_count = graph.node_count()
+    far_idx, near_idx, _ = tree_diameter(maze, node_count, source)
+    return path_between(maze, node_count, near_idx, far_idx)
+
+
+def _resolve_endpoints(graph, start_idx, end_idx):
+    """Validate start/end indices and choose a far end node if none is given"""
+    node_count = graph.node_count()
+    if start_idx < 0 or start_idx >= node_count:
+        raise ValueError(f"Start index {start_idx} is out of range for graph with {node_count} nodes")
     
     if end_idx is not None:
-        if end_idx < 0 or end_idx >= len(graph.nodes):
-            raise ValueError(f"End index {end_idx} is out of range for graph with {len(graph.nodes)} nodes")
+        if end_idx < 0 or end_idx >= node_count:
+            raise ValueError(f"End index {end_idx} is out of range for graph with {node_count} nodes")
     
     # If no end is specified, choose a far node (opposite corner for grid graphs)
     if end_idx is None and hasattr(graph, 'w') and hasattr(graph, 'h'):
-        # For RectGridGraph, choose opposite corner
-        end_idx = (graph.w - 1) + (graph.h - 1) * graph.w
+        # Grid graphs number cells row by row (and level by level), so the
+        # last node is the corner opposite node 0
+        end_idx = node_count - 1
     elif end_idx is None:
-        # For other graphs, choose a random node far from start
+        # For other graphs, choose a node far from start among those it can
+        # reach, so a graph in separate pieces still gets a solvable maze
+        reached = _reachable(graph, start_idx)
         max_distance = -1
         best_end = start_idx
         
-        for i, node in enumerate(graph.nodes):
-            if i == start_idx:
+        start = graph.node(start_idx)
+        zs = graph.node_zs()
+        for i, (_, x, y) in enumerate(graph.node_records()):
+            if i == start_idx or not reached[i]:
                 continue
             # Simple distance metric (could be improved)
-            distance = abs(node.x - graph.nodes[start_idx].x) + abs(node.y - graph.nodes[start_idx].y)
+            distance = abs(x - start.x) + abs(y - start.y)
+            if zs is not None:
+                distance += abs(zs[i] - start.z)
             if distance > max_distance:
                 max_distance = distance
                 best_end = i
         end_idx = best_end
     
-    # Create adjacency list for easier traversal
-    adjacency = {}
-    for node_idx, node in enumerate(graph.nodes):
-        adjacency[node_idx] = []
+    return end_idx
+
+
+def _reachable(graph, start_idx):
+    """Return a bytearray marking the nodes reachable from start_idx"""
+    reached = bytearray(graph.node_count())
+    reached[start_idx] = 1
+    stack = [start_idx]
+    while stack:
+        for neighbor_idx in graph.neighbors(stack.pop()):
+            if not reached[neighbor_idx]:
+                reached[neighbor_idx] = 1
+                stack.append(neighbor_idx)
+    return reached
+
+
+def _new_maze(graph, grid_maze):
+    """Return an empty MazeTree, or GridMaze if requested, for carving on graph"""
+    if not grid_maze:
+        return MazeTree(graph)
+    if not isinstance(graph, RectGridGraph):
+        raise ValueError("grid_maze=True requires a RectGridGraph")
+    return GridMaze(graph.w, graph.h)
+
+
+def _finish_maze(graph, maze, start_idx, end_idx, grid_maze):
+    """Solve the carved maze and return the (maze_edges, path) generator result"""
+    path = find_path(start_idx, end_idx, maze.neighbors, graph.node_count())
+    if path is None:
+        path = [start_idx, end_idx]
     
-    for edge in graph.edges:
-        adjacency[edge.a_id].append(edge.b_id)
-        adjacency[edge.b_id].append(edge.a_id)
+    return (maze if grid_maze else maze.edges), path
+
+
+def _edge_arrays(graph):
+    """Return the graph's edge endpoints as two int arrays"""
+    if hasattr(graph, 'edge_a'):
+        return graph.edge_a, graph.edge_b
+    edge_a = array('i')
+    edge_b = array('i')
+    for a_id, b_id in graph.edge_pairs():
+        edge_a.append(a_id)
+        edge_b.append(b_id)
+    return edge_a, edge_b
+
+
+@register_generator('dfs')
+def generate_maze_dfs(graph, start_idx, end_idx=None, grid_maze=False, seed=None):
+    """
+    Generate a maze using Depth-First Search algorithm on a graph.
+    
+    Args:
+        graph: A Graph object (should have nodes and edges)
+        start_idx: Starting node index for the maze
+        end_idx: Optional ending node index (if None, will use a random far node)
+        grid_maze: Return the carved passages as a GridMaze instead of a list
+                   of edges (RectGridGraph only)
+        seed: Seed or random source, as accepted by make_rng
+        
+    Returns:
+        tuple: (maze_edges, path) where maze_edges are the edges in the maze
+               and path is the solution path from start to end
+    """
+    end_idx = _resolve_endpoints(graph, start_idx, end_idx)
     
     # DFS to generate maze (similar to recursive backtracker algorithm)
-    visited = set()
+    maze = _new_maze(graph, grid_maze)
+    rng = make_rng(seed)
+    visited = bytearray(graph.node_count())
     stack = [start_idx]
-    maze_edges = []  # Edges that are part of the maze
     
     while stack:
         current_idx = stack[-1]
-        visited.add(current_idx)
+        visited[current_idx] = 1
         
         # Get unvisited neighbors
         unvisited_neighbors = []
-        for neighbor_idx in adjacency[current_idx]:
-            if neighbor_idx not in visited:
+        for neighbor_idx in graph.neighbors(current_idx):
+            if not visited[neighbor_idx]:
                 unvisited_neighbors.append(neighbor_idx)
         
         if unvisited_neighbors:
             # Choose random neighbor
-            next_idx = random.choice(unvisited_neighbors)
+            next_idx = rng.choice(unvisited_neighbors)
             
             # Add the edge between current and next to maze
-            # Find the actual edge in the graph
-            for edge in graph.edges:
-                if (edge.a_id == current_idx and edge.b_id == next_idx) or \
-                   (edge.a_id == next_idx and edge.b_id == current_idx):
-                    maze_edges.append(edge)
-                    break
+            maze.carve(current_idx, next_idx)
             
             stack.append(next_idx)
         else:
             # Backtrack
             stack.pop()
     
-    # Now find a path from start to end using the maze edges
-    # We'll use DFS again to find a path through the maze
-    path = find_path_dfs(start_idx, end_idx, maze_edges, graph.nodes)
+    # Now find a path from start to end through the passages just carved
+    return _finish_maze(graph, maze, start_idx, end_idx, grid_maze)
+
+
+@register_generator('kruskal')
+def generate_maze_kruskal(graph, start_idx, end_idx=None, grid_maze=False, seed=None):
+    """
+    Generate a maze with randomized Kruskal's algorithm.
     
-    return maze_edges, path
+    Edges are visited in random order and carved when they join two
+    different components of a union-find forest (union by size with path
+    halving), giving a uniform-looking maze with many short dead ends.
+    
+    Args and return value are as for generate_maze_dfs.
+    """
+    end_idx = _resolve_endpoints(graph, start_idx, end_idx)
+    maze = _new_maze(graph, grid_maze)
+    rng = make_rng(seed)
+    node_count = graph.node_count()
+    
+    edge_a, edge_b = _edge_arrays(graph)
+    order = list(range(len(edge_a)))
+    rng.shuffle(order)
+    
+    parent = array('i', range(node_count))
+    size = array('i', [1]) * node_count
+    remaining = node_count - 1
+    
+    for e_id in order:
+        if remaining == 0:
+            break
+        a_root = edge_a[e_id]
+        while parent[a_root] != a_root:
+            parent[a_root] = parent[parent[a_root]]
+            a_root = parent[a_root]
+        b_root = edge_b[e_id]
+        while parent[b_root] != b_root:
+            parent[b_root] = parent[parent[b_root]]
+            b_root = parent[b_root]
+        if a_root == b_root:
+            continue
+        
+        if size[a_root] < size[b_root]:
+            a_root, b_root = b_root, a_root
+        parent[b_root] = a_root
+        size[a_root] += size[b_root]
+        maze.carve(edge_a[e_id], edge_b[e_id])
+        remaining -= 1
+    
+    return _finish_maze(graph, maze, start_idx, end_idx, grid_maze)
+
+
+@register_generator('prim')
+def generate_maze_prim(graph, start_idx, end_idx=None, grid_maze=False, seed=None):
+    """
+    Generate a maze with randomized Prim's algorithm.
+    
+    The frontier (unvisited nodes next to the maze) is a list plus a
+    node -> position index, so a random frontier node is removed in O(1)
+    by swapping it with the last entry. Prim mazes have many short,
+    branching dead ends radiating from the start.
+    
+    Args and return value are as for generate_maze_dfs.
+    """
+    end_idx = _resolve_endpoints(graph, start_idx, end_idx)
+    maze = _new_maze(graph, grid_maze)
+    rng = make_rng(seed)
+    node_count = graph.node_count()
+    
+    visited = bytearray(node_count)
+    position = array('i', [-1]) * node_count  # Index in frontier, or -1
+    frontier = []
+    
+    def visit(idx):
+        visited[idx] = 1
+        for neighbor_idx in graph.neighbors(idx):
+            if not visited[neighbor_idx] and position[neighbor_idx] == -1:
+                position[neighbor_idx] = len(frontier)
+                frontier.append(neighbor_idx)
+    
+    visit(start_idx)
+    while frontier:
+        # Swap-remove a random frontier node
+        i = rng.randrange(len(frontier))
+        idx = frontier[i]
+        last = frontier.pop()
+        if last != idx:
+            frontier[i] = last
+            position[last] = i
+        
+        # Connect it to a random neighbor already in the maze
+        in_maze = [n for n in graph.neighbors(idx) if visited[n]]
+        maze.carve(rng.choice(in_maze), idx)
+        visit(idx)
+    
+    return _finish_maze(graph, maze, start_idx, end_idx, grid_maze)
+
+
+@register_generator('wilson')
+def generate_maze_wilson(graph, start_idx, end_idx=None, grid_maze=False, seed=None):
+    """
+    Generate a maze with Wilson's loop-erased random walk algorithm.
+    
+    Walks remember only the last exit taken from each node, which erases
+    loops implicitly and needs one int per node. The result is a uniform
+    spanning tree, i.e. an unbiased maze. Walks only start from nodes
+    reachable from start_idx, as a walk elsewhere could never meet the tree.
+    
+    Args and return value are as for generate_maze_dfs.
+    """
+    end_idx = _resolve_endpoints(graph, start_idx, end_idx)
+    maze = _new_maze(graph, grid_maze)
+    rng = make_rng(seed)
+    node_count = graph.node_count()
+    reachable = _reachable(graph, start_idx)
+    
+    in_tree = bytearray(node_count)
+    in_tree[start_idx] = 1
+    next_step = array('i', [-1]) * node_count
+    
+    for walk_start in range(node_count):
+        if not reachable[walk_start]:
+            continue
+        # Random walk until hitting the tree
+        idx = walk_start
+        while not in_tree[idx]:
+            next_idx = rng.choice(graph.neighbors(idx))
+            next_step[idx] = next_idx
+            idx = next_idx
+        
+        # Add the loop-erased walk to the tree
+        idx = walk_start
+        while not in_tree[idx]:
+            in_tree[idx] = 1
+            maze.carve(idx, next_step[idx])
+            idx = next_step[idx]
+    
+    return _finish_maze(graph, maze, start_idx, end_idx, grid_maze)
+
+
+@register_generator('aldous_broder')
+def generate_maze_aldous_broder(graph, start_idx, end_idx=None, grid_maze=False, seed=None):
+    """
+    Generate a maze with the Aldous-Broder random walk algorithm.
+    
+    A random walk carves into every node the first time it is entered.
+    The result is a uniform spanning tree, but the walk takes the cover
+    time of the graph, so prefer 'wilson' for large boards. The walk ends
+    once it has covered every node reachable from start_idx.
+    
+    Args and return value are as for generate_maze_dfs.
+    """
+    end_idx = _resolve_endpoints(graph, start_idx, end_idx)
+    maze = _new_maze(graph, grid_maze)
+    rng = make_rng(seed)
+    node_count = graph.node_count()
+    
+    visited = bytearray(node_count)
+    visited[start_idx] = 1
+    remaining = sum(_reachable(graph, start_idx)) - 1
+    idx = start_idx
+    
+    while remaining:
+        next_idx = rng.choice(graph.neighbors(idx))
+        if not visited[next_idx]:
+            visited[next_idx] = 1
+            maze.carve(idx, next_idx)
+            remaining -= 1
+        idx = next_idx
+    
+    return _finish_maze(graph, maze, start_idx, end_idx, grid_maze)
+
+
+@register_generator('hunt_and_kill')
+def generate_maze_hunt_and_kill(graph, start_idx, end_idx=None, grid_maze=False, seed=None):
+    """
+    Generate a maze with the Hunt-and-Kill algorithm.
+    
+    Random walks carve through unvisited nodes; when a walk is stuck the
+    hunt scans for an unvisited node next to the maze. The scan resumes
+    from the lowest index that may still be unvisited, so it never rescans
+    the finished prefix. Mazes have long winding corridors like DFS without
+    needing a stack.
+    
+    Args and return value are as for generate_maze_dfs.
+    """
+    end_idx = _resolve_endpoints(graph, start_idx, end_idx)
+    maze = _new_maze(graph, grid_maze)
+    rng = make_rng(seed)
+    node_count = graph.node_count()
+    
+    visited = bytearray(node_count)
+    visited[start_idx] = 1
+    idx = start_idx
+    cursor = 0
+    
+    while idx is not None:
+        # Kill: walk to random unvisited neighbors
+        unvisited_neighbors = [n for n in graph.neighbors(idx) if not visited[n]]
+        if unvisited_neighbors:
+            next_idx = rng.choice(unvisited_neighbors)
+            visited[next_idx] = 1
+            maze.carve(idx, next_idx)
+            idx = next_idx
+            continue
+        
+        # Hunt: find an unvisited node bordering the maze
+        while cursor < node_count and visited[cursor]:
+            cursor += 1
+        idx = None
+        for candidate in range(cursor, node_count):
+            if visited[candidate]:
+                continue
+            in_maze = [n for n in graph.neighbors(candidate) if visited[n]]
+            if in_maze:
+                visited[candidate] = 1
+                maze.carve(rng.choice(in_maze), candidate)
+                idx = candidate
+                break
+    
+    return _finish_maze(graph, maze, start_idx, end_idx, grid_maze)
+
+
+@register_generator('eller')
+def generate_maze_eller(graph, start_idx, end_idx=None, grid_maze=False, seed=None):
+    """
+    Generate a maze on a RectGridGraph with Eller's row-by-row algorithm.
+    
+    The rows come from iter_eller_rows, so the working state is O(width)
+    however tall the grid is.
+    
+    Args and return value are as for generate_maze_dfs.
+    """
+    if not isinstance(graph, RectGridGraph):
+        raise ValueError("Eller's algorithm requires a RectGridGraph")
+    end_idx = _resolve_endpoints(graph, start_idx, end_idx)
+    maze = _new_maze(graph, grid_maze)
+    w = graph.w
+    
+    for y, row_bits in enumerate(iter_eller_rows(w, graph.h, seed)):
+        row = w * y
+        for x, bits in enumerate(row_bits):
+            if bits & EAST:
+                maze.carve(row + x, row + x + 1)
+            if bits & SOUTH:
+                maze.carve(row + x, row + x + w)
+    
+    return _finish_maze(graph, maze, start_idx, end_idx, grid_maze)
+
+
+def iter_eller_rows(w, h=None, seed=None):
+    """
+    Generate a w-wide grid maze one row at a time with Eller's algorithm.
+    
+    Only the set labels of the current row are kept, renumbered below w
+    after every row, so memory stays O(w) for any number of rows. With
+    h=None the generator never ends; the consumer decides when to stop,
+    but then the bottom row is not closed off into one connected set.
+    
+    Args:
+        w: Width of the maze in cells
+        h: Number of rows to generate, or None for an unbounded maze
+        seed: Seed or random source, as accepted by make_rng
+        
+    Yields:
+        bytearray: One byte per cell of the row holding its EAST/SOUTH bits
+    """
+    rng = make_rng(seed)
+    labels = list(range(w))
+    parent = list(range(w))
+    
+    def find(label):
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+    
+    y = 0
+    while h is None or y < h:
+        last_row = y == h - 1 if h is not None else False
+        row_bits = bytearray(w)
+        
+        # Join horizontally adjacent cells from different sets
+        parent[:] = range(w)
+        for x in range(w - 1):
+            a_root = find(labels[x])
+            b_root = find(labels[x + 1])
+            if a_root != b_root and (last_row or rng.random() < 0.5):
+                parent[b_root] = a_root
+                row_bits[x] |= EAST
+        
+        if not last_row:
+            # Every set continues down through at least one cell
+            members = {}
+            for x in range(w):
+                members.setdefault(find(labels[x]), []).append(x)
+            carried = [False] * w
+            for xs in members.values():
+                rng.shuffle(xs)
+                for i, x in enumerate(xs):
+                    if i == 0 or rng.random() < 0.5:
+                        row_bits[x] |= SOUTH
+                        carried[x] = True
+            
+            # Renumber: carried cells keep their set, the rest get new ones
+            renumber = {}
+            free = iter(range(w))
+            for x in range(w):
+                if carried[x]:
+                    root = find(labels[x])
+                    if root not in renumber:
+                        renumber[root] = next(free)
+                    labels[x] = renumber[root]
+            for x in range(w):
+                if not carried[x]:
+                    labels[x] = next(free)
+        
+        yield row_bits
+        y += 1
+
+
+def find_path(start_idx, end_idx, neighbors, node_count, method='bfs'):
+    """
+    Find a path from start to end by recording a parent pointer per node.
+    
+    Each node is expanded at most once and the path is rebuilt once at the
+    end, so the search is linear in the size of the maze.
+    
+    Args:
+        start_idx: Starting node index
+        end_idx: Ending node index
+        neighbors: Callable returning the indices adjacent to a node index
+        node_count: Number of nodes in the graph
+        method: 'bfs' for a fewest-steps path or 'dfs' for depth-first order
+        
+    Returns:
+        list: List of node indices from start to end, or None if end is unreachable
+    """
+    if method == 'bfs':
+        frontier = deque([start_idx])
+        take = frontier.popleft
+    elif method == 'dfs':
+        frontier = [start_idx]
+        take = frontier.pop
+    else:
+        raise ValueError(f"Unknown search method {method!r}, expected 'bfs' or 'dfs'")
+    
+    parent = array('i', [-1]) * node_count
+    parent[start_idx] = start_idx
+    
+    while frontier:
+        current_idx = take()
+        if current_idx == end_idx:
+            break
+        for neighbor_idx in neighbors(current_idx):
+            if parent[neighbor_idx] == -1:
+                parent[neighbor_idx] = current_idx
+                frontier.append(neighbor_idx)
+    
+    if parent[end_idx] == -1:
+        return None
+    
+    path = [end_idx]
+    while path[-1] != start_idx:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
 
 
 def find_path_dfs(start_idx, end_idx, maze_edges, nodes):
@@ -107,37 +774,19 @@ def find_path_dfs(start_idx, end_idx, maze_edges, nodes):
         list: List of node indices forming the path from start to end
     """
     # Create adjacency list from maze edges
-    adjacency = {}
-    for node_idx in range(len(nodes)):
-        adjacency[node_idx] = []
-    
+    adjacency = [[] for _ in range(len(nodes))]
     for edge in maze_edges:
         adjacency[edge.a_id].append(edge.b_id)
         adjacency[edge.b_id].append(edge.a_id)
     
-    # DFS to find path
-    visited = set()
-    stack = [(start_idx, [start_idx])]  # (current_idx, path_so_far)
-    
-    while stack:
-        current_idx, path_so_far = stack.pop()
-        
-        if current_idx == end_idx:
-            return path_so_far
-        
-        if current_idx not in visited:
-            visited.add(current_idx)
-            
-            # Add neighbors to stack in reverse order to process them in order
-            for neighbor_idx in reversed(adjacency[current_idx]):
-                if neighbor_idx not in visited:
-                    stack.append((neighbor_idx, path_so_far + [neighbor_idx]))
+    path = find_path(start_idx, end_idx, adjacency.__getitem__, len(nodes), method='dfs')
     
     # If no path found (shouldn't happen in a connected maze)
-    return [start_idx, end_idx]
+    return path if path is not None else [start_idx, end_idx]
 
 
-def generate_maze_with_solution(graph, start_idx, end_idx=None):
+def generate_maze_with_solution(graph, start_idx, end_idx=None, algorithm='dfs', seed=None,
+                                farthest=False):
     """
     Convenience function that generates a maze and returns both the maze and solution.
     
@@ -145,20 +794,164 @@ def generate_maze_with_solution(graph, start_idx, end_idx=None):
         graph: A Graph object
         start_idx: Starting node index
         end_idx: Optional ending node index
+        algorithm: Name of a registered generator (see GENERATORS)
+        seed: Integer seed; a new one is drawn when None so the maze can
+              always be regenerated from the returned seed
+        farthest: Place start and end at the ends of the maze's longest path
         
     Returns:
-        dict: Dictionary containing maze_edges and solution_path
+        dict: Dictionary containing maze_edges, solution_path and seed
     """
-    maze_edges, solution_path = generate_maze_dfs(graph, start_idx, end_idx)
+    if seed is None:
+        seed = new_seed()
+    maze_edges, solution_path = generate_maze(graph, start_idx, end_idx, algorithm, seed=seed,
+                                              farthest=farthest)
     
     return {
         'maze_edges': maze_edges,
         'solution_path': solution_path,
-        'start_node': graph.nodes[start_idx],
-        'end_node': graph.nodes[end_idx]
+        'start_node': graph.node(solution_path[0]),
+        'end_node': graph.node(solution_path[-1]),
+        'seed': seed
     }
 
 
+def dead_end_ratio(graph, maze_edges):
+    """Return the fraction of nodes with a single open passage"""
+    node_count = graph.node_count()
+    dead_ends = node_degrees(_open_passages(graph, maze_edges), node_count).count(1)
+    return dead_ends / node_count if node_count else 0.0
+
+
+def _attempt_targeted(graph, start_idx, end_idx, algorithm, grid_maze, farthest, limits, seed):
+    """Generate one candidate; return (maze_edges, path) if it meets limits, else None"""
+    min_length, max_length, min_dead_ends, max_dead_ends = limits
+    maze_edges, path = generate_maze(graph, start_idx, end_idx, algorithm, grid_maze, seed, farthest)
+    
+    # Cheapest test first: the solution length comes with the maze
+    if min_length is not None and len(path) < min_length:
+        return None
+    if max_length is not None and len(path) > max_length:
+        return None
+    if min_dead_ends is not None or max_dead_ends is not None:
+        ratio = dead_end_ratio(graph, maze_edges)
+        if min_dead_ends is not None and ratio < min_dead_ends:
+            return None
+        if max_dead_ends is not None and ratio > max_dead_ends:
+            return None
+    return maze_edges, path
+
+
+# Arguments of _attempt_targeted, less the seed, in a worker process
+_targeted_args = None
+
+
+def _init_targeted_worker(args):
+    global _targeted_args
+    _targeted_args = args
+
+
+def _attempt_targeted_in_worker(seed):
+    return _attempt_targeted(*_targeted_args, seed) is not None
+
+
+def generate_targeted_maze(graph, start_idx, end_idx=None, algorithm='dfs', seed=None,
+                           min_length=None, max_length=None, min_dead_end_ratio=None,
+                           max_dead_end_ratio=None, farthest=False, grid_maze=False,
+                           max_attempts=1000, time_budget=None, workers=1):
+    """
+    Generate mazes until one meets the given constraints (rejection sampling).
+    
+    Every attempt carves on the same graph, so its neighbor index is built
+    once and reused. Candidates are checked cheapest first and rejected as
+    soon as one constraint fails. Attempt seeds are drawn in order from seed,
+    and the first attempt in that order which passes is returned, so the
+    result is the same for any number of workers.
+    
+    Args:
+        graph: A Graph object
+        start_idx: Starting node index
+        end_idx: Optional ending node index
+        algorithm: Name of a registered generator (see GENERATORS)
+        seed: Seed or random source for the attempt seeds, as accepted by make_rng
+        min_length: Fewest nodes allowed on the solution path
+        max_length: Most nodes allowed on the solution path
+        min_dead_end_ratio: Lowest allowed fraction of dead-end nodes
+        max_dead_end_ratio: Highest allowed fraction of dead-end nodes
+        farthest: Place start and end at the ends of each maze's longest path
+        grid_maze: Return the carved passages as a GridMaze (RectGridGraph only)
+        max_attempts: Most mazes to generate
+        time_budget: Seconds after which no new attempts are started
+        workers: Processes to run attempts in; 1 runs them in this process
+        
+    Returns:
+        dict: As generate_maze_with_solution, plus the number of attempts
+              made, or None if no maze met the constraints in time
+    """
+    limits = (min_length, max_length, min_dead_end_ratio, max_dead_end_ratio)
+    args = (graph, start_idx, end_idx, algorithm, grid_maze, farthest, limits)
+    rng = make_rng(seed)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    attempts = 0
+    found = None
+    
+    if workers == 1:
+        while attempts < max_attempts and (deadline is None or time.perf_counter() < deadline):
+            attempt_seed = rng.getrandbits(63)
+            attempts += 1
+            result = _attempt_targeted(*args, attempt_seed)
+            if result is not None:
+                found = attempt_seed, result
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_targeted_worker,
+                                 initargs=(args,)) as executor:
+            batch_size = 4 * (workers or os.cpu_count() or 1)
+            while attempts < max_attempts and (deadline is None or time.perf_counter() < deadline):
+                seeds = [rng.getrandbits(63) for _ in range(min(batch_size, max_attempts - attempts))]
+                for attempt_seed, passed in zip(seeds, executor.map(_attempt_targeted_in_worker, seeds)):
+                    attempts += 1
+                    if passed:
+                        # Workers only report a pass; regenerating is cheaper than pickling mazes
+                        found = attempt_seed, _attempt_targeted(*args, attempt_seed)
+                        break
+                if found:
+                    break
+    
+    if found is None:
+        return None
+    attempt_seed, (maze_edges, solution_path) = found
+    return {
+        'maze_edges': maze_edges,
+        'solution_path': solution_path,
+        'start_node': graph.node(solution_path[0]),
+        'end_node': graph.node(solution_path[-1]),
+        'seed': attempt_seed,
+        'attempts': attempts
+    }
+
+
+def maze_to_graph(graph, maze_edges, seed=None):
+    """
+    Build a graph of the carved passages, ready for to_json_file/to_binary_file.
+    
+    Args:
+        graph: The Graph the maze was carved on
+        maze_edges: List of maze edges, or a GridMaze
+        seed: Seed the maze was generated from, stored with the graph
+        
+    Returns:
+        CompactGraph: The graph's nodes joined by the maze passages only
+    """
+    if isinstance(maze_edges, GridMaze):
+        pairs = maze_edges.passages()
+    else:
+        pairs = ((edge.a_id, edge.b_id) for edge in maze_edges)
+    result = CompactGraph.from_records(graph.node_records(), pairs, graph.node_zs())
+    result.seed = seed
+    return result
+
+
 def print_maze_info(maze_result):
     """
     Print information about a generated maze.
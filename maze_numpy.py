@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Vectorized NumPy maze generators for rectangular grids.
+
+Each carver works on whole rows or arrays at once and returns a GridMaze.
+Importing this module registers them in maze.GENERATORS as 'binary_tree',
+'sidewinder' and 'kruskal_numpy' when NumPy is installed.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this module needs it
+    np = None
+
+from maze import GridMaze, register_grid_carver
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("maze_numpy requires NumPy: pip install numpy")
+
+
+def make_numpy_rng(seed=None):
+    """
+    Return a numpy.random.Generator for a carver call.
+
+    Args:
+        seed: An int seed, a NumPy Generator to use as is, a random.Random
+              to draw a seed from, or None to draw a seed from the global
+              random module (as maze.make_rng does)
+    """
+    _require_numpy()
+    if isinstance(seed, np.random.Generator):
+        return seed
+    if seed is None:
+        seed = random.getrandbits(64)
+    elif isinstance(seed, random.Random):
+        seed = seed.getrandbits(64)
+    return np.random.default_rng(seed)
+
+
+def grid_maze_from_arrays(east, south):
+    """
+    Pack boolean (h, w) east/south passage arrays into a GridMaze.
+
+    Args:
+        east: east[y, x] is True when (x, y) is open to (x+1, y)
+        south: south[y, x] is True when (x, y) is open to (x, y+1)
+    """
+    h, w = east.shape
+    cells = (east.astype(np.uint8) | (south.astype(np.uint8) << 1)).ravel()
+    cells = np.concatenate([cells, np.zeros(-cells.size % 4, np.uint8)]).reshape(-1, 4)
+    packed = cells[:, 0] | (cells[:, 1] << 2) | (cells[:, 2] << 4) | (cells[:, 3] << 6)
+    return GridMaze(w, h, packed.tobytes())
+
+
+def grid_maze_to_arrays(maze):
+    """Unpack a GridMaze into boolean (h, w) east/south passage arrays"""
+    _require_numpy()
+    packed = np.frombuffer(bytes(maze.bits), np.uint8)
+    cells = np.stack([(packed >> shift) & 3 for shift in (0, 2, 4, 6)], axis=1).ravel()
+    cells = cells[:maze.w * maze.h].reshape(maze.h, maze.w)
+    return (cells & 1).astype(bool), (cells & 2).astype(bool)
+
+
+if np is not None:
+    @register_grid_carver('binary_tree')
+    def binary_tree_maze(w, h, seed=None):
+        """
+        Carve a binary-tree maze: every cell opens east or south at random.
+
+        The last column can only go south and the last row only east, which
+        leaves a straight corridor along both edges and a strong diagonal
+        bias. One random draw per cell, all in a single array operation.
+        """
+        rng = make_numpy_rng(seed)
+        east = rng.random((h, w)) < 0.5
+        south = ~east
+        east[:, -1] = False
+        south[:, -1] = True
+        east[-1, :] = True
+        south[-1, :] = False
+        east[-1, -1] = False
+        return grid_maze_from_arrays(east, south)
+
+    @register_grid_carver('sidewinder')
+    def sidewinder_maze(w, h, seed=None):
+        """
+        Carve a sidewinder maze, with the open corridor along the last row.
+
+        Each row is split into random east-running runs and every run opens
+        south from one random member. Run boundaries come from one array
+        scan and all exits are drawn at once, so there is no per-cell Python
+        loop.
+        """
+        rng = make_numpy_rng(seed)
+        east = rng.random((h, w)) < 0.5
+        east[:, -1] = False
+        east[-1, :-1] = True
+
+        # Runs never wrap rows because the last column always ends one
+        ends = np.flatnonzero(~east.ravel())
+        starts = np.concatenate([[0], ends[:-1] + 1])
+        exits = starts + (rng.random(ends.size) * (ends - starts + 1)).astype(np.int64)
+
+        south = np.zeros(w * h, bool)
+        south[exits] = True
+        south = south.reshape(h, w)
+        south[-1, :] = False
+        return grid_maze_from_arrays(east, south)
+
+    @register_grid_carver('kruskal_numpy')
+    def kruskal_numpy_maze(w, h, seed=None):
+        """
+        Carve a randomized-Kruskal maze with array-based union-find.
+
+        Randomized Kruskal yields the minimum spanning tree of the grid under
+        random distinct edge weights. Here that tree is found with Boruvka
+        rounds: every component picks its lightest outgoing edge, then the
+        component label array is merged by pointer jumping. There are
+        O(log(w*h)) rounds, each a handful of whole-array operations, and the
+        maze is the same distribution Kruskal's edge-by-edge loop produces.
+        """
+        rng = make_numpy_rng(seed)
+        n = w * h
+        # 32-bit indices halve memory traffic whenever they are wide enough
+        index = np.int32 if 2 * n < 2**31 else np.int64
+        cells = np.arange(n, dtype=index).reshape(h, w)
+        edge_a = np.concatenate([cells[:, :-1].ravel(), cells[:-1, :].ravel()])
+        edge_b = np.concatenate([cells[:, 1:].ravel(), cells[1:, :].ravel()])
+
+        # A random permutation gives every edge a distinct random weight;
+        # edges stay in grid order so label lookups remain cache friendly
+        weight = rng.permutation(edge_a.size).astype(index)
+        edge_of_weight = np.empty_like(weight)
+        edge_of_weight[weight] = np.arange(edge_a.size, dtype=index)
+
+        # Component labels of the endpoints of edges not yet known internal
+        alive = np.arange(edge_a.size, dtype=index)
+        comp_a = edge_a.copy()
+        comp_b = edge_b.copy()
+        parent = np.arange(n, dtype=index)
+        position = np.empty(edge_a.size, dtype=index)
+        tree = np.zeros(edge_a.size, bool)
+        while True:
+            outgoing = comp_a != comp_b
+            alive, comp_a, comp_b = alive[outgoing], comp_a[outgoing], comp_b[outgoing]
+            if not alive.size:
+                break
+
+            # Lightest outgoing edge of every component
+            alive_weight = weight[alive]
+            best = np.full(n, edge_a.size, dtype=index)
+            np.minimum.at(best, comp_a, alive_weight)
+            np.minimum.at(best, comp_b, alive_weight)
+            roots = np.flatnonzero(best < edge_a.size)
+            chosen_edges = edge_of_weight[best[roots]]
+            tree[chosen_edges] = True
+            position[alive] = np.arange(alive.size, dtype=index)
+            chosen = position[chosen_edges]
+
+            # Hook each component onto the other end of its chosen edge;
+            # a pair choosing the same edge keeps the smaller label as root
+            hooked = np.where(comp_a[chosen] == roots, comp_b[chosen], comp_a[chosen])
+            parent[roots] = hooked
+            mutual = (parent[hooked] == roots) & (roots < hooked)
+            parent[roots[mutual]] = roots[mutual]
+
+            # Pointer jumping over this round's components only
+            target = parent[roots]
+            while True:
+                jumped = parent[target]
+                if np.array_equal(jumped, target):
+                    break
+                target = jumped
+            parent[roots] = target
+            comp_a = parent[comp_a]
+            comp_b = parent[comp_b]
+
+        # Tree edges always join a cell to the one east or south of it
+        a = np.minimum(edge_a, edge_b)[tree]
+        b = np.maximum(edge_a, edge_b)[tree]
+        east = np.zeros(n, bool)
+        south = np.zeros(n, bool)
+        is_east = (b == a + 1) & (a % w != w - 1)
+        east[a[is_east]] = True
+        south[a[~is_east]] = True
+        return grid_maze_from_arrays(east.reshape(h, w), south.reshape(h, w))
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Headless STL/3MF export of a maze as a solid block with the track cut in.
+
+The maze is rasterized into a heightfield of (2w+1) x (2h+1) columns: cells
+and open passages are channels down to the floor, walls and corner posts
+stand at full height. Every column gets a top and bottom face, and a side
+face wherever its neighbor is lower, with side faces split at each global
+height so all vertices are shared and the mesh is watertight. Everything
+is built with whole-array NumPy operations, without Blender.
+
+Usage: python meshfile.py <maze_file> <output.stl|output.3mf> [--cell-width 8]
+"""
+
+import argparse
+import sys
+import zipfile
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this module needs it
+    np = None
+
+from graphs import Graph
+from cutfile import grid_maze_from_graph
+from maze_numpy import grid_maze_to_arrays
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("meshfile requires NumPy: pip install numpy")
+
+
+def maze_heightfield(maze, floor=2.0, height=10.0):
+    """
+    Rasterize a GridMaze into a (2h+1, 2w+1) array of column heights.
+
+    Odd rows and columns are cells and passages, even ones are walls and
+    corner posts; channels are floor high and walls height high.
+    """
+    _require_numpy()
+    east, south = grid_maze_to_arrays(maze)
+    heights = np.full((2 * maze.h + 1, 2 * maze.w + 1), float(height))
+    heights[1::2, 1::2] = floor
+    heights[1::2, 2:-1:2][east[:, :-1]] = floor
+    heights[2:-1:2, 1::2][south[:-1, :]] = floor
+    return heights
+
+
+def _points(x, y, z):
+    x, y, z = np.broadcast_arrays(x, y, z)
+    return np.stack([x, y, z], axis=-1).reshape(-1, 3)
+
+
+def _quads(a, b, c, d):
+    """Split quads, corners counterclockwise seen from outside, into triangles"""
+    return np.concatenate([np.stack([a, b, c], axis=1), np.stack([a, c, d], axis=1)])
+
+
+def heightfield_mesh(heights, xs, ys):
+    """
+    Build a watertight triangle mesh of a heightfield of columns.
+
+    Where two diagonal columns are both taller than the other two at a
+    corner, the mesh stays closed but four faces share that corner's edge;
+    maze heightfields never have such corners.
+
+    Args:
+        heights: (rows, cols) array of column heights, all above zero
+        xs: cols + 1 increasing column boundaries along x
+        ys: rows + 1 increasing row boundaries; rows run towards -y in the
+            mesh so the top view reads like the maze
+
+    Returns:
+        numpy.ndarray: (n, 3, 3) triangle vertices
+    """
+    _require_numpy()
+    xs = np.asarray(xs, float)
+    ys = np.asarray(ys, float)
+    world_y = ys[-1] - ys
+    x0, x1 = xs[None, :-1], xs[None, 1:]
+    y0, y1 = world_y[:-1, None], world_y[1:, None]
+
+    triangles = [
+        _quads(_points(x0, y1, heights), _points(x1, y1, heights),
+               _points(x1, y0, heights), _points(x0, y0, heights)),
+        _quads(_points(x0, y0, 0.0), _points(x1, y0, 0.0),
+               _points(x1, y1, 0.0), _points(x0, y1, 0.0)),
+    ]
+
+    # Zero padding turns the outer boundary into ordinary height steps
+    padded = np.pad(heights, 1)
+    left, right = padded[1:-1, :-1], padded[1:-1, 1:]
+    upper, lower = padded[:-1, 1:-1], padded[1:, 1:-1]
+    levels = np.unique(np.concatenate([[0.0], heights.ravel()]))
+
+    for za, zb in zip(levels[:-1], levels[1:]):
+        # Side faces on the boundary x = xs[k] between row r's columns k-1 and k
+        spans = (np.minimum(left, right) <= za) & (np.maximum(left, right) >= zb)
+        r, k = np.nonzero(spans)
+        a = _points(xs[k], world_y[r + 1], za)
+        b = _points(xs[k], world_y[r], za)
+        c = _points(xs[k], world_y[r], zb)
+        d = _points(xs[k], world_y[r + 1], zb)
+        facing_plus_x = (left > right)[r, k]
+        triangles.append(_quads(a[facing_plus_x], b[facing_plus_x], c[facing_plus_x], d[facing_plus_x]))
+        triangles.append(_quads(d[~facing_plus_x], c[~facing_plus_x], b[~facing_plus_x], a[~facing_plus_x]))
+
+        # Side faces on the boundary y = world_y[k] between column c's rows k-1 and k
+        spans = (np.minimum(upper, lower) <= za) & (np.maximum(upper, lower) >= zb)
+        k, col = np.nonzero(spans)
+        a = _points(xs[col], world_y[k], za)
+        b = _points(xs[col + 1], world_y[k], za)
+        c = _points(xs[col + 1], world_y[k], zb)
+        d = _points(xs[col], world_y[k], zb)
+        facing_minus_y = (upper > lower)[k, col]
+        triangles.append(_quads(a[facing_minus_y], b[facing_minus_y], c[facing_minus_y], d[facing_minus_y]))
+        triangles.append(_quads(d[~facing_minus_y], c[~facing_minus_y], b[~facing_minus_y], a[~facing_minus_y]))
+
+    return np.concatenate(triangles)
+
+
+def maze_mesh(maze, cell_width=8.0, wall_width=2.0, floor=2.0, height=10.0):
+    """
+    Build the solid of a GridMaze with its track cut into the top.
+
+    Args:
+        maze: A GridMaze
+        cell_width: Channel width in mm
+        wall_width: Wall thickness in mm
+        floor: Thickness left under the channels in mm
+        height: Overall block height in mm
+
+    Returns:
+        numpy.ndarray: (n, 3, 3) triangle vertices in mm
+    """
+    heights = maze_heightfield(maze, floor, height)
+
+    def boundaries(cells):
+        widths = np.full(2 * cells + 1, float(wall_width))
+        widths[1::2] = cell_width
+        return np.concatenate([[0.0], np.cumsum(widths)])
+
+    return heightfield_mesh(heights, boundaries(maze.w), boundaries(maze.h))
+
+
+def to_stl(triangles, filepath):
+    """Write (n, 3, 3) triangles to a binary STL file"""
+    _require_numpy()
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = normals / np.where(lengths == 0, 1, lengths)
+
+    records = np.zeros(len(triangles), dtype=[('normal', '<f4', 3), ('vertices', '<f4', (3, 3)),
+                                              ('attributes', '<u2')])
+    records['normal'] = normals
+    records['vertices'] = triangles
+    with open(filepath, 'wb') as f:
+        f.write(b'PhysicalMazes maze mesh'.ljust(80, b' '))
+        f.write(np.uint32(len(triangles)).tobytes())
+        f.write(records.tobytes())
+
+
+def indexed_mesh(triangles):
+    """Return (vertices, faces) with every shared corner stored once"""
+    _require_numpy()
+    corners = triangles.reshape(-1, 3)
+    # Rank each axis separately, then dedupe one integer key per corner;
+    # much faster than np.unique(axis=0) on rows of floats
+    key = np.zeros(len(corners), np.int64)
+    for axis in range(3):
+        values, rank = np.unique(corners[:, axis], return_inverse=True)
+        key = key * len(values) + rank.ravel()
+    _, first, faces = np.unique(key, return_index=True, return_inverse=True)
+    return corners[first], faces.reshape(-1, 3)
+
+
+def to_3mf(triangles, filepath):
+    """Write (n, 3, 3) triangles in mm to a 3MF package"""
+    vertices, faces = indexed_mesh(triangles)
+    vertex_xml = ''.join(f'<vertex x="{x:g}" y="{y:g}" z="{z:g}"/>' for x, y, z in vertices.tolist())
+    face_xml = ''.join(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>' for a, b, c in faces.tolist())
+    model = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<model unit="millimeter" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">'
+             '<resources><object id="1" type="model"><mesh>'
+             f'<vertices>{vertex_xml}</vertices><triangles>{face_xml}</triangles>'
+             '</mesh></object></resources><build><item objectid="1"/></build></model>\n')
+    content_types = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                     '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+                     '</Types>\n')
+    rels = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+            'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+            '</Relationships>\n')
+    with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('[Content_Types].xml', content_types)
+        package.writestr('_rels/.rels', rels)
+        package.writestr('3D/3dmodel.model', model)
+
+
+def export_maze_mesh(maze, filepath, cell_width=8.0, wall_width=2.0, floor=2.0, height=10.0):
+    """
+    Write the solid of a GridMaze to an .stl or .3mf file.
+
+    Returns:
+        int: Number of triangles written
+    """
+    triangles = maze_mesh(maze, cell_width, wall_width, floor, height)
+    if filepath.lower().endswith('.3mf'):
+        to_3mf(triangles, filepath)
+    else:
+        to_stl(triangles, filepath)
+    return len(triangles)
+
+
+def parse_arguments(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Export a grid maze file as a printable STL or 3MF solid')
+    parser.add_argument('maze_file', help='JSON or binary maze file, e.g. from batch_maze.py')
+    parser.add_argument('output', help='Output .stl or .3mf file')
+    parser.add_argument('--cell-width', type=float, default=8.0, help='Channel width in mm')
+    parser.add_argument('--wall-width', type=float, default=2.0, help='Wall thickness in mm')
+    parser.add_argument('--floor', type=float, default=2.0, help='Thickness under the channels in mm')
+    parser.add_argument('--height', type=float, default=10.0, help='Block height in mm')
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function"""
+    args = parse_arguments(argv)
+    if not 0 < args.floor < args.height:
+        print("Error: floor must be above zero and below height")
+        sys.exit(1)
+    try:
+        maze = grid_maze_from_graph(Graph.from_file(args.maze_file))
+    except (OSError, ValueError) as e:
+        print(f"Error loading maze: {e}")
+        sys.exit(1)
+
+    count = export_maze_mesh(maze, args.output, args.cell_width, args.wall_width, args.floor, args.height)
+    print(f"Wrote {count} triangles to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
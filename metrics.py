@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Difficulty and quality metrics for carved mazes.
+
+Every metric is computed in O(V) over the carved tree: one pass for node
+degrees (node_degrees), one for corridor runs, two BFS passes for the
+longest path, and one walk along the solution path. A maze is anything with a neighbors(idx) method
+returning the nodes reachable through open passages (MazeTree, GridMaze, or
+a graph of passages loaded from a maze file).
+
+Usage: python metrics.py <batch_dir>/manifest.jsonl [--output metrics.jsonl]
+"""
+
+import argparse
+import json
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+def bfs_distances(maze, node_count, source):
+    """
+    Breadth-first search over the open passages from source.
+
+    Args:
+        maze: Object with neighbors(idx)
+        node_count: Number of nodes
+        source: Node index to start from
+
+    Returns:
+        tuple: (distance, parent, farthest) where distance and parent are int
+               arrays (-1 for unreached nodes) and farthest is the reached
+               node with the largest distance
+    """
+    distance = array('i', [-1]) * node_count
+    parent = array('i', [-1]) * node_count
+    distance[source] = 0
+    parent[source] = source
+    queue = deque([source])
+    farthest = source
+    while queue:
+        idx = queue.popleft()
+        farthest = idx
+        next_distance = distance[idx] + 1
+        for neighbor_idx in maze.neighbors(idx):
+            if distance[neighbor_idx] == -1:
+                distance[neighbor_idx] = next_distance
+                parent[neighbor_idx] = idx
+                queue.append(neighbor_idx)
+    return distance, parent, farthest
+
+
+def tree_diameter(maze, node_count, source=0):
+    """
+    Find the two ends of the longest path in a carved tree with two BFS passes.
+
+    Args:
+        maze: Object with neighbors(idx)
+        node_count: Number of nodes
+        source: Any node of the tree to start the first pass from
+
+    Returns:
+        tuple: (a_idx, b_idx, length) where length counts passages between the ends
+    """
+    _, _, a_idx = bfs_distances(maze, node_count, source)
+    distance, _, b_idx = bfs_distances(maze, node_count, a_idx)
+    return a_idx, b_idx, distance[b_idx]
+
+
+def path_between(maze, node_count, start_idx, end_idx):
+    """Return the node indices from start to end through the maze, or None"""
+    _, parent, _ = bfs_distances(maze, node_count, start_idx)
+    if parent[end_idx] == -1:
+        return None
+    path = [end_idx]
+    while path[-1] != start_idx:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def node_degrees(maze, node_count):
+    """Return an int array of the number of open passages at every node"""
+    return array('i', [len(maze.neighbors(idx)) for idx in range(node_count)])
+
+
+def count_turns(graph, path):
+    """Count direction changes along a path using the graph's node coordinates"""
+    turns = 0
+    previous = None
+    for a_idx, b_idx in zip(path, path[1:]):
+        a = graph.node(a_idx)
+        b = graph.node(b_idx)
+        direction = (b.x - a.x, b.y - a.y, b.z - a.z)
+        if previous is not None and direction != previous:
+            turns += 1
+        previous = direction
+    return turns
+
+
+def maze_metrics(graph, maze, solution_path):
+    """
+    Compute difficulty and quality metrics for one maze.
+
+    Args:
+        graph: The Graph the maze was carved on (for node count and coordinates)
+        maze: Object with neighbors(idx) over the carved passages
+        solution_path: Node indices from start to end
+
+    Returns:
+        dict: Metrics:
+            node_count: cells in the maze
+            dead_ends: cells with a single open passage
+            dead_end_ratio: dead_ends / node_count
+            junctions: cells with three or more open passages
+            branching_factor: mean onward choices at a junction (degree - 1)
+            river_factor: mean length in cells of the corridors, i.e. the
+                maximal runs of cells with exactly two open passages
+            longest_path: passages on the longest path in the maze
+            longest_path_ends: (a_idx, b_idx) ends of that path
+            solution_length: cells on the solution path (len(solution_path))
+            solution_turns: direction changes along the solution
+            decision_points: solution cells (excluding the end) offering more
+                than one way forward
+    """
+    node_count = graph.node_count()
+    degree = node_degrees(maze, node_count)
+    dead_ends = degree.count(1)
+    junctions = junction_exits = 0
+    corridor_cells = corridor_links = 0
+
+    for idx, d in enumerate(degree):
+        if d == 2:
+            corridor_cells += 1
+            # Count each corridor-to-corridor passage once, from its higher end
+            corridor_links += sum(1 for n in maze.neighbors(idx) if n < idx and degree[n] == 2)
+        elif d >= 3:
+            junctions += 1
+            junction_exits += d - 1
+
+    # In a forest of corridor chains, chains = cells - links
+    corridors = corridor_cells - corridor_links
+    a_idx, b_idx, longest = tree_diameter(maze, node_count, solution_path[0]) if node_count else (0, 0, 0)
+
+    decision_points = 0
+    for i, idx in enumerate(solution_path[:-1]):
+        forward = degree[idx] - (1 if i else 0)
+        if forward > 1:
+            decision_points += 1
+
+    return {
+        'node_count': node_count,
+        'dead_ends': dead_ends,
+        'dead_end_ratio': dead_ends / node_count if node_count else 0.0,
+        'junctions': junctions,
+        'branching_factor': junction_exits / junctions if junctions else 0.0,
+        'river_factor': corridor_cells / corridors if corridors else 0.0,
+        'longest_path': longest,
+        'longest_path_ends': (a_idx, b_idx),
+        'solution_length': len(solution_path),
+        'solution_turns': count_turns(graph, solution_path),
+        'decision_points': decision_points,
+    }
+
+
+def _score(job):
+    return maze_metrics(*job)
+
+
+def score_mazes(jobs, workers=None, chunksize=16):
+    """
+    Compute maze_metrics for many mazes, optionally across processes.
+
+    Args:
+        jobs: Iterable of (graph, maze, solution_path) tuples
+        workers: Worker processes; 1 scores in this process, None uses all CPUs
+        chunksize: Jobs sent to a worker at a time
+
+    Returns:
+        list: One metrics dict per job, in order
+    """
+    if workers == 1:
+        return [_score(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_score, jobs, chunksize=chunksize))
+
+
+def score_file(filepath, start_idx, end_idx):
+    """
+    Compute maze_metrics for a saved maze file (a graph of its passages).
+
+    Args:
+        filepath: JSON or binary graph file whose edges are the open passages
+        start_idx: Start node index
+        end_idx: End node index
+    """
+    from graphs import Graph
+
+    maze_graph = Graph.from_file(filepath).to_compact()
+    path = path_between(maze_graph, maze_graph.node_count(), start_idx, end_idx)
+    if path is None:
+        raise ValueError(f"{filepath}: node {end_idx} is unreachable from {start_idx}")
+    return maze_metrics(maze_graph, maze_graph, path)
+
+
+def _score_record(job):
+    batch_dir, record = job
+    metrics = score_file(os.path.join(batch_dir, record['file']), record['start'], record['end'])
+    return {'file': record['file'], **metrics}
+
+
+def parse_arguments(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Score the mazes listed in a batch_maze.py manifest')
+    parser.add_argument('manifest', help='manifest.jsonl written by batch_maze.py')
+    parser.add_argument('--output', default=None, help='Metrics JSONL file (default: metrics.jsonl next to the manifest)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function"""
+    args = parse_arguments(argv)
+    batch_dir = os.path.dirname(os.path.abspath(args.manifest))
+    output = args.output or os.path.join(batch_dir, 'metrics.jsonl')
+
+    with open(args.manifest) as f:
+        jobs = [(batch_dir, json.loads(line)) for line in f if line.strip()]
+
+    with open(output, 'w') as out, ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for result in executor.map(_score_record, jobs, chunksize=16):
+            out.write(json.dumps(result) + '\n')
+    print(f"Scored {len(jobs)} mazes into {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Weighted shortest paths on graphs: binary-heap Dijkstra and A*.
+
+Graphs are searched through their compact form, using the CSR index from
+CompactGraph.adjacency and the edge weights in graph.weights (1.0 each when
+the graph has none). Working state is a few flat arrays plus the heap, so
+graphs with millions of nodes fit comfortably. Weights must not be negative.
+
+To solve a maze, search the graph of its passages, e.g.
+maze_to_graph(grid, maze_edges), optionally weighted by distance_weights.
+"""
+
+import heapq
+import math
+from array import array
+
+
+def distance_weights(graph):
+    """
+    Return the length of every edge between its nodes' (x, y, z) positions.
+
+    Returns:
+        array: Double array of weights in edge order, ready for graph.weights
+    """
+    compact = graph.to_compact()
+    xs, ys, zs = compact.xs, compact.ys, compact.zs
+    weights = array('d', bytes(8 * compact.edge_count()))
+    for e_id, (a_id, b_id) in enumerate(zip(compact.edge_a, compact.edge_b)):
+        dz = 0 if zs is None else zs[a_id] - zs[b_id]
+        weights[e_id] = math.hypot(xs[a_id] - xs[b_id], ys[a_id] - ys[b_id], dz)
+    return weights
+
+
+def _checked_weights(compact):
+    weights = compact.weights
+    if weights is not None and len(weights) and min(weights) < 0:
+        raise ValueError("Edge weights must not be negative")
+    return weights
+
+
+def heuristic_scale(graph):
+    """
+    Return the largest factor k for which k * straight-line distance never
+    overestimates the cost of travelling between two nodes.
+
+    That is the smallest weight per unit length over all edges, so A* with
+    the scaled distance stays admissible and consistent for any weights.
+    """
+    compact = graph.to_compact()
+    xs, ys, zs = compact.xs, compact.ys, compact.zs
+    weights = _checked_weights(compact)
+    scale = math.inf
+    for e_id, (a_id, b_id) in enumerate(zip(compact.edge_a, compact.edge_b)):
+        dz = 0 if zs is None else zs[a_id] - zs[b_id]
+        length = math.hypot(xs[a_id] - xs[b_id], ys[a_id] - ys[b_id], dz)
+        if length > 0:
+            weight = 1.0 if weights is None else weights[e_id]
+            scale = min(scale, weight / length)
+    return 0.0 if scale == math.inf else scale
+
+
+def trace_path(parents, start_idx, end_idx):
+    """Return the node path from start_idx to end_idx through a parent array, or None"""
+    if start_idx != end_idx and parents[end_idx] < 0:
+        return None
+    path = [end_idx]
+    while path[-1] != start_idx:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
+
+
+def dijkstra(graph, source, target=None):
+    """
+    Single-source shortest paths with a binary heap.
+
+    Args:
+        graph: Any Graph; searched through graph.to_compact()
+        source: Node index to start from
+        target: Optional node index; the search stops once it is settled
+
+    Returns:
+        tuple: (distances, parents) arrays indexed by node. Unreached nodes
+               have distance inf and parent -1, as does the source's parent.
+               With a target, only nodes settled before it are final.
+    """
+    compact = graph.to_compact()
+    offsets, targets, edge_ids = compact.adjacency()
+    weights = _checked_weights(compact)
+    node_count = compact.node_count()
+    distances = array('d', [math.inf]) * node_count
+    parents = array('i', [-1]) * node_count
+    distances[source] = 0.0
+
+    heap = [(0.0, source)]
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        distance, node = pop(heap)
+        if distance > distances[node]:
+            continue  # stale entry for a node already settled closer
+        if node == target:
+            break
+        for pos in range(offsets[node], offsets[node + 1]):
+            other = targets[pos]
+            new_distance = distance + (1.0 if weights is None else weights[edge_ids[pos]])
+            if new_distance < distances[other]:
+                distances[other] = new_distance
+                parents[other] = node
+                push(heap, (new_distance, other))
+    return distances, parents
+
+
+def astar(graph, start_idx, end_idx, scale=None):
+    """
+    Shortest path with A*, guided by straight-line distance to the end.
+
+    Args:
+        graph: Any Graph; searched through graph.to_compact()
+        start_idx: Node index to start from
+        end_idx: Node index to reach
+        scale: Weight per unit of distance for the heuristic; defaults to
+               heuristic_scale(graph), which keeps the result optimal. Pass
+               it when solving many times on the same graph.
+
+    Returns:
+        tuple: (path, cost), or (None, inf) if end_idx is unreachable
+    """
+    compact = graph.to_compact()
+    offsets, targets, edge_ids = compact.adjacency()
+    weights = _checked_weights(compact)
+    if scale is None:
+        scale = heuristic_scale(compact)
+    xs, ys, zs = compact.xs, compact.ys, compact.zs
+    end_x, end_y = xs[end_idx], ys[end_idx]
+    end_z = 0 if zs is None else zs[end_idx]
+    hypot = math.hypot
+
+    node_count = compact.node_count()
+    distances = array('d', [math.inf]) * node_count
+    parents = array('i', [-1]) * node_count
+    distances[start_idx] = 0.0
+
+    heap = [(0.0, 0.0, start_idx)]
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        _, distance, node = pop(heap)
+        if distance > distances[node]:
+            continue
+        if node == end_idx:
+            return trace_path(parents, start_idx, end_idx), distance
+        for pos in range(offsets[node], offsets[node + 1]):
+            other = targets[pos]
+            new_distance = distance + (1.0 if weights is None else weights[edge_ids[pos]])
+            if new_distance < distances[other]:
+                distances[other] = new_distance
+                parents[other] = node
+                dz = 0 if zs is None else zs[other] - end_z
+                estimate = scale * hypot(xs[other] - end_x, ys[other] - end_y, dz)
+                push(heap, (new_distance + estimate, new_distance, other))
+    return None, math.inf
+
+
+def shortest_path(graph, start_idx, end_idx, method='astar'):
+    """
+    Return the cheapest path between two nodes.
+
+    Args:
+        method: 'astar' or 'dijkstra'
+
+    Returns:
+        tuple: (path, cost), or (None, inf) if end_idx is unreachable
+    """
+    if method == 'astar':
+        return astar(graph, start_idx, end_idx)
+    if method == 'dijkstra':
+        distances, parents = dijkstra(graph, start_idx, end_idx)
+        if distances[end_idx] == math.inf:
+            return None, math.inf
+        return trace_path(parents, start_idx, end_idx), distances[end_idx]
+    raise ValueError(f"Unknown method: {method}")
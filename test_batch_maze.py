@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Test suite for batch_maze.py module"""
+
+import unittest
+import json
+import os
+import tempfile
+from graphs import Graph, ImplicitRectGridGraph
+from maze import generate_maze, maze_to_graph
+from batch_maze import make_jobs, generate_one, run_batch, parse_arguments
+
+
+class TestBatchMaze(unittest.TestCase):
+    """Test batch maze generation"""
+
+    def test_make_jobs(self):
+        """Test the size/seed job grid"""
+        jobs = make_jobs(5, 9, 2, 100, 2)
+        self.assertEqual(jobs, [(5, 100), (5, 101), (7, 100), (7, 101), (9, 100), (9, 101)])
+
+    def test_generate_one_is_reproducible(self):
+        """Test a written maze matches regenerating it from its seed"""
+        with tempfile.TemporaryDirectory() as tmp:
+            record = generate_one((6, 42), tmp, 'kruskal', 'binary', True)
+            loaded = Graph.from_file(os.path.join(tmp, record['file']))
+
+            grid = ImplicitRectGridGraph(6, 6)
+            maze, path = generate_maze(grid, 0, algorithm='kruskal', grid_maze=True, seed=42)
+            expected = maze_to_graph(grid, maze, 42)
+
+            self.assertEqual(loaded.seed, 42)
+            self.assertEqual(list(loaded.edge_pairs()), list(expected.edge_pairs()))
+            self.assertEqual(record['solution_length'], len(path))
+
+    def test_generate_one_farthest(self):
+        """Test farthest endpoints are recorded in the manifest record"""
+        with tempfile.TemporaryDirectory() as tmp:
+            record = generate_one((6, 42), tmp, 'dfs', 'json', False, farthest=True)
+            corner = generate_one((6, 42), tmp, 'dfs', 'json', False)
+            self.assertGreaterEqual(record['solution_length'], corner['solution_length'])
+            self.assertNotEqual((record['start'], record['end']), (0, 35))
+
+    def test_run_batch(self):
+        """Test a small batch across two workers"""
+        jobs = make_jobs(3, 5, 1, 0, 3)
+        with tempfile.TemporaryDirectory() as tmp:
+            written = run_batch(jobs, tmp, 'prim', 'json', workers=2, chunk_size=2)
+            self.assertEqual(written, 9)
+
+            with open(os.path.join(tmp, 'manifest.jsonl')) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual(sorted((r['w'], r['seed']) for r in records), sorted(jobs))
+            for record in records:
+                graph = Graph.from_json_file(os.path.join(tmp, record['file']))
+                self.assertEqual(len(graph.edges), record['w'] * record['h'] - 1)
+
+    def test_rerun_batch(self):
+        """Test re-running into the same directory rewrites records instead of duplicating them"""
+        with tempfile.TemporaryDirectory() as tmp:
+            run_batch(make_jobs(3, 4, 1, 0, 2), tmp, 'dfs', 'json', workers=1)
+            run_batch(make_jobs(4, 5, 1, 0, 2), tmp, 'dfs', 'json', workers=1)
+            run_batch(make_jobs(3, 3, 1, 0, 1), tmp, 'kruskal', 'json', workers=1)
+
+            with open(os.path.join(tmp, 'manifest.jsonl')) as f:
+                records = [json.loads(line) for line in f]
+            files = [record['file'] for record in records]
+            self.assertEqual(len(files), len(set(files)))
+            self.assertEqual(sorted((r['algorithm'], r['w'], r['seed']) for r in records),
+                             [('dfs', 3, 0), ('dfs', 3, 1), ('dfs', 4, 0), ('dfs', 4, 1),
+                              ('dfs', 5, 0), ('dfs', 5, 1), ('kruskal', 3, 0)])
+
+    def test_parse_arguments(self):
+        """Test command line defaults and options"""
+        args = parse_arguments(['out', '--max-size', '20', '--algorithm', 'wilson'])
+        self.assertEqual(args.output_dir, 'out')
+        self.assertEqual((args.min_size, args.max_size), (10, 20))
+        self.assertEqual(args.algorithm, 'wilson')
+        self.assertEqual(args.format, 'binary')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Test suite for benchmark.py and bench_compare.py"""
+
+import unittest
+import json
+import os
+import tempfile
+from benchmark import CASES, measure, run_benchmarks, main as benchmark_main
+from bench_compare import compare, load_results
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test the benchmark harness"""
+
+    def test_measure_every_case(self):
+        """Test each case produces a complete record at a tiny size"""
+        for case in CASES:
+            with self.subTest(case=case):
+                record = measure(case, 4)
+                self.assertEqual((record['case'], record['size']), (case, 4))
+                self.assertGreaterEqual(record['wall_s'], 0)
+                self.assertGreater(record['alloc_peak_bytes'], 0)
+
+    def test_isolated_run(self):
+        """Test running a case in a separate process"""
+        records = list(run_benchmarks(['grid_construction'], [3], trace_allocations=False))
+        self.assertEqual(len(records), 1)
+        self.assertIsNone(records[0]['alloc_peak_bytes'])
+
+    def test_main_writes_report(self):
+        """Test the command line writes a loadable report"""
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'bench.json')
+            benchmark_main(['--sizes', '3', '--cases', 'to_json_file', '--output', output])
+            results = load_results(output)
+            self.assertEqual(list(results), [('to_json_file', 3)])
+
+
+class TestBenchCompare(unittest.TestCase):
+    """Test the baseline comparison"""
+
+    def test_compare(self):
+        """Test regressions are flagged above the threshold only"""
+        baseline = {('gen', 100): {'wall_s': 1.0, 'peak_rss_kb': 1000, 'alloc_peak_bytes': None},
+                    ('gen', 10): {'wall_s': 0.001, 'peak_rss_kb': 500, 'alloc_peak_bytes': 10}}
+        current = {('gen', 100): {'wall_s': 1.5, 'peak_rss_kb': 1100, 'alloc_peak_bytes': 5},
+                   ('gen', 10): {'wall_s': 0.004, 'peak_rss_kb': 500, 'alloc_peak_bytes': 10}}
+
+        rows = compare(baseline, current, threshold=0.2)
+        flagged = {(case, size, metric) for case, size, metric, *_, regressed in rows if regressed}
+        self.assertEqual(flagged, {('gen', 100, 'wall_s')})
+        # Tiny wall times and metrics missing from one side are skipped
+        metrics = {(size, metric) for _, size, metric, *_ in rows}
+        self.assertNotIn((10, 'wall_s'), metrics)
+        self.assertNotIn((100, 'alloc_peak_bytes'), metrics)
+
+    def test_load_results(self):
+        """Test loading a report file"""
+        report = {'meta': {}, 'results': [{'case': 'a', 'size': 5, 'wall_s': 0.1}]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'r.json')
+            with open(path, 'w') as f:
+                json.dump(report, f)
+            self.assertEqual(load_results(path), {('a', 5): report['results'][0]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Test suite for the Blender-independent parts of blend_maze.py"""
+
+import unittest
+from graphs import ImplicitRectGridGraph
+from maze import generate_maze, maze_to_graph
+from blend_maze import track_primitives, parse_arguments
+
+
+class TestBlendMaze(unittest.TestCase):
+    """Test track layout and argument parsing"""
+
+    def test_track_primitives(self):
+        """Test one sphere per node and one unit-length cylinder per passage"""
+        grid = ImplicitRectGridGraph(4, 3)
+        maze, _ = generate_maze(grid, 0, grid_maze=True, seed=5)
+        spheres, cylinders = track_primitives(maze_to_graph(grid, maze), track_z=0.5)
+
+        self.assertEqual(len(spheres), 12)
+        self.assertEqual(len(cylinders), 11)
+        self.assertIn((3, 2, 0.5), spheres)
+        for midpoint, direction, length in cylinders:
+            self.assertEqual(length, 1.0)
+            self.assertIn(direction, [(1.0, 0.0, 0.0), (0.0, 1.0, 0.0)])
+            self.assertEqual(midpoint[2], 0.5)
+
+    def test_parse_arguments(self):
+        """Test arguments come from after '--' on the Blender command line"""
+        args = parse_arguments(['maze.pmzg', '--output', 'out.stl', '--segments', '8'])
+        self.assertEqual((args.maze_file, args.output, args.segments), ('maze.pmzg', 'out.stl', 8))
+        self.assertEqual(args.radius, 0.25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Test suite for cutfile.py module"""
+
+import unittest
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from graphs import ImplicitRectGridGraph
+from maze import GridMaze, generate_maze, maze_to_graph
+from cutfile import (wall_runs, order_cuts, travel_distance, to_svg, to_dxf, export_maze,
+                     grid_maze_from_graph, main)
+
+
+def unit_walls(runs):
+    """Split runs into the set of unit-length wall pieces they cover"""
+    walls = set()
+    for (x0, y0), (x1, y1) in runs:
+        steps = abs(x1 - x0) + abs(y1 - y0)
+        dx, dy = (x1 - x0) // steps, (y1 - y0) // steps
+        for i in range(steps):
+            a = (x0 + i * dx, y0 + i * dy)
+            b = (a[0] + dx, a[1] + dy)
+            walls.add((min(a, b), max(a, b)))
+    return walls
+
+
+class TestCutfile(unittest.TestCase):
+    """Test wall extraction, cut ordering and file output"""
+
+    def setUp(self):
+        grid = ImplicitRectGridGraph(12, 9)
+        self.maze, _ = generate_maze(grid, 0, algorithm='kruskal', grid_maze=True, seed=4)
+
+    def test_wall_runs_open_grid(self):
+        """Test a maze with no inner walls is just its border"""
+        maze = GridMaze(2, 1)
+        maze.carve(0, 1)
+        self.assertEqual(sorted(wall_runs(maze)), [((0, 0), (0, 1)), ((0, 0), (2, 0)),
+                                                  ((0, 1), (2, 1)), ((2, 0), (2, 1))])
+
+    def test_wall_runs_cover_every_wall(self):
+        """Test runs cover each closed cell side exactly once"""
+        w, h = self.maze.w, self.maze.h
+        runs = wall_runs(self.maze)
+        walls = unit_walls(runs)
+        # A perfect maze has every grid side closed except its w*h-1 passages
+        self.assertEqual(len(walls), 2 * w * h + w + h - (w * h - 1))
+        self.assertEqual(sum(abs(b[0] - a[0]) + abs(b[1] - a[1]) for a, b in runs), len(walls))
+        self.assertLess(len(runs), len(walls))
+
+    def test_openings(self):
+        """Test start and end cells get a gap in the border"""
+        w, h = self.maze.w, self.maze.h
+        walls = unit_walls(wall_runs(self.maze, openings=(0, w * h - 1)))
+        self.assertNotIn(((0, 0), (0, 1)), walls)
+        self.assertNotIn(((w, h - 1), (w, h)), walls)
+
+    def test_order_cuts(self):
+        """Test ordering keeps every wall and shortens travel"""
+        runs = wall_runs(self.maze)
+        polylines = order_cuts(runs)
+        cut = [(a, b) for polyline in polylines for a, b in zip(polyline, polyline[1:])]
+        self.assertEqual(unit_walls(cut), unit_walls(runs))
+        self.assertLess(len(polylines), len(runs))
+
+        unordered = travel_distance([[a, b] for a, b in runs])
+        greedy = travel_distance(order_cuts(runs, two_opt_window=0))
+        self.assertLess(greedy, unordered)
+        self.assertLessEqual(travel_distance(polylines), greedy)
+
+    def test_svg(self):
+        """Test the SVG parses and is sized in millimetres"""
+        polylines = order_cuts(wall_runs(self.maze))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'maze.svg')
+            to_svg(polylines, path, self.maze.w, self.maze.h, cell_size=5, margin=2)
+            root = ET.parse(path).getroot()
+        self.assertEqual(root.get('width'), '64mm')
+        self.assertEqual(root.get('height'), '49mm')
+        self.assertEqual(len(root.findall('.//{http://www.w3.org/2000/svg}path')), len(polylines))
+
+    def test_dxf(self):
+        """Test the DXF has one entity per polyline and a flipped y axis"""
+        polylines = [[(0, 0), (1, 0)], [(0, 1), (0, 2), (1, 2)]]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'maze.dxf')
+            to_dxf(polylines, path, 1, 2, cell_size=10, margin=0)
+            with open(path) as f:
+                codes = f.read().split('\n')
+        self.assertEqual(codes.count('LINE'), 1)
+        self.assertEqual(codes.count('POLYLINE'), 1)
+        self.assertEqual(codes.count('VERTEX'), 3)
+        # Group code 20 (start y) of the LINE at y=0 is the full height
+        self.assertEqual(codes[codes.index('LINE') + 5:codes.index('LINE') + 7], ['20', '20'])
+        self.assertEqual(codes[-2:], ['EOF', ''])
+
+    def test_main_from_maze_file(self):
+        """Test exporting a saved maze file from the command line"""
+        grid = ImplicitRectGridGraph(6, 4)
+        maze, _ = generate_maze(grid, 0, grid_maze=True, seed=8)
+        with tempfile.TemporaryDirectory() as tmp:
+            maze_path = os.path.join(tmp, 'maze.pmzg')
+            maze_to_graph(grid, maze).to_binary_file(maze_path)
+            self.assertEqual(grid_maze_from_graph(maze_to_graph(grid, maze)), maze)
+
+            output = os.path.join(tmp, 'maze.dxf')
+            main([maze_path, output, '--openings', '0', '23'])
+            self.assertGreater(os.path.getsize(output), 0)
+
+    def test_export_maze(self):
+        """Test the output format follows the file extension"""
+        with tempfile.TemporaryDirectory() as tmp:
+            polylines = export_maze(self.maze, os.path.join(tmp, 'm.svg'))
+            export_maze(self.maze, os.path.join(tmp, 'm.DXF'))
+            with open(os.path.join(tmp, 'm.DXF')) as f:
+                self.assertTrue(f.read().startswith('0\nSECTION'))
+        self.assertEqual(unit_walls([(a, b) for line in polylines for a, b in zip(line, line[1:])]),
+                         unit_walls(wall_runs(self.maze)))
+
+
+if __name__ == '__main__':
+    unittest.main()
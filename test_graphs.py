@@ -4,7 +4,19 @@
 import unittest
 import tempfile
 import os
-from graphs import Node, Edge, Graph, RectGridGraph, xyToIdx
+from graphs import (Node, Edge, Graph, CompactGraph, RectGridGraph,
+                    ImplicitRectGridGraph, PolarGridGraph, HexGridGraph, TriGridGraph,
+                    MaskedGridGraph, Grid3DGraph, BINARY_HEADER, xyToIdx)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
 
 
 class TestGraphFunctions(unittest.TestCase):
@@ -176,6 +188,375 @@ class TestRectGridGraph(unittest.TestCase):
                 node_id = graph.nodes[expected_id].n_id
                 self.assertEqual(node_id, expected_id)
 
+    def test_incidence_index(self):
+        """Test the neighbor id -> edge index"""
+        graph = RectGridGraph(3, 3)
+
+        self.assertEqual(sorted(graph.neighbors(4)), [1, 3, 5, 7])
+        self.assertEqual(sorted(graph.neighbors(0)), [1, 3])
+
+        edge = graph.edge_between(4, 1)
+        self.assertEqual((edge.a_id, edge.b_id), (1, 4))
+        self.assertEqual(graph.edge_between(1, 4), edge)
+        self.assertIsNone(graph.edge_between(0, 8))
+
+    def test_incidence_index_plain_graph(self):
+        """Test the incidence index of a list-backed Graph"""
+        nodes = [Node(x=0, y=0, n_id=0), Node(x=1, y=0, n_id=1), Node(x=2, y=0, n_id=2)]
+        edges = [Edge(nodes[0], nodes[1], 0, 1), Edge(nodes[1], nodes[2], 1, 2)]
+        graph = Graph(nodes=nodes, edges=edges)
+
+        self.assertEqual(graph.neighbors(1), [0, 2])
+        self.assertIs(graph.edge_between(2, 1), edges[1])
+        self.assertIsNone(graph.edge_between(0, 2))
+
+        # The index is built once and reused
+        self.assertIs(graph.incidence(), graph.incidence())
+
+
+class TestCompactGraph(unittest.TestCase):
+    """Test the array-backed CompactGraph"""
+
+    def test_lazy_views(self):
+        """Test that nodes/edges views behave like the old lists"""
+        graph = RectGridGraph(3, 2)
+
+        self.assertIsInstance(graph, CompactGraph)
+        self.assertEqual(len(graph.nodes), 6)
+        self.assertEqual(len(graph.edges), 7)
+        self.assertEqual(graph.nodes[-1], Node(x=2, y=1, n_id=5))
+        self.assertEqual(graph.nodes[1:3], [Node(1, 0, 1), Node(2, 0, 2)])
+        self.assertEqual([(e.a_id, e.b_id) for e in graph.edges],
+                         [(0, 1), (0, 3), (1, 2), (1, 4), (2, 5), (3, 4), (4, 5)])
+        with self.assertRaises(IndexError):
+            graph.nodes[6]
+
+    def test_csr_neighbors(self):
+        """Test CSR neighbor lookup and edge indices"""
+        graph = RectGridGraph(3, 2)
+
+        self.assertEqual(list(graph.neighbors(1)), [0, 2, 4])
+        self.assertEqual(list(graph.neighbors(5)), [2, 4])
+        self.assertEqual(graph.edge_index(4, 1), 3)
+        self.assertIsNone(graph.edge_index(0, 5))
+
+    def test_to_compact(self):
+        """Test converting a list-backed graph, including sparse ids"""
+        nodes = [Node(x=0, y=0, n_id=10), Node(x=1, y=0, n_id=20)]
+        graph = Graph(nodes=nodes, edges=[Edge(nodes[0], nodes[1], 10, 20)])
+
+        compact = graph.to_compact()
+        self.assertEqual(list(compact.xs), [0, 1])
+        self.assertEqual(list(compact.edge_pairs()), [(0, 1)])
+        self.assertEqual(list(compact.neighbors(1)), [0])
+
+    def test_json_round_trip(self):
+        """Test loading JSON directly into compact storage"""
+        original = RectGridGraph(4, 3)
+
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
+            temp_path = f.name
+
+        try:
+            original.to_json_file(temp_path)
+            loaded = CompactGraph.from_json_file(temp_path)
+
+            self.assertEqual(loaded.xs, original.xs)
+            self.assertEqual(loaded.ys, original.ys)
+            self.assertEqual(list(loaded.edge_pairs()), list(original.edge_pairs()))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+class TestImplicitRectGridGraph(unittest.TestCase):
+    """Test ImplicitRectGridGraph against the materialized grid"""
+
+    def test_matches_rect_grid_graph(self):
+        """Test nodes, edges and neighbors agree with RectGridGraph"""
+        for w, h in [(1, 1), (1, 4), (4, 1), (2, 2), (3, 5), (5, 3)]:
+            with self.subTest(w=w, h=h):
+                implicit = ImplicitRectGridGraph(w, h)
+                explicit = RectGridGraph(w, h)
+
+                self.assertEqual(list(implicit.nodes), list(explicit.nodes))
+                self.assertEqual(list(implicit.edges), list(explicit.edges))
+                self.assertEqual(list(implicit.edge_pairs()), list(explicit.edge_pairs()))
+                self.assertEqual(list(implicit.node_records()), list(explicit.node_records()))
+                for n_id in range(w * h):
+                    self.assertEqual(implicit.neighbors(n_id), list(explicit.neighbors(n_id)))
+                    for other in range(w * h):
+                        self.assertEqual(implicit.edge_index(n_id, other),
+                                         explicit.edge_index(n_id, other))
+
+    def test_rejects_bad_sizes_and_indices(self):
+        """Test empty grids and out-of-range edges are errors, not made-up edges"""
+        for w, h in [(0, 5), (5, 0), (-1, 3)]:
+            with self.assertRaises(ValueError):
+                ImplicitRectGridGraph(w, h)
+        graph = ImplicitRectGridGraph(3, 3)
+        for e_id in (-1, 12, 100):
+            with self.assertRaises(IndexError):
+                graph.edge(e_id)
+        self.assertEqual(graph.edges[-1], graph.edge(11))
+
+    def test_huge_grid_is_cheap(self):
+        """Test that construction does not depend on the grid size"""
+        graph = ImplicitRectGridGraph(100000, 100000)
+
+        self.assertEqual(len(graph.nodes), 10**10)
+        self.assertEqual(graph.nodes[10**10 - 1], Node(x=99999, y=99999, n_id=10**10 - 1))
+        self.assertEqual(graph.neighbors(0), [1, 100000])
+
+
+class TestPolarGridGraph(unittest.TestCase):
+    """Test PolarGridGraph's ring layout and arithmetic adjacency"""
+
+    def test_ring_sizes_follow_circumference(self):
+        """Test rings split only when their cells would get too wide"""
+        graph = PolarGridGraph(8)
+        self.assertEqual(list(graph.ring_sizes), [1, 6, 12, 24, 24, 24, 48, 48, 48])
+        self.assertEqual(graph.node_count(), 235)
+        self.assertEqual(graph.edge_count(), 2 * 234)
+        self.assertEqual(graph.cell(7), (2, 0))
+        self.assertEqual(graph.index(2, -1), 18)
+
+    def test_matches_compact_graph(self):
+        """Test edges, neighbors and edge_index agree with the materialized graph"""
+        for rings, first_ring in [(0, 6), (1, 3), (3, 4), (6, 6)]:
+            with self.subTest(rings=rings, first_ring=first_ring):
+                polar = PolarGridGraph(rings, first_ring)
+                compact = polar.to_compact()
+                self.assertEqual(list(polar.edges), list(compact.edges))
+                self.assertEqual(list(polar.nodes), list(compact.nodes))
+                for n_id in range(polar.node_count()):
+                    self.assertEqual(sorted(polar.neighbors(n_id)), sorted(compact.neighbors(n_id)))
+                    for other in range(polar.node_count()):
+                        self.assertEqual(polar.edge_index(n_id, other), compact.edge_index(n_id, other))
+
+    def test_coordinates(self):
+        """Test the centre cell sits in the middle and the outer ring on the rim"""
+        graph = PolarGridGraph(3, cell_size=10)
+        self.assertEqual(graph.node(0), Node(x=30, y=30, n_id=0))
+        for n_id in range(graph.index(3, 0), graph.node_count()):
+            node = graph.node(n_id)
+            self.assertAlmostEqual(((node.x - 30) ** 2 + (node.y - 30) ** 2) ** 0.5, 30, delta=1)
+
+
+class TestTessellationGraphs(unittest.TestCase):
+    """Test HexGridGraph and TriGridGraph against their materialized graphs"""
+
+    def test_matches_compact_graph(self):
+        """Test edges, neighbors and edge_index agree with to_compact()"""
+        for cls in (HexGridGraph, TriGridGraph):
+            for w, h in [(1, 1), (1, 4), (4, 1), (2, 2), (3, 5), (6, 4)]:
+                with self.subTest(cls=cls.__name__, w=w, h=h):
+                    graph = cls(w, h)
+                    compact = graph.to_compact()
+                    self.assertEqual(list(graph.edges), list(compact.edges))
+                    for n_id in range(w * h):
+                        self.assertEqual(sorted(graph.neighbors(n_id)), sorted(compact.neighbors(n_id)))
+                        for other in range(w * h):
+                            self.assertEqual(graph.edge_index(n_id, other), compact.edge_index(n_id, other))
+
+    def test_hex_axial_coordinates(self):
+        """Test axial round trips and the six axial neighbor directions"""
+        graph = HexGridGraph(5, 4)
+        directions = {(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)}
+        self.assertEqual(graph.axial(xyToIdx(1, 3, 5)), (0, 3))
+        self.assertIsNone(graph.from_axial(-2, 1))
+        for n_id in range(graph.node_count()):
+            q, r = graph.axial(n_id)
+            self.assertEqual(graph.from_axial(q, r), n_id)
+            self.assertLessEqual({(oq - q, orow - r) for oq, orow in map(graph.axial, graph.neighbors(n_id))},
+                                 directions)
+        self.assertEqual(len(graph.neighbors(xyToIdx(2, 1, 5))), 6)
+
+    def test_tri_orientation(self):
+        """Test triangles alternate and share their base with the next or previous row"""
+        graph = TriGridGraph(4, 3)
+        self.assertTrue(graph.points_up(0))
+        self.assertFalse(graph.points_up(1))
+        self.assertFalse(graph.points_up(4))
+        self.assertEqual(sorted(graph.neighbors(5)), [4, 6, 9])
+        self.assertEqual(sorted(graph.neighbors(6)), [2, 5, 7])
+
+    def test_neighbors_are_cell_size_apart(self):
+        """Test x/y place neighboring cells cell_size apart"""
+        for cls in (HexGridGraph, TriGridGraph):
+            graph = cls(6, 5, cell_size=100)
+            for edge in graph.edges:
+                distance = ((edge.a.x - edge.b.x) ** 2 + (edge.a.y - edge.b.y) ** 2) ** 0.5
+                self.assertAlmostEqual(distance, 100, delta=1)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestMaskedGridGraph(unittest.TestCase):
+    """Test MaskedGridGraph's compact ids and vectorized edges"""
+
+    def test_full_mask_matches_rect_grid_graph(self):
+        """Test a full mask gives the same nodes, edges and CSR index as RectGridGraph"""
+        masked = MaskedGridGraph(np.ones((4, 5), dtype=bool))
+        grid = RectGridGraph(5, 4)
+        self.assertEqual(list(masked.nodes), list(grid.nodes))
+        self.assertEqual(list(masked.edges), list(grid.edges))
+        for n_id in range(20):
+            self.assertEqual(list(masked.neighbors(n_id)), list(grid.neighbors(n_id)))
+            self.assertEqual(masked.edge_index(n_id, n_id + 1), grid.edge_index(n_id, n_id + 1))
+
+    def test_compact_ids(self):
+        """Test masked-out cells are skipped and ids stay dense"""
+        mask = [[1, 1, 0],
+                [0, 1, 1],
+                [1, 1, 1]]
+        graph = MaskedGridGraph(mask)
+        self.assertEqual(list(graph.node_records()),
+                         [(0, 0, 0), (1, 1, 0), (2, 1, 1), (3, 2, 1), (4, 0, 2), (5, 1, 2), (6, 2, 2)])
+        self.assertEqual(list(graph.edge_pairs()), [(0, 1), (1, 2), (2, 3), (2, 5), (3, 6), (4, 5), (5, 6)])
+        self.assertEqual(graph.index(2, 1), 3)
+        self.assertIsNone(graph.index(2, 0))
+        self.assertIsNone(graph.index(3, 0))
+        self.assertFalse(hasattr(graph, 'w'))
+
+    def test_split_mask_keeps_one_piece(self):
+        """Test only the largest piece, or the one asked for, becomes the graph"""
+        mask = [[1, 1, 0, 1, 1],
+                [1, 0, 0, 1, 1],
+                [1, 1, 0, 1, 1]]
+        largest = MaskedGridGraph(mask)
+        self.assertEqual(largest.node_count(), 6)
+        self.assertEqual(largest.node(0), Node(x=3, y=0, n_id=0))
+        self.assertIsNone(largest.index(0, 0))
+
+        kept = MaskedGridGraph(mask, keep=(1, 2))
+        self.assertEqual([(x, y) for _, x, y in kept.node_records()], [(0, 0), (1, 0), (0, 1), (0, 2), (1, 2)])
+        self.assertEqual(kept.edge_count(), 4)
+        with self.assertRaises(ValueError):
+            MaskedGridGraph(mask, keep=(2, 1))
+
+    @unittest.skipIf(pygame is None, "pygame is not installed")
+    def test_from_image(self):
+        """Test dark pixels of a PNG become cells"""
+        surface = pygame.Surface((6, 4))
+        surface.fill((255, 255, 255))
+        surface.fill((0, 0, 0), pygame.Rect(1, 1, 3, 2))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'mask.png')
+            pygame.image.save(surface, path)
+            graph = MaskedGridGraph.from_image(path)
+            inverted = MaskedGridGraph.from_image(path, invert=True)
+        self.assertEqual(graph.shape, (4, 6))
+        self.assertEqual(graph.node_count(), 6)
+        self.assertEqual(graph.node(0), Node(x=1, y=1, n_id=0))
+        self.assertEqual(inverted.node_count(), 18)
+
+
+class TestGrid3DGraph(unittest.TestCase):
+    """Test Grid3DGraph's levels and vertical adjacency"""
+
+    def test_matches_compact_graph(self):
+        """Test edges, neighbors and edge_index agree with to_compact()"""
+        for w, h, d in [(1, 1, 1), (1, 1, 3), (3, 2, 1), (3, 4, 3)]:
+            with self.subTest(w=w, h=h, d=d):
+                graph = Grid3DGraph(w, h, d)
+                compact = graph.to_compact()
+                self.assertEqual(list(graph.nodes), list(compact.nodes))
+                self.assertEqual(list(graph.edges), list(compact.edges))
+                for n_id in range(graph.node_count()):
+                    self.assertEqual(sorted(graph.neighbors(n_id)), sorted(compact.neighbors(n_id)))
+                    for other in range(graph.node_count()):
+                        self.assertEqual(graph.edge_index(n_id, other), compact.edge_index(n_id, other))
+
+    def test_levels(self):
+        """Test node z levels and the edges between levels"""
+        graph = Grid3DGraph(3, 2, 4)
+        self.assertEqual(graph.node(7), Node(x=1, y=0, n_id=7, z=1))
+        self.assertEqual(graph.node_count(), 24)
+        self.assertEqual(graph.edge_count(), 4 * 7 + 3 * 6)
+        self.assertEqual(graph.neighbors(7), [1, 6, 8, 10, 13])
+        self.assertEqual(graph.edge(7), Edge(graph.node(0), graph.node(6), 0, 6))
+
+    def test_levels_survive_files(self):
+        """Test z levels round trip through JSON and binary files"""
+        graph = Grid3DGraph(2, 2, 3)
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('graph.json', 'graph.pmzg'):
+                with self.subTest(name=name):
+                    path = os.path.join(tmp, name)
+                    if name.endswith('.json'):
+                        graph.to_json_file(path)
+                    else:
+                        graph.to_binary_file(path, compress=True)
+                    loaded = Graph.from_file(path)
+                    self.assertEqual(list(loaded.nodes), list(graph.nodes))
+                    self.assertEqual(list(loaded.edge_pairs()), list(graph.edge_pairs()))
+
+    def test_flat_graphs_store_no_levels(self):
+        """Test 2D graphs keep writing files without z levels"""
+        graph = RectGridGraph(2, 2)
+        self.assertIsNone(graph.node_zs())
+        self.assertIsNone(ImplicitRectGridGraph(2, 2).node_zs())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'graph.json')
+            graph.to_json_file(path)
+            with open(path) as f:
+                self.assertNotIn('"z"', f.read())
+
+
+class TestEdgeWeights(unittest.TestCase):
+    """Test optional per-edge weights"""
+
+    def test_default_and_stored_weights(self):
+        """Test graphs without weights weigh 1.0 per edge"""
+        grid = RectGridGraph(3, 2)
+        self.assertIsNone(grid.weights)
+        self.assertEqual(grid.edge_weight(4), 1.0)
+        self.assertEqual(ImplicitRectGridGraph(3, 2).edge_weight(4), 1.0)
+
+        weighted = CompactGraph(grid.xs, grid.ys, grid.edge_a, grid.edge_b, weights=range(7))
+        self.assertEqual(weighted.weights.typecode, 'd')
+        self.assertEqual(weighted.edge_weight(4), 4.0)
+        with self.assertRaises(ValueError):
+            CompactGraph(grid.xs, grid.ys, grid.edge_a, grid.edge_b, weights=[1.0])
+
+    def test_weights_survive_files(self):
+        """Test weights round trip through JSON and binary files"""
+        grid = RectGridGraph(3, 2)
+        weights = [0.5 * e_id for e_id in range(grid.edge_count())]
+        graph = CompactGraph(grid.xs, grid.ys, grid.edge_a, grid.edge_b, weights=weights)
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('graph.json', 'graph.pmzg'):
+                with self.subTest(name=name):
+                    path = os.path.join(tmp, name)
+                    if name.endswith('.json'):
+                        graph.to_json_file(path)
+                    else:
+                        graph.to_binary_file(path, compress=True)
+                    self.assertEqual(list(Graph.from_file(path).weights), weights)
+                    self.assertEqual(list(CompactGraph.from_file(path).weights), weights)
+
+
+class TestImplicitAdjacency(unittest.TestCase):
+    """Test the CSR index of graphs that store no arrays"""
+
+    def test_adjacency_of_implicit_graphs(self):
+        """Test adjacency() matches the compact form of every implicit graph"""
+        for graph in (ImplicitRectGridGraph(4, 3), PolarGridGraph(3), HexGridGraph(4, 3),
+                      TriGridGraph(5, 3), Grid3DGraph(3, 2, 2)):
+            with self.subTest(graph=type(graph).__name__):
+                offsets, targets, edge_ids = graph.adjacency()
+                self.assertEqual((offsets, targets, edge_ids), graph.to_compact().adjacency())
+                for n_id in range(graph.node_count()):
+                    self.assertEqual(sorted(targets[offsets[n_id]:offsets[n_id + 1]]),
+                                     sorted(graph.neighbors(n_id)))
+                    for pos in range(offsets[n_id], offsets[n_id + 1]):
+                        self.assertEqual(graph.edge_index(n_id, targets[pos]), edge_ids[pos])
+
+    def test_grid3d_levels(self):
+        """Test Grid3DGraph reports its levels through zs as well as node_zs()"""
+        graph = Grid3DGraph(2, 2, 2)
+        self.assertEqual(list(graph.zs), [0, 0, 0, 0, 1, 1, 1, 1])
+
 
 class TestGraphJSONSerialization(unittest.TestCase):
     """Test Graph JSON serialization and deserialization"""
@@ -319,5 +700,114 @@ class TestGraphJSONSerialization(unittest.TestCase):
                 os.remove(temp_path)
 
 
+class TestGraphBinarySerialization(unittest.TestCase):
+    """Test the packed binary graph format"""
+
+    def setUp(self):
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.pmzg') as f:
+            self.temp_path = f.name
+
+    def tearDown(self):
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def test_round_trip(self):
+        """Test plain and compressed round trips of a grid"""
+        original = RectGridGraph(5, 4)
+
+        for compress in (False, True):
+            with self.subTest(compress=compress):
+                original.to_binary_file(self.temp_path, compress=compress)
+                loaded = Graph.from_binary_file(self.temp_path)
+
+                self.assertIsInstance(loaded, CompactGraph)
+                self.assertEqual(loaded.xs, original.xs)
+                self.assertEqual(loaded.ys, original.ys)
+                self.assertEqual(loaded.edge_a, original.edge_a)
+                self.assertEqual(loaded.edge_b, original.edge_b)
+                self.assertEqual(list(loaded.neighbors(6)), list(original.neighbors(6)))
+
+    def test_list_backed_and_empty_graphs(self):
+        """Test writing a dataclass Graph and an empty graph"""
+        nodes = [Node(x=3, y=-1, n_id=0), Node(x=4, y=-1, n_id=1)]
+        graph = Graph(nodes=nodes, edges=[Edge(nodes[0], nodes[1], 0, 1)])
+
+        graph.to_binary_file(self.temp_path)
+        loaded = Graph.from_binary_file(self.temp_path)
+        self.assertEqual(list(loaded.nodes), nodes)
+        self.assertEqual(list(loaded.edge_pairs()), [(0, 1)])
+
+        Graph(nodes=[], edges=[]).to_binary_file(self.temp_path, compress=True)
+        loaded = Graph.from_binary_file(self.temp_path)
+        self.assertEqual(len(loaded.nodes), 0)
+        self.assertEqual(len(loaded.edges), 0)
+
+    def test_seed_round_trip(self):
+        """Test the optional seed field in plain and compressed files"""
+        graph = RectGridGraph(3, 3).to_compact()
+        graph.seed = 2**62 + 17
+
+        for compress in (False, True):
+            with self.subTest(compress=compress):
+                graph.to_binary_file(self.temp_path, compress=compress)
+                loaded = Graph.from_binary_file(self.temp_path)
+                self.assertEqual(loaded.seed, 2**62 + 17)
+                self.assertEqual(list(loaded.edge_pairs()), list(graph.edge_pairs()))
+
+        graph.seed = None
+        graph.to_binary_file(self.temp_path)
+        self.assertIsNone(Graph.from_binary_file(self.temp_path).seed)
+
+    def test_seed_out_of_range(self):
+        """Test a seed too big for the seed field is refused before the file is written"""
+        graph = RectGridGraph(2, 2).to_compact()
+        for seed in (2**63, -2**63 - 1):
+            with self.subTest(seed=seed), tempfile.TemporaryDirectory() as tmp:
+                graph.seed = seed
+                path = os.path.join(tmp, 'graph.pmzg')
+                with self.assertRaisesRegex(ValueError, str(seed)):
+                    graph.to_binary_file(path)
+                self.assertFalse(os.path.exists(path))
+
+        graph.seed = -2**63
+        graph.to_binary_file(self.temp_path)
+        self.assertEqual(Graph.from_binary_file(self.temp_path).seed, -2**63)
+
+    def test_from_file_detects_format(self):
+        """Test that from_file accepts both binary and JSON files"""
+        original = RectGridGraph(2, 3)
+
+        original.to_binary_file(self.temp_path)
+        self.assertIsInstance(Graph.from_file(self.temp_path), CompactGraph)
+
+        original.to_json_file(self.temp_path)
+        loaded = Graph.from_file(self.temp_path)
+        self.assertEqual(list(loaded.edge_pairs()), list(original.edge_pairs()))
+
+    def test_rejects_bad_files(self):
+        """Test errors for foreign and truncated files"""
+        with open(self.temp_path, 'wb') as f:
+            f.write(b'not a graph file at all')
+        with self.assertRaises(ValueError):
+            Graph.from_binary_file(self.temp_path)
+
+        RectGridGraph(3, 3).to_binary_file(self.temp_path)
+        with open(self.temp_path, 'r+b') as f:
+            f.truncate(30)
+        with self.assertRaises(ValueError):
+            Graph.from_binary_file(self.temp_path)
+
+    def test_rejects_unknown_flags(self):
+        """Test files with flag bits from a newer writer are refused, not misread"""
+        RectGridGraph(3, 3).to_binary_file(self.temp_path)
+        with open(self.temp_path, 'r+b') as f:
+            header = bytearray(f.read(BINARY_HEADER.size))
+            magic, version, flags, nodes, edges = BINARY_HEADER.unpack(header)
+            f.seek(0)
+            f.write(BINARY_HEADER.pack(magic, version, flags | 16, nodes, edges))
+        with self.assertRaisesRegex(ValueError, 'flags 0x10'):
+            Graph.from_binary_file(self.temp_path)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -2,9 +2,19 @@
 """Test suite for maze.py module"""
 
 import unittest
+import os
 import random
-from graphs import RectGridGraph
-from maze import generate_maze_dfs, generate_maze_with_solution, find_path_dfs
+import tempfile
+from graphs import (Node, Edge, Graph, RectGridGraph, ImplicitRectGridGraph, PolarGridGraph, HexGridGraph,
+                    TriGridGraph, MaskedGridGraph, Grid3DGraph)
+from maze import (generate_maze_dfs, generate_maze_with_solution, find_path_dfs, find_path,
+                  generate_maze, get_generator, register_generator, GENERATORS,
+                  generate_targeted_maze, dead_end_ratio, iter_eller_rows, longest_path, make_rng, maze_to_graph, GridMaze, EAST, SOUTH)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class TestMazeGeneration(unittest.TestCase):
@@ -157,6 +167,35 @@ class TestMazeGeneration(unittest.TestCase):
                 self.assertEqual(path[0], start_idx)
                 self.assertEqual(path[-1], end_idx)
 
+    def test_implicit_grid_generation(self):
+        """Test that an implicit grid produces the same maze for the same seed"""
+        random.seed(7)
+        explicit_edges, explicit_path = generate_maze_dfs(RectGridGraph(6, 4), 0)
+        random.seed(7)
+        implicit_edges, implicit_path = generate_maze_dfs(ImplicitRectGridGraph(6, 4), 0)
+
+        self.assertEqual(implicit_edges, explicit_edges)
+        self.assertEqual(implicit_path, explicit_path)
+
+    def test_find_path_methods(self):
+        """Test parent-pointer search with BFS and DFS"""
+        # A 4-cycle 0-1-3-2-0 plus a tail 3-4
+        adjacency = [[1, 2], [0, 3], [0, 3], [1, 2, 4], [3]]
+        
+        bfs_path = find_path(0, 4, adjacency.__getitem__, 5)
+        self.assertEqual(len(bfs_path), 4)
+        self.assertEqual((bfs_path[0], bfs_path[-1]), (0, 4))
+        
+        dfs_path = find_path(0, 4, adjacency.__getitem__, 5, method='dfs')
+        self.assertEqual((dfs_path[0], dfs_path[-1]), (0, 4))
+        for a, b in zip(dfs_path, dfs_path[1:]):
+            self.assertIn(b, adjacency[a])
+        
+        self.assertEqual(find_path(2, 2, adjacency.__getitem__, 5), [2])
+        self.assertIsNone(find_path(0, 1, [[], []].__getitem__, 2))
+        with self.assertRaises(ValueError):
+            find_path(0, 4, adjacency.__getitem__, 5, method='astar')
+
     def test_find_path_dfs_directly(self):
         """Test the path finding function directly"""
         # Create a simple maze with a known path
@@ -175,6 +214,405 @@ class TestMazeGeneration(unittest.TestCase):
         self.assertEqual(path[-1], end_idx)
         self.assertGreater(len(path), 1)
 
+    def test_longest_path(self):
+        """Test the longest path of a hand-built maze from any source"""
+        # A comb: the top row is a corridor with every column hanging off it
+        maze = GridMaze(3, 3)
+        for a, b in [(0, 1), (1, 2), (0, 3), (3, 6), (1, 4), (4, 7), (2, 5), (5, 8)]:
+            maze.carve(a, b)
+        
+        for source in range(9):
+            with self.subTest(source=source):
+                path = longest_path(RectGridGraph(3, 3), maze, source)
+                self.assertEqual(len(path), 7)
+                self.assertEqual({path[0], path[-1]}, {6, 8})
+        # The path starts at the end nearer the source
+        self.assertEqual(longest_path(RectGridGraph(3, 3), maze.to_edges(), 6), [6, 3, 0, 1, 2, 5, 8])
+
+    def test_farthest_endpoints(self):
+        """Test farthest=True returns the longest path as the solution"""
+        grid = RectGridGraph(6, 5)
+        for algorithm in ['dfs', 'kruskal', 'prim']:
+            with self.subTest(algorithm=algorithm):
+                maze_edges, path = generate_maze(grid, 0, algorithm=algorithm, seed=7, farthest=True)
+                _, corner_path = generate_maze(grid, 0, algorithm=algorithm, seed=7)
+                self.assertGreaterEqual(len(path), len(corner_path))
+                # No node is farther from either end than the other end
+                for end in (path[0], path[-1]):
+                    farthest = max(len(find_path_dfs(end, i, maze_edges, grid.nodes)) for i in range(30))
+                    self.assertEqual(farthest, len(path))
+        
+        result = generate_maze_with_solution(grid, 0, seed=3, farthest=True)
+        self.assertEqual(result['start_node'].n_id, result['solution_path'][0])
+        self.assertEqual(result['end_node'].n_id, result['solution_path'][-1])
+
+
+
+class TestTargetedGeneration(unittest.TestCase):
+    """Test rejection-sampling generation against constraints"""
+
+    def setUp(self):
+        self.grid = RectGridGraph(10, 10)
+
+    def test_constraints_met(self):
+        """Test the returned maze satisfies every constraint"""
+        result = generate_targeted_maze(self.grid, 0, algorithm='kruskal', seed=1, min_length=40,
+                                        max_length=60, max_dead_end_ratio=0.4)
+        self.assertIsNotNone(result)
+        self.assertTrue(40 <= len(result['solution_path']) <= 60)
+        self.assertLessEqual(dead_end_ratio(self.grid, result['maze_edges']), 0.4)
+        self.assertGreaterEqual(result['attempts'], 1)
+        
+        # The returned seed regenerates the maze
+        maze_edges, path = generate_maze(self.grid, 0, algorithm='kruskal', seed=result['seed'])
+        self.assertEqual(path, result['solution_path'])
+
+    def test_dead_end_ratio(self):
+        """Test the ratio is the same for edge lists and GridMazes"""
+        grid = ImplicitRectGridGraph(8, 8)
+        maze, _ = generate_maze(grid, 0, algorithm='prim', grid_maze=True, seed=2)
+        self.assertEqual(dead_end_ratio(grid, maze), dead_end_ratio(grid, maze.to_edges()))
+        self.assertGreater(dead_end_ratio(grid, maze), 0)
+
+    def test_impossible_constraints(self):
+        """Test None is returned when attempts or time run out"""
+        self.assertIsNone(generate_targeted_maze(self.grid, 0, seed=1, min_length=101, max_attempts=5))
+        self.assertIsNone(generate_targeted_maze(self.grid, 0, seed=1, min_length=101, time_budget=0))
+
+    def test_parallel_matches_serial(self):
+        """Test workers return the same maze as a serial run"""
+        kwargs = dict(algorithm='dfs', seed=9, min_length=75, farthest=True)
+        serial = generate_targeted_maze(self.grid, 0, **kwargs)
+        parallel = generate_targeted_maze(self.grid, 0, workers=2, **kwargs)
+        self.assertEqual((parallel['seed'], parallel['attempts']), (serial['seed'], serial['attempts']))
+        self.assertEqual(parallel['solution_path'], serial['solution_path'])
+
+
+class TestGeneratorRegistry(unittest.TestCase):
+    """Test the registered maze generation algorithms"""
+
+    def assertPerfectMaze(self, graph, maze_edges, path, start_idx, end_idx):
+        """Assert maze_edges form a spanning tree and path walks it"""
+        node_count = len(graph.nodes)
+        self.assertEqual(len(maze_edges), node_count - 1)
+        adjacency = [[] for _ in range(node_count)]
+        for edge in maze_edges:
+            self.assertIsNotNone(graph.edge_between(edge.a_id, edge.b_id))
+            adjacency[edge.a_id].append(edge.b_id)
+            adjacency[edge.b_id].append(edge.a_id)
+        reached = {start_idx}
+        frontier = [start_idx]
+        while frontier:
+            for neighbor in adjacency[frontier.pop()]:
+                if neighbor not in reached:
+                    reached.add(neighbor)
+                    frontier.append(neighbor)
+        self.assertEqual(len(reached), node_count)
+        self.assertEqual((path[0], path[-1]), (start_idx, end_idx))
+        for a, b in zip(path, path[1:]):
+            self.assertIn(b, adjacency[a])
+
+    def generate_or_skip(self, graph, name, *args, **kwargs):
+        """Run a generator, skipping the subtest if it only works on a RectGridGraph"""
+        try:
+            return generate_maze(graph, *args, algorithm=name, **kwargs)
+        except ValueError as e:
+            if 'requires a RectGridGraph' not in str(e):
+                raise
+            self.skipTest(f"{name} only works on a RectGridGraph")
+
+    def test_all_generators_on_grids(self):
+        """Test every registered algorithm builds a perfect maze on grids"""
+        self.assertTrue({'dfs', 'kruskal', 'prim', 'wilson', 'eller',
+                         'hunt_and_kill', 'aldous_broder'} <= set(GENERATORS))
+        for name in GENERATORS:
+            for w, h in [(1, 1), (1, 5), (5, 1), (4, 4), (7, 3)]:
+                with self.subTest(algorithm=name, w=w, h=h):
+                    grid = RectGridGraph(w, h)
+                    end_idx = w * h - 1
+                    maze_edges, path = generate_maze(grid, 0, end_idx, algorithm=name)
+                    self.assertPerfectMaze(grid, maze_edges, path, 0, end_idx)
+
+    def test_generators_on_generic_graph(self):
+        """Test the graph-agnostic algorithms on a plain Graph"""
+        # A wheel: hub 0 joined to a ring of 8 nodes
+        nodes = [Node(0, 0, 0)] + [Node(i, 1, i) for i in range(1, 9)]
+        edges = [Edge(nodes[0], nodes[i], 0, i) for i in range(1, 9)]
+        edges += [Edge(nodes[i], nodes[i % 8 + 1], i, i % 8 + 1) for i in range(1, 9)]
+        graph = Graph(nodes=nodes, edges=edges)
+
+        for name in GENERATORS:
+            with self.subTest(algorithm=name):
+                maze_edges, path = self.generate_or_skip(graph, name, 1, 5)
+                self.assertPerfectMaze(graph, maze_edges, path, 1, 5)
+
+        with self.assertRaises(ValueError):
+            generate_maze(graph, 1, 5, algorithm='eller')
+
+    def test_generators_on_polar_grid(self):
+        """Test the graph-agnostic algorithms on a circular maze, ending on the rim"""
+        graph = PolarGridGraph(5)
+        for name in GENERATORS:
+            with self.subTest(algorithm=name):
+                maze_edges, path = self.generate_or_skip(graph, name, 0, seed=3)
+                self.assertPerfectMaze(graph, maze_edges, path, 0, path[-1])
+                self.assertEqual(graph.cell(path[-1])[0], 5)
+
+    def test_generators_on_hex_and_tri_grids(self):
+        """Test the graph-agnostic algorithms on hex and triangle grids, ending in the far corner"""
+        for graph in (HexGridGraph(6, 5), TriGridGraph(7, 4)):
+            for name in GENERATORS:
+                with self.subTest(graph=type(graph).__name__, algorithm=name):
+                    maze_edges, path = self.generate_or_skip(graph, name, 0, seed=3)
+                    self.assertPerfectMaze(graph, maze_edges, path, 0, graph.node_count() - 1)
+            with self.assertRaises(ValueError):
+                generate_maze(graph, 0, algorithm='dfs', grid_maze=True)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_generators_on_masked_grid(self):
+        """Test generators on a masked grid, whose ids skip the cells left out"""
+        ring = np.ones((7, 7), dtype=bool)
+        ring[2:5, 2:5] = False
+        graph = MaskedGridGraph(ring)
+        for name in GENERATORS:
+            with self.subTest(algorithm=name):
+                maze_edges, path = self.generate_or_skip(graph, name, 0, seed=3)
+                # No w/h, so the end is the farthest cell, not an id at the corner
+                self.assertPerfectMaze(graph, maze_edges, path, 0, graph.index(6, 6))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_generators_on_split_mask(self):
+        """Test a mask in two pieces gives a connected graph every generator can finish"""
+        mask = [[1, 1, 0, 1, 1],
+                [1, 0, 0, 0, 1],
+                [1, 1, 0, 1, 1]]
+        graph = MaskedGridGraph(mask, keep=(0, 0))
+        for name in GENERATORS:
+            with self.subTest(algorithm=name):
+                maze_edges, path = self.generate_or_skip(graph, name, 0, seed=3)
+                self.assertPerfectMaze(graph, maze_edges, path, 0, graph.index(1, 2))
+
+    def test_default_end_is_reachable(self):
+        """Test the default end of a graph in pieces is in the start's piece"""
+        nodes = [Node(0, 0, 0), Node(1, 0, 1), Node(9, 9, 2), Node(9, 8, 3)]
+        edges = [Edge(nodes[0], nodes[1], 0, 1), Edge(nodes[2], nodes[3], 2, 3)]
+        graph = Graph(nodes=nodes, edges=edges)
+        for name in GENERATORS:
+            with self.subTest(algorithm=name):
+                _, path = self.generate_or_skip(graph, name, 0, seed=2)
+                self.assertEqual(path, [0, 1])
+
+    def test_random_walks_stay_in_start_piece(self):
+        """Test Wilson and Aldous-Broder finish on a graph in pieces, even from an isolated node"""
+        nodes = [Node(0, 0, 0), Node(1, 0, 1), Node(2, 0, 2), Node(9, 9, 3), Node(9, 8, 4)]
+        edges = [Edge(nodes[0], nodes[1], 0, 1), Edge(nodes[1], nodes[2], 1, 2), Edge(nodes[3], nodes[4], 3, 4)]
+        graph = Graph(nodes=nodes + [Node(5, 5, 5)], edges=edges)
+        for name in ('wilson', 'aldous_broder'):
+            with self.subTest(algorithm=name):
+                maze_edges, path = generate_maze(graph, 0, algorithm=name, seed=1)
+                self.assertEqual(sorted((e.a_id, e.b_id) for e in maze_edges), [(0, 1), (1, 2)])
+                self.assertEqual(path, [0, 1, 2])
+                maze_edges, path = generate_maze(graph, 5, algorithm=name, seed=1)
+                self.assertEqual((maze_edges, path), ([], [5]))
+
+    def test_generators_on_3d_grid(self):
+        """Test the graph-agnostic algorithms on stacked levels, ending in the opposite corner"""
+        graph = Grid3DGraph(4, 3, 3)
+        for name in GENERATORS:
+            with self.subTest(algorithm=name):
+                maze_edges, path = self.generate_or_skip(graph, name, 0, seed=3)
+                self.assertPerfectMaze(graph, maze_edges, path, 0, 35)
+                self.assertEqual(maze_to_graph(graph, maze_edges).node(35).z, 2)
+
+    def test_grid_maze_results(self):
+        """Test every algorithm can carve into a GridMaze"""
+        grid = ImplicitRectGridGraph(9, 6)
+        for name in GENERATORS:
+            with self.subTest(algorithm=name):
+                maze, path = generate_maze(grid, 0, 53, algorithm=name, grid_maze=True)
+                self.assertIsInstance(maze, GridMaze)
+                self.assertPerfectMaze(grid, maze.to_edges(), path, 0, 53)
+
+    def test_unknown_algorithm(self):
+        """Test that unknown algorithm names are rejected"""
+        with self.assertRaises(ValueError):
+            generate_maze(RectGridGraph(2, 2), 0, algorithm='nope')
+
+    def test_register_generator(self):
+        """Test registering a custom generator"""
+        @register_generator('test_dfs_alias')
+        def alias(graph, start_idx, end_idx=None, grid_maze=False, seed=None):
+            return generate_maze_dfs(graph, start_idx, end_idx, grid_maze, seed)
+
+        try:
+            self.assertIs(get_generator('test_dfs_alias'), alias)
+            result = generate_maze_with_solution(RectGridGraph(3, 3), 0, algorithm='test_dfs_alias')
+            self.assertEqual(result['end_node'].n_id, 8)
+        finally:
+            del GENERATORS['test_dfs_alias']
+
+
+class TestSeededGeneration(unittest.TestCase):
+    """Test reproducible generation with per-call random sources"""
+
+    def test_same_seed_same_maze(self):
+        """Test every algorithm is bit-identical for the same seed"""
+        grid = RectGridGraph(8, 6)
+        for name in GENERATORS:
+            with self.subTest(algorithm=name):
+                first = generate_maze(grid, 0, algorithm=name, grid_maze=True, seed=1234)
+                random.seed(99)  # Global state must not matter
+                second = generate_maze(grid, 0, algorithm=name, grid_maze=True, seed=1234)
+                self.assertEqual(first, second)
+
+        dfs_a, _ = generate_maze_dfs(grid, 0, grid_maze=True, seed=1)
+        dfs_b, _ = generate_maze_dfs(grid, 0, grid_maze=True, seed=2)
+        self.assertNotEqual(dfs_a, dfs_b)
+
+    def test_random_instance(self):
+        """Test passing a random.Random instance"""
+        grid = RectGridGraph(5, 5)
+        first, _ = generate_maze_dfs(grid, 0, grid_maze=True, seed=random.Random(5))
+        second, _ = generate_maze_dfs(grid, 0, grid_maze=True, seed=random.Random(5))
+        self.assertEqual(first, second)
+
+        rng = random.Random(5)
+        self.assertIs(make_rng(rng), rng)
+
+    def test_numpy_generator(self):
+        """Test passing a NumPy Generator"""
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+        grid = RectGridGraph(5, 5)
+        first, _ = generate_maze_dfs(grid, 0, grid_maze=True, seed=np.random.default_rng(3))
+        second, _ = generate_maze_dfs(grid, 0, grid_maze=True, seed=np.random.default_rng(3))
+        self.assertEqual(first, second)
+
+    def test_eller_rows_seed(self):
+        """Test that streamed rows are reproducible"""
+        first = list(iter_eller_rows(10, 20, seed=8))
+        second = list(iter_eller_rows(10, 20, seed=8))
+        self.assertEqual(first, second)
+
+    def test_seed_recorded_and_serialized(self):
+        """Test the seed travels through the result and graph files"""
+        grid = RectGridGraph(4, 4)
+        result = generate_maze_with_solution(grid, 0, 15)
+        self.assertIsInstance(result['seed'], int)
+
+        replay = generate_maze_with_solution(grid, 0, 15, seed=result['seed'])
+        self.assertEqual(replay['maze_edges'], result['maze_edges'])
+
+        maze_graph = maze_to_graph(grid, result['maze_edges'], result['seed'])
+        self.assertEqual(len(maze_graph.edges), 15)
+        self.assertEqual(maze_graph.seed, result['seed'])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, save in [('maze.json', maze_graph.to_json_file),
+                               ('maze.pmzg', maze_graph.to_binary_file)]:
+                path = os.path.join(tmp, name)
+                save(path)
+                loaded = Graph.from_file(path)
+                self.assertEqual(loaded.seed, result['seed'])
+                self.assertEqual(list(loaded.edge_pairs()), list(maze_graph.edge_pairs()))
+
+            maze, _ = generate_maze_dfs(grid, 0, grid_maze=True, seed=4)
+            path = os.path.join(tmp, 'grid.json')
+            maze_to_graph(grid, maze, 4).to_json_file(path)
+            self.assertEqual(Graph.from_json_file(path).seed, 4)
+
+
+class TestEllerRows(unittest.TestCase):
+    """Test the row-streaming Eller generator"""
+
+    def test_rows_form_perfect_maze(self):
+        """Test that a bounded run yields a spanning tree of the grid"""
+        for w, h in [(1, 1), (1, 6), (6, 1), (8, 5)]:
+            with self.subTest(w=w, h=h):
+                rows = list(iter_eller_rows(w, h))
+                self.assertEqual(len(rows), h)
+                self.assertTrue(all(len(row) == w for row in rows))
+                self.assertFalse(any(bits & SOUTH for bits in rows[-1]))
+
+                maze = GridMaze(w, h)
+                for y, row in enumerate(rows):
+                    for x, bits in enumerate(row):
+                        if bits & EAST:
+                            maze.carve(x + w * y, x + 1 + w * y)
+                        if bits & SOUTH:
+                            maze.carve(x + w * y, x + w * (y + 1))
+                self.assertEqual(len(maze), w * h - 1)
+                for target in range(w * h):
+                    self.assertIsNotNone(find_path(0, target, maze.neighbors, w * h))
+
+    def test_unbounded(self):
+        """Test that h=None keeps producing rows on demand"""
+        rows = iter_eller_rows(4)
+        for _ in range(1000):
+            row = next(rows)
+            self.assertEqual(len(row), 4)
+            # Every row must leave at least one passage down
+            self.assertTrue(any(bits & SOUTH for bits in row))
+
+
+class TestGridMaze(unittest.TestCase):
+    """Test the packed GridMaze result type"""
+
+    def test_carve_and_query(self):
+        """Test carving, is_open and neighbor iteration"""
+        maze = GridMaze(3, 2)
+        maze.carve(0, 1)
+        maze.carve(4, 1)
+        maze.carve(5, 4)
+
+        self.assertTrue(maze.is_open(1, 0))
+        self.assertTrue(maze.is_open(1, 4))
+        self.assertFalse(maze.is_open(1, 2))
+        self.assertFalse(maze.is_open(2, 3))  # Row wrap is not adjacent
+        self.assertEqual(maze.neighbors(1), [0, 4])
+        self.assertEqual(maze.neighbors(4), [1, 5])
+        self.assertEqual(maze.cell(1), SOUTH)
+        self.assertEqual(len(maze), 3)
+        self.assertEqual(len(maze.bits), 2)
+
+        with self.assertRaises(ValueError):
+            maze.carve(2, 3)
+
+    def test_edge_conversion(self):
+        """Test conversion to and from the edge list representation"""
+        random.seed(3)
+        grid = RectGridGraph(5, 4)
+        maze_edges, _ = generate_maze_dfs(grid, 0)
+
+        maze = GridMaze.from_edges(5, 4, maze_edges)
+        self.assertEqual(len(maze), len(maze_edges))
+        key = lambda edge: (edge.a_id, edge.b_id)
+        self.assertEqual(maze.to_edges(), sorted(maze_edges, key=key))
+
+    def test_generate_grid_maze(self):
+        """Test that grid_maze=True carves the same maze as the edge list"""
+        grid = RectGridGraph(6, 5)
+        random.seed(11)
+        maze_edges, edge_path = generate_maze_dfs(grid, 0, 29)
+        random.seed(11)
+        maze, grid_path = generate_maze_dfs(grid, 0, 29, grid_maze=True)
+
+        self.assertIsInstance(maze, GridMaze)
+        self.assertEqual(maze, GridMaze.from_edges(6, 5, maze_edges))
+        self.assertEqual(grid_path, edge_path)
+
+        with self.assertRaises(ValueError):
+            generate_maze_dfs(Graph(nodes=list(grid.nodes), edges=list(grid.edges)), 0, grid_maze=True)
+
+    def test_pickle(self):
+        """Test that a GridMaze survives pickling"""
+        import pickle
+        random.seed(5)
+        maze, _ = generate_maze_dfs(RectGridGraph(7, 3), 0, grid_maze=True)
+        self.assertEqual(pickle.loads(pickle.dumps(maze)), maze)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Test suite for maze_numpy.py module"""
+
+import unittest
+import random
+from graphs import RectGridGraph, ImplicitRectGridGraph
+from maze import GENERATORS, GridMaze, generate_maze, find_path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import maze_numpy
+
+CARVERS = ['binary_tree', 'sidewinder', 'kruskal_numpy']
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestNumpyCarvers(unittest.TestCase):
+    """Test the vectorized grid carvers"""
+
+    def assertPerfectGridMaze(self, maze):
+        """Assert a GridMaze is a spanning tree of its grid"""
+        n = maze.w * maze.h
+        self.assertEqual(len(maze), n - 1)
+        for target in range(n):
+            self.assertIsNotNone(find_path(0, target, maze.neighbors, n))
+
+    def test_registered(self):
+        """Test the carvers are available as generators"""
+        self.assertTrue(set(CARVERS) <= set(GENERATORS))
+
+    def test_perfect_mazes(self):
+        """Test every carver builds a spanning tree at awkward sizes"""
+        carvers = [maze_numpy.binary_tree_maze, maze_numpy.sidewinder_maze,
+                   maze_numpy.kruskal_numpy_maze]
+        for carve in carvers:
+            for w, h in [(1, 1), (1, 7), (7, 1), (2, 2), (9, 6), (16, 16)]:
+                with self.subTest(carver=carve.__name__, w=w, h=h):
+                    self.assertPerfectGridMaze(carve(w, h, seed=w * 100 + h))
+
+    def test_seeded(self):
+        """Test carvers are reproducible and accept different seed types"""
+        for carve in [maze_numpy.binary_tree_maze, maze_numpy.sidewinder_maze,
+                      maze_numpy.kruskal_numpy_maze]:
+            with self.subTest(carver=carve.__name__):
+                self.assertEqual(carve(12, 9, seed=5), carve(12, 9, seed=5))
+                self.assertEqual(carve(12, 9, seed=random.Random(5)),
+                                 carve(12, 9, seed=random.Random(5)))
+                self.assertEqual(carve(12, 9, seed=np.random.default_rng(5)),
+                                 carve(12, 9, seed=np.random.default_rng(5)))
+                self.assertNotEqual(carve(12, 9, seed=5), carve(12, 9, seed=6))
+
+    def test_generator_interface(self):
+        """Test the registered wrappers return edges or GridMaze plus a path"""
+        grid = ImplicitRectGridGraph(8, 5)
+        for name in CARVERS:
+            with self.subTest(algorithm=name):
+                maze, path = generate_maze(grid, 0, algorithm=name, grid_maze=True, seed=3)
+                self.assertIsInstance(maze, GridMaze)
+                self.assertEqual((path[0], path[-1]), (0, 39))
+
+                maze_edges, edge_path = generate_maze(RectGridGraph(8, 5), 0, algorithm=name, seed=3)
+                self.assertEqual(maze_edges, maze.to_edges())
+                self.assertEqual(edge_path, path)
+
+    def test_array_packing(self):
+        """Test packing and unpacking agree with GridMaze bit access"""
+        rng = np.random.default_rng(0)
+        east = rng.random((5, 7)) < 0.5
+        south = rng.random((5, 7)) < 0.5
+        maze = maze_numpy.grid_maze_from_arrays(east, south)
+        for y in range(5):
+            for x in range(7):
+                self.assertEqual(maze.cell(x + 7 * y), int(east[y, x]) | int(south[y, x]) << 1)
+
+        unpacked_east, unpacked_south = maze_numpy.grid_maze_to_arrays(maze)
+        self.assertTrue(np.array_equal(unpacked_east, east))
+        self.assertTrue(np.array_equal(unpacked_south, south))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Test suite for meshfile.py module"""
+
+import unittest
+import os
+import struct
+import tempfile
+import zipfile
+from collections import Counter
+from graphs import ImplicitRectGridGraph
+from maze import GridMaze, generate_maze, maze_to_graph
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from meshfile import maze_heightfield, heightfield_mesh, maze_mesh, indexed_mesh, to_stl, export_maze_mesh, main
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestMeshfile(unittest.TestCase):
+    """Test the heightfield mesh and its STL/3MF output"""
+
+    def setUp(self):
+        grid = ImplicitRectGridGraph(5, 4)
+        self.maze, _ = generate_maze(grid, 0, algorithm='kruskal', grid_maze=True, seed=6)
+
+    def assertWatertight(self, triangles):
+        """Assert every edge is used exactly once in each direction"""
+        _, faces = indexed_mesh(triangles)
+        directed = Counter(map(tuple, np.concatenate([faces[:, [0, 1]], faces[:, [1, 2]],
+                                                      faces[:, [2, 0]]]).tolist()))
+        for (a, b), count in directed.items():
+            self.assertEqual((count, directed.get((b, a))), (1, 1))
+
+    def volume(self, triangles):
+        """Signed volume enclosed by outward-facing triangles"""
+        return np.einsum('ij,ij->i', triangles[:, 0], np.cross(triangles[:, 1], triangles[:, 2])).sum() / 6
+
+    def test_heightfield(self):
+        """Test cells and open passages are cut down to the floor"""
+        maze = GridMaze(2, 1)
+        maze.carve(0, 1)
+        heights = maze_heightfield(maze, floor=1, height=3)
+        self.assertEqual(heights.tolist(), [[3, 3, 3, 3, 3], [3, 1, 1, 1, 3], [3, 3, 3, 3, 3]])
+
+    def test_watertight_with_exact_volume(self):
+        """Test the solid is closed, outward facing and the right size"""
+        triangles = maze_mesh(self.maze, cell_width=8, wall_width=2, floor=2, height=10)
+        self.assertWatertight(triangles)
+
+        w, h = self.maze.w, self.maze.h
+        block = (10 * w + 2) * (10 * h + 2) * 10
+        # Each cell and each open passage is a channel 8 mm deep
+        channels = (w * h * 64 + len(self.maze) * 8 * 2) * 8
+        self.assertAlmostEqual(self.volume(triangles), block - channels)
+
+    def test_uneven_heightfield(self):
+        """Test side faces split at every level keep any heightfield closed"""
+        heights = np.array([[1.0, 3.0, 2.0], [4.0, 5.0, 1.0]])
+        triangles = heightfield_mesh(heights, [0, 1, 3, 4], [0, 2, 3])
+        self.assertWatertight(triangles)
+        # Column footprints are 1, 2, 1 wide by 2, 1 deep
+        self.assertAlmostEqual(self.volume(triangles), (1 * 1 + 2 * 3 + 1 * 2) * 2 + (1 * 4 + 2 * 5 + 1 * 1) * 1)
+
+    def test_stl(self):
+        """Test the binary STL layout"""
+        triangles = maze_mesh(self.maze)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'maze.stl')
+            to_stl(triangles, path)
+            with open(path, 'rb') as f:
+                data = f.read()
+        count = struct.unpack_from('<I', data, 80)[0]
+        self.assertEqual(count, len(triangles))
+        self.assertEqual(len(data), 84 + 50 * count)
+        # First triangle is a top face, so its normal points up
+        self.assertEqual(struct.unpack_from('<3f', data, 84), (0.0, 0.0, 1.0))
+
+    def test_3mf(self):
+        """Test the 3MF package holds an indexed mesh"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'maze.3mf')
+            count = export_maze_mesh(self.maze, path)
+            with zipfile.ZipFile(path) as package:
+                self.assertIn('[Content_Types].xml', package.namelist())
+                model = package.read('3D/3dmodel.model').decode()
+        self.assertEqual(model.count('<triangle '), count)
+        self.assertIn('unit="millimeter"', model)
+
+    def test_main_from_maze_file(self):
+        """Test exporting a saved maze file from the command line"""
+        with tempfile.TemporaryDirectory() as tmp:
+            maze_path = os.path.join(tmp, 'maze.json')
+            maze_to_graph(ImplicitRectGridGraph(5, 4), self.maze).to_json_file(maze_path)
+            output = os.path.join(tmp, 'maze.stl')
+            main([maze_path, output, '--height', '6'])
+            self.assertGreater(os.path.getsize(output), 84)
+
+
+if __name__ == '__main__':
+    unittest.main()
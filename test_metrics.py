@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Test suite for metrics.py module"""
+
+import unittest
+import json
+import os
+import tempfile
+from graphs import RectGridGraph, ImplicitRectGridGraph, Grid3DGraph
+from maze import GridMaze, generate_maze, find_path
+from batch_maze import make_jobs, run_batch
+from metrics import bfs_distances, tree_diameter, path_between, node_degrees, count_turns, maze_metrics, score_mazes, main
+
+
+def comb_maze():
+    """
+    A 3x3 comb: the top row is a corridor and every column hangs off it.
+
+        0 - 1 - 2
+        |   |   |
+        3   4   5
+        |   |   |
+        6   7   8
+    """
+    maze = GridMaze(3, 3)
+    maze.carve(0, 1)
+    maze.carve(1, 2)
+    for x in range(3):
+        maze.carve(x, x + 3)
+        maze.carve(x + 3, x + 6)
+    return maze
+
+
+class TestMetrics(unittest.TestCase):
+    """Test maze metrics"""
+
+    def test_bfs_distances(self):
+        """Test distances, parents and the farthest node"""
+        distance, parent, farthest = bfs_distances(comb_maze(), 9, 0)
+        self.assertEqual(list(distance), [0, 1, 2, 1, 2, 3, 2, 3, 4])
+        self.assertEqual(parent[8], 5)
+        self.assertEqual(farthest, 8)
+
+    def test_tree_diameter(self):
+        """Test the longest path is found from any starting node"""
+        for source in range(9):
+            with self.subTest(source=source):
+                a, b, length = tree_diameter(comb_maze(), 9, source)
+                self.assertEqual(length, 6)
+                self.assertEqual({a, b}, {6, 8})
+
+    def test_path_between(self):
+        """Test path reconstruction and unreachable ends"""
+        self.assertEqual(path_between(comb_maze(), 9, 6, 8), [6, 3, 0, 1, 2, 5, 8])
+        self.assertIsNone(path_between(GridMaze(2, 2), 4, 0, 3))
+
+    def test_node_degrees(self):
+        """Test open passages are counted at every node"""
+        self.assertEqual(list(node_degrees(comb_maze(), 9)), [2, 3, 2, 2, 2, 2, 1, 1, 1])
+        self.assertEqual(list(node_degrees(GridMaze(2, 2), 4)), [0, 0, 0, 0])
+
+    def test_count_turns(self):
+        """Test direction changes along a path"""
+        grid = RectGridGraph(3, 3)
+        self.assertEqual(count_turns(grid, [6, 3, 0, 1, 2, 5, 8]), 2)
+        self.assertEqual(count_turns(grid, [0, 1, 2]), 0)
+        # Going up a level is a turn too
+        self.assertEqual(count_turns(Grid3DGraph(3, 1, 2), [0, 1, 4, 5]), 2)
+
+    def test_maze_metrics(self):
+        """Test every metric on a hand-checked maze"""
+        grid = ImplicitRectGridGraph(3, 3)
+        metrics = maze_metrics(grid, comb_maze(), [6, 3, 0, 1, 4, 7])
+
+        self.assertEqual(metrics['dead_ends'], 3)
+        self.assertAlmostEqual(metrics['dead_end_ratio'], 1 / 3)
+        self.assertEqual(metrics['junctions'], 1)
+        self.assertEqual(metrics['branching_factor'], 2.0)
+        # Corridors 0-3, 2-5 and 4 hold five cells
+        self.assertAlmostEqual(metrics['river_factor'], 5 / 3)
+        self.assertEqual(metrics['longest_path'], 6)
+        self.assertEqual(set(metrics['longest_path_ends']), {6, 8})
+        self.assertEqual(metrics['solution_length'], 6)
+        self.assertEqual(metrics['solution_turns'], 2)
+        # Only cell 1 offers a choice on the way from 6 to 7
+        self.assertEqual(metrics['decision_points'], 1)
+
+    def test_score_mazes(self):
+        """Test batch scoring matches scoring one at a time"""
+        grid = ImplicitRectGridGraph(8, 8)
+        jobs = []
+        for seed in range(4):
+            maze, path = generate_maze(grid, 0, algorithm='kruskal', grid_maze=True, seed=seed)
+            jobs.append((grid, maze, path))
+
+        expected = [maze_metrics(*job) for job in jobs]
+        self.assertEqual(score_mazes(jobs, workers=1), expected)
+        self.assertEqual(score_mazes(jobs, workers=2), expected)
+        for (_, maze, path), metrics in zip(jobs, expected):
+            self.assertEqual(metrics['solution_length'], len(find_path(0, 63, maze.neighbors, 64)))
+
+    def test_main_scores_manifest(self):
+        """Test scoring a batch_maze.py output directory"""
+        with tempfile.TemporaryDirectory() as tmp:
+            run_batch(make_jobs(4, 6, 2, 0, 2), tmp, 'prim', 'binary', workers=1)
+            main([os.path.join(tmp, 'manifest.jsonl'), '--workers', '1'])
+
+            with open(os.path.join(tmp, 'manifest.jsonl')) as f:
+                manifest = {record['file']: record for record in map(json.loads, f)}
+            with open(os.path.join(tmp, 'metrics.jsonl')) as f:
+                results = [json.loads(line) for line in f]
+
+            self.assertEqual(len(results), 4)
+            for result in results:
+                record = manifest[result['file']]
+                self.assertEqual(result['solution_length'], record['solution_length'])
+                self.assertGreater(result['dead_ends'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
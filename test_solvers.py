@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test suite for solvers.py module"""
+
+import unittest
+import math
+import random
+from graphs import (Node, Edge, Graph, CompactGraph, RectGridGraph, ImplicitRectGridGraph, PolarGridGraph,
+                    Grid3DGraph)
+from maze import generate_maze, maze_to_graph
+from solvers import dijkstra, astar, shortest_path, distance_weights, heuristic_scale, trace_path
+
+
+def weighted_grid(w, h, seed=0):
+    """A w x h grid with random weights between 1 and 4"""
+    grid = RectGridGraph(w, h)
+    rng = random.Random(seed)
+    return CompactGraph(grid.xs, grid.ys, grid.edge_a, grid.edge_b,
+                        weights=[1 + 3 * rng.random() for _ in range(grid.edge_count())])
+
+
+class TestSolvers(unittest.TestCase):
+    """Test Dijkstra and A* against each other and hand-checked graphs"""
+
+    def test_dijkstra_prefers_cheap_detour(self):
+        """Test two cheap edges beat one expensive one"""
+        nodes = [Node(0, 0, 0), Node(1, 0, 1), Node(2, 0, 2)]
+        edges = [Edge(nodes[0], nodes[2], 0, 2), Edge(nodes[0], nodes[1], 0, 1), Edge(nodes[1], nodes[2], 1, 2)]
+        graph = Graph(nodes=nodes, edges=edges, weights=[5.0, 1.0, 1.5])
+
+        distances, parents = dijkstra(graph, 0)
+        self.assertEqual(list(distances), [0.0, 1.0, 2.5])
+        self.assertEqual(trace_path(parents, 0, 2), [0, 1, 2])
+        self.assertEqual(graph.edge_weight(0), 5.0)
+        for method in ('astar', 'dijkstra'):
+            self.assertEqual(shortest_path(graph, 0, 2, method), ([0, 1, 2], 2.5))
+
+    def test_astar_matches_dijkstra(self):
+        """Test A* finds paths as cheap as Dijkstra's on a randomly weighted grid"""
+        graph = weighted_grid(15, 12, seed=4)
+        for start_idx, end_idx in [(0, 179), (20, 100), (150, 3), (7, 7)]:
+            with self.subTest(start=start_idx, end=end_idx):
+                path, cost = astar(graph, start_idx, end_idx)
+                _, expected = shortest_path(graph, start_idx, end_idx, 'dijkstra')
+                self.assertAlmostEqual(cost, expected)
+                self.assertEqual((path[0], path[-1]), (start_idx, end_idx))
+                self.assertAlmostEqual(sum(graph.edge_weight(graph.edge_index(a, b))
+                                           for a, b in zip(path, path[1:])), cost)
+
+    def test_unit_weights_solve_mazes(self):
+        """Test unweighted maze graphs give the unique path through the maze"""
+        grid = ImplicitRectGridGraph(12, 9)
+        maze, path = generate_maze(grid, 0, grid_maze=True, seed=8)
+        passages = maze_to_graph(grid, maze)
+        for method in ('astar', 'dijkstra'):
+            self.assertEqual(shortest_path(passages, 0, 107, method), (path, len(path) - 1))
+
+    def test_weighted_implicit_graphs(self):
+        """Test weights set on implicit graphs are used, not dropped by to_compact()"""
+        for graph, end_idx in [(PolarGridGraph(2), 18), (Grid3DGraph(3, 3, 2), 17),
+                               (ImplicitRectGridGraph(4, 3), 11)]:
+            with self.subTest(graph=type(graph).__name__):
+                graph.weights = [2.0 + e_id % 3 for e_id in range(graph.edge_count())]
+                compact = CompactGraph.from_records(graph.node_records(), graph.edge_pairs(),
+                                                    weights=graph.weights)
+                _, expected = shortest_path(compact, 0, end_idx, 'dijkstra')
+                self.assertGreater(expected, 2.0)
+                for method in ('astar', 'dijkstra'):
+                    _, cost = shortest_path(graph, 0, end_idx, method)
+                    self.assertAlmostEqual(cost, expected)
+                self.assertEqual(list(graph.to_compact().weights), graph.weights)
+
+    def test_unreachable_and_bad_input(self):
+        """Test unreachable ends, negative weights and unknown methods"""
+        nodes = [Node(0, 0, 0), Node(1, 0, 1), Node(5, 5, 2)]
+        graph = Graph(nodes=nodes, edges=[Edge(nodes[0], nodes[1], 0, 1)])
+        self.assertEqual(astar(graph, 0, 2), (None, math.inf))
+        self.assertEqual(shortest_path(graph, 0, 2, 'dijkstra'), (None, math.inf))
+        with self.assertRaises(ValueError):
+            shortest_path(graph, 0, 1, 'bfs')
+        graph.weights = [-1.0]
+        with self.assertRaises(ValueError):
+            dijkstra(graph, 0)
+
+    def test_distance_weights(self):
+        """Test physical edge lengths, including between levels"""
+        grid = Grid3DGraph(2, 2, 2)
+        weights = distance_weights(grid)
+        self.assertEqual(list(weights), [1.0] * grid.edge_count())
+        self.assertEqual(heuristic_scale(grid), 1.0)
+
+        nodes = [Node(0, 0, 0), Node(3, 4, 1)]
+        graph = Graph(nodes=nodes, edges=[Edge(nodes[0], nodes[1], 0, 1)], weights=[10.0])
+        self.assertEqual(list(distance_weights(graph)), [5.0])
+        self.assertEqual(heuristic_scale(graph), 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
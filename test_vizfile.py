@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Test suite for the rendering in vizfile.py"""
+
+import unittest
+import argparse
+import os
+import tempfile
+import time
+from graphs import RectGridGraph
+
+# The viewer tests need a display surface, but no real display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+try:
+    import pygame
+    import vizfile
+except ImportError:
+    pygame = None
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestHeadlessRendering(unittest.TestCase):
+    """Test PNG rendering without a display"""
+
+    def test_cached_fonts_and_labels(self):
+        """Test fonts and label surfaces are created once"""
+        self.assertIs(vizfile.get_font(12), vizfile.get_font(12))
+        self.assertIs(vizfile.render_label('(1,2)'), vizfile.render_label('(1,2)'))
+
+    def test_render_png(self):
+        """Test a graph renders to a PNG of the requested size"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'grid.png')
+            vizfile.render_png(RectGridGraph(4, 3), path, 'grid.json', width=320, height=240)
+            self.assertEqual(pygame.image.load(path).get_size(), (320, 240))
+
+    def test_render_directory(self):
+        """Test every graph file in a directory is rendered and bad files reported"""
+        with tempfile.TemporaryDirectory() as tmp:
+            graph_dir = os.path.join(tmp, 'graphs')
+            os.makedirs(graph_dir)
+            RectGridGraph(3, 3).to_json_file(os.path.join(graph_dir, 'a.json'))
+            RectGridGraph(5, 2).to_binary_file(os.path.join(graph_dir, 'b.pmzg'))
+            with open(os.path.join(graph_dir, 'broken.json'), 'w') as f:
+                f.write('{')
+            with open(os.path.join(graph_dir, 'notes.txt'), 'w') as f:
+                f.write('skipped')
+
+            png_dir = os.path.join(tmp, 'png')
+            written, errors = vizfile.render_directory(graph_dir, png_dir, workers=1, width=200, height=150,
+                                                       labels=False)
+            self.assertEqual(written, 2)
+            self.assertEqual(len(errors), 1)
+            self.assertEqual(sorted(os.listdir(png_dir)), ['a.png', 'b.png'])
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestGraphViewer(unittest.TestCase):
+    """Test the cached, dirty-rect interactive viewer"""
+
+    def setUp(self):
+        pygame.display.init()
+        self.screen = pygame.display.set_mode((400, 300))
+        self.viewer = vizfile.GraphViewer(self.screen, RectGridGraph(6, 4), 10, 2,
+                                          argparse.Namespace(json_file='grid.json'))
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def test_background_rendered_once(self):
+        """Test only the first frame redraws the whole screen"""
+        self.assertEqual(self.viewer.frame(), [self.screen.get_rect()])
+        self.viewer.hover_at((0, 0))
+        rects = self.viewer.frame()
+        self.assertTrue(rects)
+        self.assertTrue(all(rect.width < 400 for rect in rects))
+        self.assertFalse(self.viewer.needs_render)
+
+    def test_hover(self):
+        """Test the node under the mouse is found and highlighted"""
+        self.viewer.frame()
+        point = self.viewer.to_screen(self.viewer.base_positions[9])
+        self.viewer.hover_at(point)
+        self.assertEqual(self.viewer.hover, 9)
+        self.viewer.frame()
+        self.assertEqual(self.screen.get_at((int(point[0]) + 11, int(point[1]))), pygame.Color(*vizfile.RED))
+
+    def test_zoom_and_label_detail(self):
+        """Test zooming keeps the point under the cursor and switches labels"""
+        self.viewer.labels = True
+        spacing = self.viewer.base_spacing
+        self.viewer.zoom_at((0, 0), vizfile.GraphViewer.LABEL_MIN_SPACING / spacing / 2)
+        self.assertFalse(self.viewer.view_settings()[2])
+
+        before = self.viewer.to_screen(self.viewer.base_positions[5])
+        self.viewer.zoom_at(before, 4)
+        self.assertTrue(self.viewer.view_settings()[2])
+        after = self.viewer.to_screen(self.viewer.base_positions[5])
+        self.assertAlmostEqual(before[0], after[0])
+        self.assertAlmostEqual(before[1], after[1])
+        self.assertTrue(self.viewer.needs_render)
+
+    def test_pan(self):
+        """Test dragging shifts the cached background until released"""
+        self.viewer.frame()
+        self.viewer.pan(10, 5)
+        self.viewer.frame()
+        self.assertFalse(self.viewer.needs_render)
+        self.viewer.end_pan()
+        self.assertTrue(self.viewer.needs_render)
+        self.assertEqual(self.viewer.offset, (10, 5))
+
+    def full_render(self):
+        """Return the viewer's view drawn without culling"""
+        viewer = self.viewer
+        zoom, (ox, oy) = viewer.zoom, viewer.offset
+        positions = {n_id: (x * zoom + ox, y * zoom + oy) for n_id, (x, y) in viewer.base_positions.items()}
+        surface = pygame.Surface(self.screen.get_size())
+        node_size, edge_width, labels = viewer.view_settings()
+        vizfile.draw_graph(surface, viewer.graph, positions, node_size, edge_width, viewer.args, labels)
+        return surface
+
+    def test_zoomed_in_view_matches_full_render(self):
+        """Test drawing only the viewport's buckets gives the same picture"""
+        self.viewer.labels = True
+        self.viewer.zoom_at((200, 150), 3)
+        self.viewer.pan(-40, 25)
+        self.viewer.end_pan()
+        self.viewer.render_background()
+        self.assertEqual(pygame.image.tostring(self.viewer.background, 'RGB'),
+                         pygame.image.tostring(self.full_render(), 'RGB'))
+
+    def test_zoomed_out_view_reuses_overview(self):
+        """Test unlabelled zoomed-out views scale one cached drawing of the layout"""
+        self.viewer.labels = False
+        self.viewer.render_background()
+        overview = self.viewer._overview
+        self.viewer.zoom_at((200, 150), 0.5)
+        self.viewer.render_background()
+        self.assertIs(self.viewer._overview, overview)
+        x, y = self.viewer.to_screen(self.viewer.base_positions[9])
+        color = self.viewer.background.get_at((int(x), int(y)))
+        self.assertGreater(color.b, 200)  # blue, give or take the smoothing
+        self.assertLess(color.r, 50)
+
+    def test_large_graph_redraw_time(self):
+        """Test zoom steps on a large graph cost what is on screen, not the whole graph"""
+        self.viewer = vizfile.GraphViewer(self.screen, RectGridGraph(150, 150), 10, 2,
+                                          argparse.Namespace(json_file='grid.json'))
+        start = time.perf_counter()
+        self.full_render()
+        full = time.perf_counter() - start
+
+        self.viewer.zoom_at((200, 150), 10)
+        self.viewer.render_background()  # builds the spatial index
+        start = time.perf_counter()
+        for _ in range(5):
+            self.viewer.zoom_at((200, 150), 1.25)
+            self.viewer.render_background()
+        self.assertLess((time.perf_counter() - start) / 5, full / 5)
+
+        self.viewer.reset_view()
+        self.viewer.render_background()
+        start = time.perf_counter()
+        for _ in range(5):
+            self.viewer.zoom_at((200, 150), 0.8)
+            self.viewer.render_background()
+        self.assertLess((time.perf_counter() - start) / 5, full / 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
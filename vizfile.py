@@ -1,37 +1,49 @@
 #!/usr/bin/env python3
 """
-Pygame visualization script for graph JSON files.
+Pygame visualization script for graph JSON or binary files.
 
-Usage: python vizfile.py <graph_json_file>
+Usage: python vizfile.py <graph_file>
+       python vizfile.py <graph_file> --png preview.png
+       python vizfile.py <graph_dir> --png previews/ --workers 8
 """
 
+import os
 import sys
 import json
-import pygame
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import pygame
 from graphs import Graph
 
+GRAPH_EXTENSIONS = ('.json', '.pmzg')
+
 
-def parse_arguments():
+def parse_arguments(argv=None):
     """Parse command line arguments"""
-    parser = argparse.ArgumentParser(description='Visualize a graph from a JSON file')
-    parser.add_argument('json_file', help='Path to the JSON file containing graph data')
+    parser = argparse.ArgumentParser(description='Visualize a graph from a JSON or binary graph file')
+    parser.add_argument('json_file', help='Path to the JSON or binary file containing graph data, or a '
+                                          'directory of them with --png')
     parser.add_argument('--width', type=int, default=800, help='Window width')
     parser.add_argument('--height', type=int, default=600, help='Window height')
     parser.add_argument('--node-size', type=int, default=10, help='Node radius in pixels')
     parser.add_argument('--edge-width', type=int, default=2, help='Edge width in pixels')
+    parser.add_argument('--png', default=None,
+                        help='Render headlessly to this PNG file (or directory, for a directory of graphs)')
+    parser.add_argument('--no-labels', action='store_true', help='Leave out node id and coordinate labels')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for a directory (default: CPU count)')
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def load_graph_from_json(filepath):
-    """Load a graph from a JSON file"""
+    """Load a graph from a JSON or binary graph file"""
     try:
-        return Graph.from_json_file(filepath)
+        return Graph.from_file(filepath)
     except FileNotFoundError:
         print(f"Error: File '{filepath}' not found.")
         sys.exit(1)
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, UnicodeDecodeError):
         print(f"Error: File '{filepath}' is not valid JSON.")
         sys.exit(1)
     except Exception as e:
@@ -83,62 +95,411 @@ def calculate_layout(graph, width, height):
     return positions
 
 
-def draw_graph(screen, graph, positions, node_size, edge_width, args):
-    """Draw the graph on the Pygame screen"""
-    # Colors
-    WHITE = (255, 255, 255)
-    BLACK = (0, 0, 0)
-    RED = (255, 0, 0)
-    BLUE = (0, 0, 255)
-    GRAY = (200, 200, 200)
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+GRAY = (200, 200, 200)
+
+
+@lru_cache(maxsize=None)
+def get_font(size, bold=False):
+    """Return a cached Arial font; SysFont searches the system fonts on every call"""
+    if not pygame.font.get_init():
+        pygame.font.init()
+    return pygame.font.SysFont('Arial', size, bold=bold)
+
+
+@lru_cache(maxsize=65536)
+def render_label(text, size=12):
+    """Return a cached pre-rendered black label surface"""
+    return get_font(size).render(text, True, BLACK)
+
+
+def draw_header(screen, graph, args):
+    """Draw the title and graph info at the top of the screen"""
+    title_text = get_font(18, bold=True).render("Graph Visualization", True, BLACK)
+    info_text = get_font(14).render(f"Nodes: {len(graph.nodes)} | Edges: {len(graph.edges)} | File: {os.path.basename(args.json_file)}", True, BLACK)
     
+    screen.blit(title_text, (20, 20))
+    screen.blit(info_text, (20, 50))
+
+
+def draw_graph(screen, graph, positions, node_size, edge_width, args, labels=True, nodes=None, edges=None,
+               header=True):
+    """
+    Draw the graph on the Pygame screen (or any Surface), skipping what falls outside it.
+    
+    nodes and edges default to all of the graph's node records and edge
+    pairs; pass a subset to draw only those.
+    """
     # Clear screen
     screen.fill(WHITE)
+    bounds = screen.get_rect().inflate(2 * node_size + 2, 2 * node_size + 2)
+    left, top, right, bottom = bounds.left, bounds.top, bounds.right, bounds.bottom
     
     # Draw title and info at the top
-    font_large = pygame.font.SysFont('Arial', 18, bold=True)
-    font_small = pygame.font.SysFont('Arial', 14)
-    
-    title_text = font_large.render("Graph Visualization", True, BLACK)
-    info_text = font_small.render(f"Nodes: {len(graph.nodes)} | Edges: {len(graph.edges)} | File: {args.json_file.split('/')[-1]}", True, BLACK)
-    
-    screen.blit(title_text, (20, 20))
-    screen.blit(info_text, (20, 50))
+    if header:
+        draw_header(screen, graph, args)
     
     # Draw edges
-    for edge in graph.edges:
-        if edge.a_id in positions and edge.b_id in positions:
-            start_pos = positions[edge.a_id]
-            end_pos = positions[edge.b_id]
-            pygame.draw.line(screen, GRAY, start_pos, end_pos, edge_width)
+    for a_id, b_id in graph.edge_pairs() if edges is None else edges:
+        if a_id in positions and b_id in positions:
+            (ax, ay), (bx, by) = positions[a_id], positions[b_id]
+            if max(ax, bx) < left or min(ax, bx) > right or max(ay, by) < top or min(ay, by) > bottom:
+                continue
+            pygame.draw.line(screen, GRAY, (ax, ay), (bx, by), edge_width)
     
     # Draw nodes
-    for node in graph.nodes:
-        if node.n_id in positions:
-            pos = positions[node.n_id]
-            pygame.draw.circle(screen, BLUE, (int(pos[0]), int(pos[1])), node_size)
+    for n_id, x, y in graph.node_records() if nodes is None else nodes:
+        if n_id in positions:
+            pos = positions[n_id]
+            if not (left <= pos[0] <= right and top <= pos[1] <= bottom):
+                continue
+            if node_size > 0:
+                pygame.draw.circle(screen, BLUE, (int(pos[0]), int(pos[1])), node_size)
+            if not labels:
+                continue
             
             # Draw node ID at upper right
-            font = pygame.font.SysFont('Arial', 12)
-            text = font.render(str(node.n_id), True, BLACK)
+            text = render_label(str(n_id))
             text_rect = text.get_rect(midbottom=(pos[0] + node_size + 10, pos[1] - node_size - 10))
             screen.blit(text, text_rect)
-    
-    # Draw node coordinates at upper left (for grid graphs)
-    font = pygame.font.SysFont('Arial', 12)
-    for node in graph.nodes:
-        if node.n_id in positions:
-            pos = positions[node.n_id]
-            coords_text = f"({node.x},{node.y})"
-            text = font.render(coords_text, True, BLACK)
-            # Position at upper left: subtract from x, subtract from y
+            
+            # Draw node coordinates at upper left (for grid graphs)
+            text = render_label(f"({x},{y})")
             text_rect = text.get_rect(midbottom=(pos[0] - node_size - 10, pos[1] - node_size - 10))
             screen.blit(text, text_rect)
 
 
-def main():
+def _node_spacing(graph, positions, sample=1000):
+    """Return the shortest edge length among the first edges, as the layout's node spacing"""
+    spacing = None
+    for i, (a_id, b_id) in enumerate(graph.edge_pairs()):
+        if i == sample:
+            break
+        if a_id in positions and b_id in positions:
+            (ax, ay), (bx, by) = positions[a_id], positions[b_id]
+            length = ((bx - ax) ** 2 + (by - ay) ** 2) ** 0.5
+            if length > 0 and (spacing is None or length < spacing):
+                spacing = length
+    return spacing or 20.0
+
+
+class GraphViewer:
+    """
+    Interactive view of a graph with zoom, pan and hover highlighting.
+    
+    The static graph is drawn into a cached background surface only when the
+    view changes. While dragging, the cached background is just blitted at
+    the drag offset. Otherwise a frame restores and redraws only the hover
+    highlight and status line, and frame() returns the changed rects for
+    pygame.display.update. Labels are hidden, and nodes shrink, when zoomed
+    too far out for them to fit.
+    
+    Redrawing the background looks up only the spatial hash buckets in the
+    viewport, so zoomed-in views cost what is on screen. Unlabelled views at
+    or below the initial zoom reuse an overview of the whole layout, drawn
+    once and scaled to the zoom.
+    """
+    
+    # Screen pixels between neighboring nodes needed to show their labels
+    LABEL_MIN_SPACING = 70
+    MIN_ZOOM = 0.1
+    MAX_ZOOM = 1000.0
+    
+    def __init__(self, screen, graph, node_size, edge_width, args, labels=True):
+        self.screen = screen
+        self.graph = graph
+        self.node_size = node_size
+        self.edge_width = edge_width
+        self.args = args
+        self.labels = labels
+        
+        width, height = screen.get_size()
+        self.base_positions = calculate_layout(graph, width, height)
+        self.base_spacing = _node_spacing(graph, self.base_positions)
+        self.zoom = 1.0
+        self.offset = (0.0, 0.0)
+        self.background = pygame.Surface((width, height))
+        self.needs_render = True
+        self.drag_shift = None
+        self.hover = None
+        self.hover_rects = []
+        self._buckets = None
+        self._edge_buckets = None
+        self._bounds = None
+        self._overview = None
+    
+    def to_screen(self, pos):
+        """Map a layout position to screen coordinates"""
+        return (pos[0] * self.zoom + self.offset[0], pos[1] * self.zoom + self.offset[1])
+    
+    def view_settings(self, zoom=None):
+        """Return (node_size, edge_width, labels) for a zoom level, by default the current one"""
+        spacing = self.base_spacing * (self.zoom if zoom is None else zoom)
+        node_size = min(self.node_size, int(spacing * 0.3))
+        edge_width = max(1, min(self.edge_width, int(spacing * 0.2)))
+        return node_size, edge_width, self.labels and spacing >= self.LABEL_MIN_SPACING
+    
+    def render_background(self):
+        """Draw the static graph into the cached background at the current view"""
+        node_size, edge_width, labels = self.view_settings()
+        if self.zoom <= 1 and not labels and self._overview_fits():
+            self._render_overview()
+        else:
+            self._node_index()
+            self._edge_index()
+            zoom, (ox, oy) = self.zoom, self.offset
+            nodes = [(n_id,) + self._coordinates[n_id]
+                     for n_id in self._visible(self._buckets, (node_size + 1) / zoom)]
+            edges = list(self._visible(self._edge_buckets, self._edge_reach + (edge_width + 1) / zoom))
+            ids = {n_id for n_id, _, _ in nodes}
+            ids.update(a_id for a_id, _ in edges)
+            ids.update(b_id for _, b_id in edges)
+            base = self.base_positions
+            positions = {n_id: (base[n_id][0] * zoom + ox, base[n_id][1] * zoom + oy) for n_id in ids}
+            draw_graph(self.background, self.graph, positions, node_size, edge_width, self.args, labels,
+                       nodes, edges)
+        self.needs_render = False
+    
+    def _node_index(self):
+        """Build the spatial hash of layout positions, one bucket per node spacing"""
+        if self._buckets is None:
+            self._buckets = {}
+            size = self.base_spacing
+            for n_id, (x, y) in self.base_positions.items():
+                self._buckets.setdefault((int(x // size), int(y // size)), []).append(n_id)
+            self._coordinates = {n_id: (x, y) for n_id, x, y in self.graph.node_records()}
+    
+    def _edge_index(self):
+        """Build the spatial hash of edges, filed under their midpoints"""
+        if self._edge_buckets is None:
+            self._edge_buckets = {}
+            size = self.base_spacing
+            positions = self.base_positions
+            reach = 0.0
+            for a_id, b_id in self.graph.edge_pairs():
+                if a_id in positions and b_id in positions:
+                    (ax, ay), (bx, by) = positions[a_id], positions[b_id]
+                    key = (int((ax + bx) / 2 // size), int((ay + by) / 2 // size))
+                    self._edge_buckets.setdefault(key, []).append((a_id, b_id))
+                    reach = max(reach, abs(bx - ax), abs(by - ay))
+            # No point of an edge is further than this from its midpoint along either axis
+            self._edge_reach = reach / 2
+    
+    def _visible(self, buckets, margin):
+        """Yield the items in the buckets overlapping the viewport grown by margin layout units"""
+        size = self.base_spacing
+        width, height = self.screen.get_size()
+        zoom, (ox, oy) = self.zoom, self.offset
+        x0, x1 = int((-ox / zoom - margin) // size), int(((width - ox) / zoom + margin) // size)
+        y0, y1 = int((-oy / zoom - margin) // size), int(((height - oy) / zoom + margin) // size)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(buckets):
+            keys = [key for key in buckets if x0 <= key[0] <= x1 and y0 <= key[1] <= y1]
+        else:
+            keys = [(bx, by) for bx in range(x0, x1 + 1) for by in range(y0, y1 + 1) if (bx, by) in buckets]
+        for key in keys:
+            yield from buckets[key]
+    
+    def _layout_bounds(self):
+        """Return (left, top, right, bottom) of the layout positions, or None for an empty layout"""
+        if self._bounds is None and self.base_positions:
+            xs = [x for x, _ in self.base_positions.values()]
+            ys = [y for _, y in self.base_positions.values()]
+            self._bounds = (min(xs), min(ys), max(xs), max(ys))
+        return self._bounds
+    
+    def _overview_fits(self):
+        """Return whether the whole layout at zoom 1 fits a surface of a few screens"""
+        bounds = self._layout_bounds()
+        if bounds is None:
+            return False
+        left, top, right, bottom = bounds
+        width, height = self.screen.get_size()
+        return (right - left) * (bottom - top) <= 4 * width * height
+    
+    def _render_overview(self):
+        """Draw the background by scaling the cached zoom 1 drawing of the whole layout"""
+        if self._overview is None:
+            node_size, edge_width, _ = self.view_settings(1.0)
+            pad = node_size + edge_width + 1
+            left, top, right, bottom = self._layout_bounds()
+            left, top = left - pad, top - pad
+            surface = pygame.Surface((int(right - left + pad) + 1, int(bottom - top + pad) + 1), depth=32)
+            positions = {n_id: (x - left, y - top) for n_id, (x, y) in self.base_positions.items()}
+            draw_graph(surface, self.graph, positions, node_size, edge_width, self.args, False, header=False)
+            self._overview = surface, (left, top)
+        
+        surface, (left, top) = self._overview
+        zoom, (ox, oy) = self.zoom, self.offset
+        if zoom != 1:
+            width, height = surface.get_size()
+            surface = pygame.transform.smoothscale(surface, (max(1, round(width * zoom)),
+                                                             max(1, round(height * zoom))))
+        self.background.fill(WHITE)
+        self.background.blit(surface, (round(left * zoom + ox), round(top * zoom + oy)))
+        draw_header(self.background, self.graph, self.args)
+    
+    def zoom_at(self, point, factor):
+        """Zoom by factor, keeping the layout position under point fixed"""
+        zoom = min(self.MAX_ZOOM, max(self.MIN_ZOOM, self.zoom * factor))
+        ratio = zoom / self.zoom
+        self.offset = (point[0] - (point[0] - self.offset[0]) * ratio,
+                       point[1] - (point[1] - self.offset[1]) * ratio)
+        self.zoom = zoom
+        self.needs_render = True
+    
+    def reset_view(self):
+        """Go back to the initial fit-to-window view"""
+        self.zoom = 1.0
+        self.offset = (0.0, 0.0)
+        self.needs_render = True
+    
+    def pan(self, dx, dy):
+        """Move the view while dragging; the background is redrawn once the drag ends"""
+        self.offset = (self.offset[0] + dx, self.offset[1] + dy)
+        shift = self.drag_shift or (0, 0)
+        self.drag_shift = (shift[0] + dx, shift[1] + dy)
+    
+    def end_pan(self):
+        """Finish a drag and redraw the background at the new view"""
+        if self.drag_shift is not None:
+            self.drag_shift = None
+            self.needs_render = True
+    
+    def node_at(self, point):
+        """Return the id of the node drawn under a screen point, or None"""
+        self._node_index()
+        size = self.base_spacing
+        x = (point[0] - self.offset[0]) / self.zoom
+        y = (point[1] - self.offset[1]) / self.zoom
+        bx, by = int(x // size), int(y // size)
+        node_size, _, _ = self.view_settings()
+        best, best_distance = None, max(node_size / self.zoom, size / 2) ** 2
+        for key in ((bx + i, by + j) for i in (-1, 0, 1) for j in (-1, 0, 1)):
+            for n_id in self._buckets.get(key, ()):
+                nx, ny = self.base_positions[n_id]
+                distance = (nx - x) ** 2 + (ny - y) ** 2
+                if distance <= best_distance:
+                    best, best_distance = n_id, distance
+        return best
+    
+    def hover_at(self, point):
+        """Set the highlighted node from the mouse position"""
+        if self.drag_shift is None:
+            self.hover = self.node_at(point)
+    
+    def _draw_overlay(self):
+        """Draw the hover highlight and status line, returning their rects"""
+        width, height = self.screen.get_size()
+        rects = []
+        status = f"Zoom {self.zoom:.2f}x"
+        if self.hover is not None:
+            x, y = self._coordinates[self.hover]
+            status += f" | Node {self.hover} ({x},{y})"
+            cx, cy = self.to_screen(self.base_positions[self.hover])
+            radius = max(self.view_settings()[0], 3) + 2
+            rects.append(pygame.draw.circle(self.screen, RED, (int(cx), int(cy)), radius, 2))
+        text = render_label(status, 14)
+        rects.append(self.screen.blit(text, text.get_rect(bottomleft=(20, height - 10))))
+        return rects
+    
+    def frame(self):
+        """
+        Bring the screen up to date.
+        
+        Returns:
+            list: Rects that changed, for pygame.display.update
+        """
+        full = self.screen.get_rect()
+        if self.drag_shift is not None:
+            self.screen.fill(WHITE)
+            self.screen.blit(self.background, self.drag_shift)
+            self.hover_rects = []
+            return [full]
+        
+        if self.needs_render:
+            self.render_background()
+            self.screen.blit(self.background, (0, 0))
+            self.hover_rects = self._draw_overlay()
+            return [full]
+        
+        # Restore the old overlay from the background, then draw the new one
+        old_rects = self.hover_rects
+        for rect in old_rects:
+            self.screen.blit(self.background, rect, rect)
+        self.hover_rects = self._draw_overlay()
+        return old_rects + self.hover_rects
+
+
+def render_png(graph, png_file, graph_file='', width=800, height=600, node_size=10, edge_width=2, labels=True):
+    """
+    Render a graph once to an off-screen Surface and save it as a PNG.
+    
+    Needs no display or window, so it runs on headless servers; only
+    pygame's font module is initialized.
+    """
+    surface = pygame.Surface((width, height))
+    positions = calculate_layout(graph, width, height)
+    draw_graph(surface, graph, positions, node_size, edge_width, argparse.Namespace(json_file=graph_file), labels)
+    pygame.image.save(surface, png_file)
+    return png_file
+
+
+def _render_job(job):
+    graph_file, png_file, options = job
+    try:
+        return render_png(Graph.from_file(graph_file), png_file, graph_file, **options), None
+    except Exception as e:
+        return png_file, f"{graph_file}: {e}"
+
+
+def render_directory(graph_dir, png_dir, workers=None, **options):
+    """
+    Render every graph file in graph_dir to a PNG of the same name in png_dir.
+    
+    Files are rendered across worker processes; each worker keeps its own
+    font and label caches for all the files it renders.
+    
+    Args:
+        graph_dir: Directory of .json/.pmzg graph files
+        png_dir: Directory to write the PNGs to
+        workers: Worker processes; 1 renders in this process, None uses all CPUs
+        options: render_png keyword arguments (width, height, labels, ...)
+    
+    Returns:
+        tuple: (number of PNGs written, list of error messages)
+    """
+    os.makedirs(png_dir, exist_ok=True)
+    jobs = [(os.path.join(graph_dir, name), os.path.join(png_dir, os.path.splitext(name)[0] + '.png'), options)
+            for name in sorted(os.listdir(graph_dir)) if name.lower().endswith(GRAPH_EXTENSIONS)]
+    if workers == 1:
+        results = [_render_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_render_job, jobs, chunksize=8))
+    errors = [error for _, error in results if error]
+    return len(results) - len(errors), errors
+
+
+def main(argv=None):
     """Main function"""
-    args = parse_arguments()
+    args = parse_arguments(argv)
+    
+    if args.png:
+        options = dict(width=args.width, height=args.height, node_size=args.node_size,
+                       edge_width=args.edge_width, labels=not args.no_labels)
+        if os.path.isdir(args.json_file):
+            written, errors = render_directory(args.json_file, args.png, args.workers, **options)
+            for error in errors:
+                print(f"Error: {error}")
+            print(f"Rendered {written} graphs into {args.png}")
+            sys.exit(1 if errors else 0)
+        render_png(load_graph_from_json(args.json_file), args.png, args.json_file, **options)
+        print(f"Rendered {args.json_file} to {args.png}")
+        return
     
     # Initialize Pygame
     pygame.init()
@@ -152,8 +513,9 @@ def main():
     graph = load_graph_from_json(args.json_file)
     print(f"Loaded graph with {len(graph.nodes)} nodes and {len(graph.edges)} edges")
     
-    # Calculate node positions
-    positions = calculate_layout(graph, args.width, args.height)
+    # Lay out the graph; it is only redrawn when the view changes
+    viewer = GraphViewer(screen, graph, args.node_size, args.edge_width, args, not args.no_labels)
+    print("Mouse wheel zooms, drag pans, 0 resets the view, S saves a screenshot")
     
     # Main loop
     running = True
@@ -170,12 +532,22 @@ def main():
                     # Save screenshot
                     pygame.image.save(screen, "graph_screenshot.png")
                     print("Saved screenshot as graph_screenshot.png")
+                elif event.key == pygame.K_0:
+                    viewer.reset_view()
+            elif event.type == pygame.MOUSEWHEEL:
+                viewer.zoom_at(pygame.mouse.get_pos(), 1.25 ** event.y)
+            elif event.type == pygame.MOUSEMOTION:
+                if event.buttons[0]:
+                    viewer.pan(*event.rel)
+                else:
+                    viewer.hover_at(event.pos)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                viewer.end_pan()
         
-        # Draw graph
-        draw_graph(screen, graph, positions, args.node_size, args.edge_width, args)
-        
-        # Update display
-        pygame.display.flip()
+        # Update only the regions that changed
+        rects = viewer.frame()
+        if rects:
+            pygame.display.update(rects)
         clock.tick(60)
     
     pygame.quit()